@@ -10,9 +10,6 @@ from app.dependencies import get_recommendation_engine
 import logging
 
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s", handlers=[
-        logging.StreamHandler()  # Log to the console
-    ])
 router = APIRouter()
 
 
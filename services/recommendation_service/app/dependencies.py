@@ -11,9 +11,6 @@ import logging
 
 logger = logging.getLogger(__name__)
 
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-                    handlers=[logging.StreamHandler()])
-
 
 async def get_asset_retriever(settings: Settings = Depends(get_settings)):
     return JsonAssetRetriever(asset_path=settings.ASSETS_PATH,
@@ -1,15 +1,40 @@
+import atexit
+import logging
+import logging.config
+import logging.handlers
 import os
+import queue
 import sys
-from typing import Dict, Any
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
 
 
-def setup_logging() -> Dict[str, Any]:
-    """Logging configuration settings"""
-    environment = os.getenv("ENVIRONMENT", "dev")
+_listener: Optional[logging.handlers.QueueListener] = None
 
+
+def get_log_levels(environment: str) -> Tuple[str, Dict[str, str]]:
+    """
+    Root log level for the environment (dev: DEBUG, production: WARNING, otherwise INFO) unless LOG_LEVEL is set,
+    and per-logger levels from LOG_LEVELS ("app.services.cache_service=WARNING,aiohttp=ERROR").
+    """
     log_level = "DEBUG" if environment == "dev" else "INFO"
     if environment == "production":
         log_level = "WARNING"
+    log_level = os.getenv("LOG_LEVEL", log_level).upper()
+
+    loggers = {}
+    for entry in os.getenv("LOG_LEVELS", "").split(","):
+        name, _, level = entry.partition("=")
+        if name.strip() and level.strip():
+            loggers[name.strip()] = level.strip().upper()
+    return log_level, loggers
+
+
+def setup_logging() -> Dict[str, Any]:
+    """Logging configuration settings"""
+    environment = os.getenv("ENVIRONMENT", "dev")
+    log_level, loggers = get_log_levels(environment)
 
     # Base logging configuration:
     logging_config = {
@@ -28,6 +53,7 @@ def setup_logging() -> Dict[str, Any]:
                 "formatter": "default",
             },
         },
+        "loggers": {name: {"level": level} for name, level in loggers.items()},
         "root": {"level": log_level, "handlers": ["console"]},
     }
 
@@ -41,3 +67,68 @@ def setup_logging() -> Dict[str, Any]:
         logging_config["root"]["handlers"].append("file")
 
     return logging_config
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Lets through at most `rate` records per call site (logger + line) every `interval` seconds; the rest are
+    dropped and counted, and the count is appended to the next record let through from that call site.
+    Records at `min_unlimited_level` (WARNING) or above are never dropped.
+    """
+    def __init__(self, rate: int = 10, interval: float = 1.0, min_unlimited_level: int = logging.WARNING):
+        super().__init__()
+        self.rate = rate
+        self.interval = interval
+        self.min_unlimited_level = min_unlimited_level
+        # (logger, line) -> [window start, records let through in the window, records dropped]
+        self._sites: Dict[Tuple[str, int], list] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= self.min_unlimited_level or self.rate <= 0:
+            return True
+        now = time.monotonic()
+        with self._lock:
+            site = self._sites.get((record.name, record.lineno))
+            if site is None:
+                site = self._sites[(record.name, record.lineno)] = [now, 0, 0]
+            if now - site[0] >= self.interval:
+                site[0], site[1] = now, 0
+            if site[1] >= self.rate:
+                site[2] += 1
+                return False
+            site[1] += 1
+            dropped, site[2] = site[2], 0
+        if dropped:
+            record.msg = f"{record.msg} [{dropped} similar messages suppressed]"
+        return True
+
+
+def configure_logging(rate: Optional[int] = None, interval: Optional[float] = None) -> logging.handlers.QueueListener:
+    """
+    Apply `setup_logging()` with non-blocking output: the root logger only enqueues records (QueueHandler) and a
+    background QueueListener thread writes them to the configured handlers. High-frequency call sites are rate
+    limited before enqueueing (LOG_RATE_LIMIT records per LOG_RATE_INTERVAL seconds per call site, 0 disables).
+    Idempotent; the listener is flushed and stopped at interpreter exit.
+    """
+    global _listener
+    if _listener is not None:
+        return _listener
+    logging.config.dictConfig(setup_logging())
+    root = logging.getLogger()
+    handlers = root.handlers[:]
+    for handler in handlers:
+        root.removeHandler(handler)
+
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.addFilter(RateLimitFilter(
+        rate=int(os.getenv("LOG_RATE_LIMIT", "10")) if rate is None else rate,
+        interval=float(os.getenv("LOG_RATE_INTERVAL", "1.0")) if interval is None else interval,
+    ))
+    root.addHandler(queue_handler)
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+    return _listener
@@ -7,20 +7,14 @@ from contextlib import asynccontextmanager
 
 from app.api.v1.routes import router
 from app.config import get_settings
+from app.logging_config import configure_logging
 from app.dependencies import get_recommendation_engine, get_asset_retriever, get_cache_handler
 from app.core.exceptions import (RecommendationServiceException, WeatherServiceException,
                               LLMException, AssetRetrievalException)
 
+configure_logging()
 logger = logging.getLogger(__name__)
 
-logging.basicConfig(
-    level=logging.INFO,  # Set the logging level
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.StreamHandler()  # Log to the console
-    ]
-)
-
 settings = get_settings()
 
 @asynccontextmanager
@@ -14,8 +14,6 @@ from .llm.base import LLMHandler
 
 
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-                    handlers=[logging.StreamHandler()])
 
 
 class RecommendationEngine:
@@ -46,7 +44,7 @@ class RecommendationEngine:
                 logger.warning(f"No assets found that suit the conditions")
                 raise RecommendationServiceException("No suitable assets found for the given conditions")
 
-            logger.info(f"Filtered assets {filtered_assets} in the script engine.py")
+            logger.debug("Filtered assets %s in the script engine.py", filtered_assets)
 
             # Prepare context for LLM
             assets_json = [item.model_dump_json() for item in filtered_assets]
@@ -99,7 +97,7 @@ class RecommendationEngine:
             # Prepare context for LLM
             assets_json = [item.model_dump_json() for item in filtered_assets]
 
-            logger.info(f"The following will be putted as the outfits context: {str(assets_json)}")
+            logger.debug("The following will be putted as the outfits context: %s", assets_json)
 
             context = {
                 "weather": weather_conditions.model_dump_json(),
@@ -148,7 +146,7 @@ class RecommendationEngine:
 
             assets_json = [item.model_dump_json() for item in filtered_assets]
 
-            logger.info(f"filtered assets: {filtered_assets}")
+            logger.debug("filtered assets: %s", filtered_assets)
 
             context = {
                 "weather": weather_conditions.model_dump_json(),
@@ -10,14 +10,6 @@ from ...core.exceptions import ValidationException
 
 logger = logging.getLogger(__name__)
 
-logging.basicConfig(
-    level=logging.INFO,  # Set the logging level
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.StreamHandler()  # Log to the console
-    ]
-)
-
 
 class BaseFilter(ABC):
     """Base class for all filters"""
@@ -42,7 +34,6 @@ class WeatherFilter(BaseFilter):
         filtered_assets = []
 
         for asset in assets:
-            logger.info("Weather filter appliance.")
             if self._is_weather_appropriate(asset, weather_conditions):
                 filtered_assets.append(asset)
 
@@ -52,19 +43,19 @@ class WeatherFilter(BaseFilter):
     def _is_weather_appropriate(self, asset: AssetItem, weather: WeatherConditions) -> bool:
         """Checks if asset is appropriate for given weather conditions"""
         if not (asset.temp_range.temperature_min <= weather.temperature <= asset.temp_range.temperature_max):
-            logger.info("Temperature range checking.")
+            logger.debug("Temperature range checking.")
             return False
 
         if weather.description not in asset.condition:
-            logger.info("Weather Description checking.")
+            logger.debug("Weather Description checking.")
             return False
 
         if weather.wind_speed > 0 and asset.wind == "no":
-            logger.info("Wind speed checking.")
+            logger.debug("Wind speed checking.")
             return False
 
         if weather.snow > 0 and asset.snow == "no":
-            logger.info("Snow appliance checking.")
+            logger.debug("Snow appliance checking.")
             return False
 
         return True
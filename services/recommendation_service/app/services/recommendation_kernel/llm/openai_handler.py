@@ -14,8 +14,6 @@ from tenacity import (retry,
                       retry_if_exception_type)
 
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-                    handlers=[logging.StreamHandler()])
 
 
 class OpenAIHandler(LLMHandler):
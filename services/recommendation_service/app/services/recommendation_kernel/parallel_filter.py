@@ -9,8 +9,6 @@ from ...core.exceptions import ValidationException
 
 
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-                    handlers=[logging.StreamHandler()])
 
 
 class ParallelFilterSystem:
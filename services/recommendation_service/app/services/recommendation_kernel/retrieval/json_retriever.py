@@ -14,8 +14,6 @@ from ....services.recommendation_kernel.filters import PreferenceFilter
 
 
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-                    handlers=[logging.StreamHandler()])
 
 
 class JsonAssetRetriever(BaseRetriever):
@@ -8,14 +8,6 @@ from ..schemas.weather import WeatherData, WeatherConditions
 
 logger = logging.getLogger(__name__)
 
-logging.basicConfig(
-    level=logging.INFO,  # Set the logging level
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.StreamHandler()  # Log to the console
-    ]
-)
-
 
 class WeatherClient:
     """Client for interacting with the Weather Service."""
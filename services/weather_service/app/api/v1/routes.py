@@ -1,82 +1,147 @@
 from fastapi.exceptions import HTTPException
-from fastapi import APIRouter, Depends, BackgroundTasks
+from fastapi import APIRouter, Depends, BackgroundTasks, Query, Request, Response
 from app.services.openweather import OpenWeatherService
 from app.schemas.weather import WeatherResponse, WeatherRequest
-from app.schemas.forecast import ForecastResponse
-from app.dependencies import get_weather_service, get_redis
-from app.services.cache_service import WeatherCacheService
+from app.schemas.forecast import ForecastResponse, ForecastSlice, FORECAST_COLUMNS
+from app.schemas.batch import BatchWeatherRequest, BatchWeatherResponse
+from app.core.exceptions import InvalidWeatherRequestException
+from app.dependencies import get_weather_service, get_openweather_service
+from app.core.http_cache import conditional_response
+from app.services.cache_service import WeatherCacheService, get_data_age, get_data_timestamp
 from app.config import get_settings
 
-import aioredis
 import logging
-from typing import Optional
+import time
+from typing import Optional, Union
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
 
+def cached_or_not_modified(request: Request, response: Response, value, cache_service: WeatherCacheService,
+                           variant: str = "") -> Optional[Response]:
+    """
+    ETag/Last-Modified/Cache-Control/X-Data-Age for `value`; a 304 response when the client's copy is current.
+    Derived values (interpolated from a forecast, not observed) are sent with `no-cache`.
+    """
+    return conditional_response(request, response, get_data_timestamp(value), get_data_age(value),
+                                cache_service.refresh_threshold, variant, getattr(value, "derived", False))
+
+
 @router.get("/health")
-async def health_check():
-    """Health check endpoint"""
+async def health_check(weather_service: OpenWeatherService = Depends(get_openweather_service)):
+    """Health check endpoint, including the state of the OpenWeather circuit breaker"""
     logger.info("Health check triggered.")
-    return {"status": "Service' status OK"}
+    return {"status": "Service' status OK", "openweather": weather_service.circuit_breaker.state}
 
 
-async def get_cache_service(weather_service: OpenWeatherService = Depends(get_weather_service),
-                            redis: aioredis.Redis = Depends(get_redis)) -> WeatherCacheService:
-    """Dependency for weather cache service"""
-    logger.info("get_cache_service triggered and returned the cache service.")
-    try:
-        return WeatherCacheService(redis, weather_service)
-    except Exception as e:
-        logger.error(f"Error in forming the get_cache_service: {str(e)}")
-        return HTTPException(status_code=500, detail="Failed to get/form cache service")
+@router.get("/cache/stats", tags=["Cache"])
+async def get_cache_stats(cache_service: WeatherCacheService = Depends(get_weather_service),
+                          weather_service: OpenWeatherService = Depends(get_openweather_service)):
+    """Cache service counters (request coalescing etc.) and OpenWeather circuit breaker/retry budget state"""
+    return {**cache_service.get_stats(), "openweather": weather_service.get_stats()}
+
+
+@router.get("/admin/cache/hot", tags=["Admin"])
+async def get_hot_locations(limit: int = Query(20, gt=0, le=1000),
+                            cache_service: WeatherCacheService = Depends(get_weather_service)):
+    """Most requested locations (decayed request counts) and the progress of the last cache warm-up pass"""
+    return await cache_service.get_hot_locations(limit)
 
 
 @router.post("/weather/proximity", response_model=WeatherResponse, tags=["Weather"])
-async def get_weather_by_proximity(lat: float, lon: float, background_tasks: BackgroundTasks,
+async def get_weather_by_proximity(lat: float, lon: float, background_tasks: BackgroundTasks, request: Request,
+                                   response: Response,
                                    weather_cache_service: WeatherCacheService = Depends(get_weather_service)):
     try:
         logger.info("The endpoint /weather/proximity has been triggered successfully")
-        return await weather_cache_service.get_weather_by_proximity(background_tasks, lat, lon)
+        weather = await weather_cache_service.get_weather_by_proximity(background_tasks, lat, lon)
+        return cached_or_not_modified(request, response, weather, weather_cache_service) or weather
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"The endpoint /weather/proximity failed with error: {str(e)}")
-        return HTTPException(status_code=500, detail="Failed to trigger get_weather_by_proximity endpoint")
+        raise HTTPException(status_code=500, detail="Failed to trigger get_weather_by_proximity endpoint")
+
+
+@router.post("/weather/batch", response_model=BatchWeatherResponse, tags=["Weather"])
+async def get_weather_batch(batch: BatchWeatherRequest, background_tasks: BackgroundTasks,
+                            cache_service: WeatherCacheService = Depends(get_weather_service)) -> BatchWeatherResponse:
+    """Get weather data for many cities and/or coordinates in one call, with per-item results."""
+    if len(batch.locations) > settings.WEATHER_BATCH_MAX_ITEMS:
+        raise InvalidWeatherRequestException(
+            f"Too many locations in one batch: {len(batch.locations)} (max {settings.WEATHER_BATCH_MAX_ITEMS})")
+    logger.info(f"The endpoint /weather/batch has been triggered for {len(batch.locations)} locations")
+    results = await cache_service.get_weather_batch(background_tasks, batch.locations)
+    return BatchWeatherResponse(results=results)
 
 
 @router.get("/weather/city/{city}", response_model=WeatherResponse, tags=["Weather"])
-async def get_weather_by_city(city: str, background_tasks: BackgroundTasks,
+async def get_weather_by_city(city: str, background_tasks: BackgroundTasks, request: Request, response: Response,
                                cache_service: WeatherCacheService = Depends(get_weather_service)):
     """Get weather data for a city using caching."""
     try:
         logger.info(f"The endpoint /weather/city/{city} has been triggered")
-        return await cache_service.get_weather_by_city(background_tasks, city)
+        weather = await cache_service.get_weather_by_city(background_tasks, city)
+        return cached_or_not_modified(request, response, weather, cache_service) or weather
+    except HTTPException:
+        # Service errors keep their status (404 unknown/negatively cached location, 503 upstream unavailable)
+        raise
     except Exception as e:
         logger.error(f"The endpoint /weather/city/{city} with error: {str(e)}")
-        return HTTPException(status_code=500, detail="Failed to trigger endpoint /weather/city/{city}")
+        raise HTTPException(status_code=500, detail="Failed to trigger endpoint /weather/city/{city}")
 
 
 @router.get("/weather/city/{city}/country/{country_code}", response_model=WeatherResponse, tags=["Weather"])
 async def get_weather_by_city_country(city: str, country_code: str, background_tasks: BackgroundTasks,
+                                       request: Request, response: Response,
                                        cache_service: WeatherCacheService = Depends(get_weather_service)):
     """Get weather data for a city and country using caching."""
     try:
         logger.info(f"The endpoint /weather/city/{city}/country/{country_code} has been triggered")
-        return await cache_service.get_weather_by_city_country(background_tasks, city, country_code)
+        weather = await cache_service.get_weather_by_city_country(background_tasks, city, country_code)
+        return cached_or_not_modified(request, response, weather, cache_service) or weather
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"The endpoint /weather/city/{city}/country/{country_code} with error: {str(e)}")
-        return HTTPException(status_code=500,
-                             detail="Failed to trigger endpoint /weather/city/{city}/country/{country_code}")
+        raise HTTPException(status_code=500,
+                            detail="Failed to trigger endpoint /weather/city/{city}/country/{country_code}")
 
 
-@router.get("/weather/city/{city}/forecast", response_model=ForecastResponse, tags=["Weather"])
-async def get_city_forecast(city: str, background_tasks: BackgroundTasks, country_code: Optional[str] = None,
-                            cache_service: WeatherCacheService = Depends(get_weather_service)) -> ForecastResponse:
+@router.get("/weather/city/{city}/forecast", response_model=Union[ForecastResponse, ForecastSlice], tags=["Weather"])
+async def get_city_forecast(city: str, background_tasks: BackgroundTasks, request: Request, response: Response,
+                            country_code: Optional[str] = None,
+                            from_: Optional[int] = Query(None, alias="from",
+                                                         description="Window start, unix UTC (default: now when 'hours' is set)"),
+                            hours: Optional[int] = Query(None, gt=0, description="Window length in hours"),
+                            fields: Optional[str] = Query(None, description="Comma-separated forecast fields, e.g. temp,pop"),
+                            cache_service: WeatherCacheService = Depends(get_weather_service)
+                            ) -> Union[ForecastResponse, ForecastSlice]:
+    """
+    5-day/3-hour forecast for a city. Without `from`/`hours`/`fields` the full forecast is returned,
+    otherwise a columnar slice of the requested window and fields.
+    """
+    projection = [name.strip() for name in fields.split(",") if name.strip()] if fields else None
+    unknown = [name for name in projection or [] if name not in FORECAST_COLUMNS]
+    if unknown:
+        raise InvalidWeatherRequestException(
+            f"Unknown forecast fields: {', '.join(unknown)} (available: {', '.join(FORECAST_COLUMNS)})")
     try:
         logger.info(f"The endpoint /weather/city/{city}/forecast has been triggered")
-        return await cache_service.get_forecast_by_city(background_tasks, city, country_code)
+        forecast = await cache_service.get_forecast_by_city(background_tasks, city, country_code)
+        if from_ is None and hours is None and projection is None:
+            return cached_or_not_modified(request, response, forecast, cache_service) or forecast.to_response()
+        start = from_ if from_ is not None or hours is None else int(time.time())
+        # The representation depends on the parameters and, for windows starting now, on the points they cover
+        lo, hi = forecast.window(start, hours)
+        variant = f"{request.url.query}|{lo}:{hi}"
+        return (cached_or_not_modified(request, response, forecast, cache_service, variant)
+                or forecast.slice(start, hours, projection))
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"The endpoint /weather/city/{city}/forecast with error: {str(e)}")
-        return HTTPException(status_code=500,
-                             detail="Failed to trigger endpoint /weather/city/{city}/forecast")
+        raise HTTPException(status_code=500,
+                            detail="Failed to trigger endpoint /weather/city/{city}/forecast")
@@ -24,12 +24,93 @@ class Settings(BaseSettings):
     OPENWEATHER_API_URL: AnyHttpUrl
     OPENWEATHER_API_RETRIES: int = 3
     OPENWEATHER_BACKOFF_FACTOR: Optional[float] = 0.5
+    # Circuit breaker: opens when at least MIN_CALLS calls were made in the window and FAILURE_RATE of them failed,
+    # rejects calls for OPEN_SECONDS, then lets HALF_OPEN_CALLS probes through
+    OPENWEATHER_BREAKER_FAILURE_RATE: float = 0.5
+    OPENWEATHER_BREAKER_WINDOW: float = 30.0
+    OPENWEATHER_BREAKER_MIN_CALLS: int = 20
+    OPENWEATHER_BREAKER_OPEN_SECONDS: float = 30.0
+    OPENWEATHER_BREAKER_HALF_OPEN_CALLS: int = 1
+    # Retry budget: retries may be at most RATIO of the calls in the window (+ MIN retries always allowed)
+    OPENWEATHER_RETRY_BUDGET_RATIO: float = 0.1
+    OPENWEATHER_RETRY_BUDGET_MIN: int = 10
+    OPENWEATHER_RETRY_BUDGET_WINDOW: float = 10.0
+
+    # OpenWeather HTTP connection pool (one app-lifetime aiohttp session)
+    OPENWEATHER_CONNECTION_LIMIT: int = 100
+    OPENWEATHER_CONNECTION_LIMIT_PER_HOST: int = 50
+    OPENWEATHER_KEEPALIVE_TIMEOUT: float = 30.0
+    OPENWEATHER_DNS_CACHE_TTL: int = 300
+    OPENWEATHER_TIMEOUT_TOTAL: float = 10.0
+    OPENWEATHER_TIMEOUT_CONNECT: float = 3.0
 
     # Redis Cache
     REDIS_PRIMARY_CONNECTION_STRING: str
+    REDIS_MAX_CONNECTIONS: int = 50
+    REDIS_HEALTH_CHECK_INTERVAL: int = 30
+    REDIS_SOCKET_TIMEOUT: float = 5.0
+    REDIS_SOCKET_CONNECT_TIMEOUT: float = 5.0
 
     # Cache Settings
-    WEATHER_CACHE_EXPIRATION: int = 3600
+    # Soft TTL: older entries are served and refreshed in the background. Hard TTL: older entries are refetched
+    # before answering, but still served for WEATHER_CACHE_STALE_IF_ERROR seconds while OpenWeather fails.
+    WEATHER_CACHE_SOFT_TTL: int = 13200
+    WEATHER_CACHE_HARD_TTL: int = 14400
+    WEATHER_CACHE_STALE_IF_ERROR: int = 3600
+    # City/proximity keys point to observations stored once per OpenWeather location id; pointer lifetime in seconds
+    WEATHER_POINTER_TTL: int = 604800
+    # Unknown locations (OpenWeather 404) are answered from a negative cache entry for this long (0 disables)
+    WEATHER_NEGATIVE_CACHE_TTL: int = 300
+    # Codec for new cache entries: "json" or "msgpack" (optional dependency), optionally zlib-compressed.
+    # Entries written by any codec, and legacy plain-JSON entries, are always readable.
+    WEATHER_CACHE_CODEC: str = "json"
+    WEATHER_CACHE_COMPRESSION: bool = False
+
+    # In-process L1 cache in front of Redis (TTL is capped to the Redis TTL)
+    WEATHER_L1_CACHE_SIZE: int = 1024
+    WEATHER_L1_CACHE_TTL: float = 60.0
+    # Broadcast cache writes over Redis pub/sub so that every replica evicts its stale L1 copy
+    WEATHER_L1_INVALIDATION: bool = True
+
+    # Proximity lookups: serve the nearest fresh cached observation within this radius (0 disables)
+    WEATHER_PROXIMITY_RADIUS_KM: float = 5.0
+
+    # Background refresh: poll the refresh schedule every interval, pop due entries in batches
+    WEATHER_REFRESH_INTERVAL: float = 60.0
+    WEATHER_REFRESH_BATCH_SIZE: int = 100
+    WEATHER_REFRESH_RETRY_DELAY: float = 300.0
+    # Per-key refresh lease in Redis so that only one replica refreshes a key (lease lifetime in milliseconds)
+    WEATHER_REFRESH_LEASE: bool = True
+    WEATHER_REFRESH_LEASE_TTL_MS: int = 30000
+    # Refresh worker pool and OpenWeather quota (token bucket) shared by all background refreshes
+    WEATHER_REFRESH_CONCURRENCY: int = 8
+    WEATHER_REFRESH_QUEUE_SIZE: int = 10000
+    OPENWEATHER_CALLS_PER_MINUTE: int = 60
+    OPENWEATHER_BURST: int = 10
+
+    # Current weather derived from a cached forecast (interpolated between the points around now) instead of
+    # calling OpenWeather; used only if the forecast is younger than the max age and the bracketing points differ by
+    # at most the max temperature delta with the same weather group
+    WEATHER_DERIVED_CURRENT: bool = False
+    WEATHER_DERIVED_MAX_FORECAST_AGE: int = 3600
+    WEATHER_DERIVED_MAX_TEMP_DELTA: float = 3.0
+
+    # Hot locations: requests ranked by decayed frequency (half-life in seconds) in Redis; the top N are pre-fetched
+    # at startup and every WEATHER_WARM_INTERVAL seconds when missing or past the soft TTL
+    WEATHER_HOT_TRACKING: bool = True
+    WEATHER_HOT_HALF_LIFE: float = 3600.0
+    WEATHER_HOT_MAX_TRACKED: int = 1000
+    WEATHER_WARM_TOP_N: int = 100
+    WEATHER_WARM_INTERVAL: float = 300.0
+
+    # Batch endpoint: max locations per request, max concurrent upstream fetches for its misses
+    WEATHER_BATCH_MAX_ITEMS: int = 50
+    WEATHER_BATCH_CONCURRENCY: int = 10
+
+    # Request coalescing: cross-replica single-flight via a Redis lock (in-process coalescing is always on)
+    WEATHER_DISTRIBUTED_SINGLE_FLIGHT: bool = False
+    WEATHER_SINGLE_FLIGHT_LOCK_TTL_MS: int = 10000
+    WEATHER_SINGLE_FLIGHT_WAIT_TIMEOUT: float = 5.0
 
     # Azure Key Vault
     AZURE_KEYVAULT_URL: Optional[str] = None
@@ -21,6 +21,12 @@ class OpenWeatherAPIException(WeatherServiceException):
             logger.error(f"{self.__class__.__name__}: {detail}")
 
 
+class CircuitOpenException(OpenWeatherAPIException):
+    """Raised without calling OpenWeather while the circuit breaker is open"""
+    def __init__(self):
+        super().__init__(detail="OpenWeather API is unavailable (circuit breaker open), try again later.")
+
+
 class WeatherDataNotFoundException(WeatherServiceException):
     """Raised when weather data is not found/corrupted"""
     def __init__(self, location: str, latitude: Optional[float] = None, longitude: Optional[float] = None):
@@ -0,0 +1,67 @@
+import zlib
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Dict, Optional
+
+from fastapi import Request, Response, status
+
+# Seconds since the served data was observed/fetched. The standard `Age` header is not used for this: caches read
+# it as the time the response already spent in caches and subtract it from `max-age`.
+DATA_AGE_HEADER = "X-Data-Age"
+
+
+def build_cache_headers(timestamp: int, age: int, soft_ttl: int, variant: str = "", derived: bool = False) -> Dict[str, str]:
+    """
+    Validators and freshness headers for a weather representation.
+
+    Args:
+        timestamp (int): Observation/fetch time of the data, unix UTC (ETag and Last-Modified).
+        age (int): Seconds since `timestamp`.
+        soft_ttl (int): Age at which the service refreshes the data; `max-age` is the time left until then.
+        variant (str): Distinguishes representations of the same data (e.g. query parameters).
+        derived (bool): Computed per request rather than observed (e.g. interpolated from a cached forecast): sent
+            with `no-cache`, since its age says nothing about how long it stays valid.
+
+    Returns:
+        Dict[str, str]: ETag, Last-Modified, Cache-Control and the data age (DATA_AGE_HEADER) headers.
+        `max-age` already accounts for the data age, so the standard `Age` header is not sent: caches would
+        subtract it a second time.
+    """
+    etag = f"{timestamp:x}" + (f"-{zlib.crc32(variant.encode()):x}" if variant else "")
+    return {
+        "ETag": f'"{etag}"',
+        "Last-Modified": formatdate(timestamp, usegmt=True),
+        "Cache-Control": "no-cache" if derived else f"public, max-age={max(soft_ttl - age, 0)}",
+        DATA_AGE_HEADER: str(age),
+    }
+
+
+def is_not_modified(request: Request, headers: Dict[str, str]) -> bool:
+    """
+    Evaluate If-None-Match (weak comparison, takes precedence) or If-Modified-Since against the response headers.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        etag = headers["ETag"]
+        candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in candidates or etag in candidates
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is not None:
+        try:
+            return parsedate_to_datetime(headers["Last-Modified"]) <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def conditional_response(
+    request: Request, response: Response, timestamp: int, age: int, soft_ttl: int, variant: str = "", derived: bool = False
+) -> Optional[Response]:
+    """
+    Set the caching headers on `response`, or return a bodyless 304 when the client's copy is current
+    (the route then returns it without serializing its model).
+    """
+    headers = build_cache_headers(timestamp, age, soft_ttl, variant, derived)
+    if is_not_modified(request, headers):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return None
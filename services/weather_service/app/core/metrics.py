@@ -0,0 +1,161 @@
+import time
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Upper bounds (seconds) of the latency histogram buckets, +Inf is implied
+LATENCY_BUCKETS: Tuple[float, ...] = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Delay (seconds) between a refresh becoming due and starting, from queueing to quota waits and backlogs
+REFRESH_LAG_BUCKETS: Tuple[float, ...] = (0.1, 0.5, 1.0, 5.0, 15.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0, 3600.0)
+# Distance (km) between a proximity request and the cached observation it was served from
+DISTANCE_KM_BUCKETS: Tuple[float, ...] = (0.1, 0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 10.0, 25.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+Labels = Sequence[Tuple[str, str]]
+
+
+class Histogram:
+    """
+    One histogram series with fixed buckets.
+
+    `observe` only increments preallocated slots (per-bucket counts are cumulated when rendered), so it is cheap
+    enough for the request hot path.
+    """
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"') for _, value in labels)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(labels, escaped)) + "}"
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class MetricsWriter:
+    """Renders metric families in the Prometheus text exposition format (0.0.4)"""
+
+    def __init__(self, prefix: str = ""):
+        self.prefix = prefix
+        self._lines: List[str] = []
+
+    def _header(self, name: str, help_text: str, metric_type: str) -> str:
+        name = self.prefix + name
+        self._lines.append(f"# HELP {name} {help_text}")
+        self._lines.append(f"# TYPE {name} {metric_type}")
+        return name
+
+    def counter(self, name: str, help_text: str, samples: Iterable[Tuple[Labels, float]]):
+        name = self._header(name, help_text, "counter")
+        for labels, value in samples:
+            self._lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+    def gauge(self, name: str, help_text: str, samples: Iterable[Tuple[Labels, float]]):
+        name = self._header(name, help_text, "gauge")
+        for labels, value in samples:
+            self._lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+    def histogram(self, name: str, help_text: str, series: Iterable[Tuple[Labels, Histogram]]):
+        name = self._header(name, help_text, "histogram")
+        for labels, histogram in series:
+            cumulative = 0
+            for bound, count in zip(histogram.buckets + (float("inf"),), histogram.counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(float(bound))
+                self._lines.append(f"{name}_bucket{_format_labels(tuple(labels) + (('le', le),))} {cumulative}")
+            self._lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(histogram.sum)}")
+            self._lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+
+    def render(self) -> str:
+        return "\n".join(self._lines) + "\n"
+
+
+class RequestMetrics:
+    """Request latency histograms per route template and status code"""
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        # route -> status -> histogram; series are created on first use and reused afterwards
+        self._series: Dict[str, Dict[int, Histogram]] = {}
+
+    def observe(self, route: str, status: int, seconds: float):
+        by_status = self._series.get(route)
+        if by_status is None:
+            by_status = self._series[route] = {}
+        histogram = by_status.get(status)
+        if histogram is None:
+            histogram = by_status[status] = Histogram(self.buckets)
+        histogram.observe(seconds)
+
+    def write_metrics(self, writer: MetricsWriter):
+        writer.histogram(
+            "http_request_duration_seconds",
+            "Request latency by route and status.",
+            [
+                ((("route", route), ("status", str(status))), histogram)
+                for route, by_status in sorted(self._series.items())
+                for status, histogram in sorted(by_status.items())
+            ],
+        )
+
+
+class _StatusRecordingSend:
+    """ASGI `send` wrapper remembering the response status (500 until the response starts)"""
+
+    __slots__ = ("send", "status")
+
+    def __init__(self, send: Send):
+        self.send = send
+        self.status = 500
+
+    async def __call__(self, message: Message):
+        if message["type"] == "http.response.start":
+            self.status = message["status"]
+        await self.send(message)
+
+
+class RequestMetricsMiddleware:
+    """
+    Pure ASGI middleware timing every HTTP request into `RequestMetrics`.
+
+    Requests are labelled with the matched route template (e.g. /api/v1/weather/city/{city}), never the raw path,
+    so the number of series stays bounded; unmatched paths share the "unmatched" label.
+    """
+
+    def __init__(self, app: ASGIApp, metrics: RequestMetrics, exclude: Iterable[str] = ("/metrics",)):
+        self.app = app
+        self.metrics = metrics
+        self.exclude = frozenset(exclude)
+
+    @staticmethod
+    def route_label(scope: Scope) -> str:
+        """Template of the route the router matched (set in the scope while routing), "unmatched" otherwise"""
+        return getattr(scope.get("route"), "path", None) or "unmatched"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["path"] in self.exclude:
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        recording_send = _StatusRecordingSend(send)
+        try:
+            await self.app(scope, receive, recording_send)
+        finally:
+            self.metrics.observe(self.route_label(scope), recording_send.status, time.perf_counter() - start)
@@ -1,7 +1,8 @@
 from fastapi import FastAPI
 from fastapi import Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
+from fastapi.encoders import jsonable_encoder
 from fastapi.exceptions import RequestValidationError
 from .core.exceptions import (OpenWeatherAPIException,
                               WeatherDataNotFoundException)
@@ -9,32 +10,30 @@ from typing import AsyncGenerator
 import logging
 from app.api.v1 import routes
 from app.config import get_settings
-from app.dependencies import get_redis, get_weather_service
-from app.services.cache_service import WeatherCacheService
+from app.resources import AppResources
+from app.logging_config import configure_logging
+from app.core.metrics import CONTENT_TYPE, MetricsWriter, RequestMetrics, RequestMetricsMiddleware
 
 
+configure_logging()
 settings = get_settings()
 logger = logging.getLogger(__name__)
 
 
 async def app_lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     logger.info("Starting up Weather Service")
+    resources = AppResources(settings)
     try:
-        redis = await get_redis()
-        weather_service = await get_weather_service()
-        cache_service = WeatherCacheService(redis, weather_service)
-        app.state.cache_service = cache_service
-        await cache_service.start_background_task()
+        await resources.startup()
+        app.state.resources = resources
+        app.state.cache_service = resources.cache_service
         yield  # Application is running
     except Exception as e:
         logger.error(f"Failed to init Weather Service: {str(e)}")
         raise
     finally:
         logger.info("Shutting down weather service")
-        if hasattr(app.state, 'cache_service'):
-            logger.info("Shutting Down Weather Service")
-            await cache_service.stop_background_refresh()
-            await redis.close()
+        await resources.shutdown()
 
 app = FastAPI(
     title=settings.WEATHER_API_PROJECT_NAME,
@@ -52,12 +51,17 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Request latency per route/status, exported on /metrics
+request_metrics = RequestMetrics()
+app.add_middleware(RequestMetricsMiddleware, metrics=request_metrics)
+
 
 @app.exception_handler(OpenWeatherAPIException)
 async def openweather_api_exception_handler(request, exc):
     logger.error(f"OpenWeatherAPIException: {str(exc)}")
+    # 503 while OpenWeather is unavailable (errors, open circuit breaker) and no stale entry can be served
     return JSONResponse(
-        status_code=502,
+        status_code=exc.status_code,
         content={
             "detail": "Error communicating with the weather service."
         },
@@ -81,7 +85,7 @@ async def validation_exception_handler(reques, exc):
     return JSONResponse(
         status_code=422,
         content={
-            "detail": exc.errors()
+            "detail": jsonable_encoder(exc.errors())
         },
     )
 
@@ -97,5 +101,16 @@ async def global_exception_handler(request: Request, exc: Exception):
     )
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics(request: Request):
+    """Prometheus metrics: request latency, cache effectiveness, refresh pipeline and OpenWeather calls"""
+    writer = MetricsWriter(prefix="weather_")
+    request_metrics.write_metrics(writer)
+    resources = request.app.state.resources
+    resources.cache_service.write_metrics(writer)
+    resources.openweather_service.write_metrics(writer)
+    return PlainTextResponse(writer.render(), media_type=CONTENT_TYPE)
+
+
 # routes
 app.include_router(routes.router, prefix=settings.API_V1_STR)
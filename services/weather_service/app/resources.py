@@ -0,0 +1,155 @@
+import logging
+import re
+from typing import Optional
+
+import aioredis
+
+from app.config import Settings
+from app.services.cache_service import WeatherCacheService
+from app.services.openweather import OpenWeatherService
+from app.services.single_flight import RedisSingleFlight
+from app.services.local_cache import LocalTTLCache
+from app.services.invalidation import L1Invalidator
+from app.services.refresh_lease import RefreshLease
+from app.services.refresh_scheduler import RefreshScheduler, TokenBucket
+from app.services.popularity import PopularityTracker
+from app.services.codecs import get_codec
+
+logger = logging.getLogger(__name__)
+
+
+def parse_redis_connection_string(conn_str: str) -> str:
+    """Parse Azure Redis connection string to Redis URL format"""
+    try:
+        # Extract host and port
+        host_port = conn_str.split(',')[0]
+        host, port = host_port.split(':')
+
+        # Extract password
+        password_match = re.search(r'password=([^,]+)', conn_str)
+        if not password_match:
+            raise ValueError("Password not found in connection string")
+        password = password_match.group(1)
+
+        # TLS unless the connection string says ssl=False (e.g. a local Redis for development/load tests)
+        scheme = "redis" if re.search(r'ssl=false', conn_str, re.IGNORECASE) else "rediss"
+
+        # Construct Redis URL
+        return f"{scheme}://default:{password}@{host}:{port}"
+    except Exception as e:
+        logger.error(f"Failed to parse Redis connection string: {str(e)}")
+        raise
+
+
+def create_redis_pool(settings: Settings, decode_responses: bool = True) -> aioredis.ConnectionPool:
+    """Create an app-scoped connection pool for Azure Redis Cache"""
+    redis_url = parse_redis_connection_string(settings.REDIS_PRIMARY_CONNECTION_STRING)
+    logger.debug("Creating Redis connection pool using parsed URL")
+    return aioredis.ConnectionPool.from_url(
+        redis_url,
+        encoding="utf-8",
+        decode_responses=decode_responses,
+        max_connections=settings.REDIS_MAX_CONNECTIONS,
+        health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL,
+        socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+        socket_connect_timeout=settings.REDIS_SOCKET_CONNECT_TIMEOUT,
+        socket_keepalive=True,
+        retry_on_timeout=True,
+    )
+
+
+class AppResources:
+    """
+    App-scoped resources shared by every request: the Redis connection pools (text and binary), one OpenWeatherService
+    (with its pooled aiohttp session) and one WeatherCacheService. Created and torn down by the lifespan.
+    """
+
+    def __init__(self, settings: Settings):
+        self.settings = settings
+        self.redis_pool: Optional[aioredis.ConnectionPool] = None
+        self.redis: Optional[aioredis.Redis] = None
+        # Cached payloads are stored by the configured codec and read without response decoding
+        self.binary_redis_pool: Optional[aioredis.ConnectionPool] = None
+        self.binary_redis: Optional[aioredis.Redis] = None
+        self.openweather_service: Optional[OpenWeatherService] = None
+        self.cache_service: Optional[WeatherCacheService] = None
+
+    async def startup(self):
+        """Open the connection pools and start the cache refresh task"""
+        self.redis_pool = create_redis_pool(self.settings)
+        self.redis = aioredis.Redis(connection_pool=self.redis_pool)
+        self.binary_redis_pool = create_redis_pool(self.settings, decode_responses=False)
+        self.binary_redis = aioredis.Redis(connection_pool=self.binary_redis_pool)
+
+        self.openweather_service = OpenWeatherService()
+        await self.openweather_service.start()
+
+        redis_single_flight = (
+            RedisSingleFlight(
+                lock_ttl_ms=self.settings.WEATHER_SINGLE_FLIGHT_LOCK_TTL_MS, wait_timeout=self.settings.WEATHER_SINGLE_FLIGHT_WAIT_TIMEOUT
+            )
+            if self.settings.WEATHER_DISTRIBUTED_SINGLE_FLIGHT
+            else None
+        )
+        local_cache = LocalTTLCache(max_size=self.settings.WEATHER_L1_CACHE_SIZE, ttl=self.settings.WEATHER_L1_CACHE_TTL)
+        invalidator = L1Invalidator(self.redis, local_cache) if self.settings.WEATHER_L1_INVALIDATION else None
+        refresh_scheduler = RefreshScheduler(
+            TokenBucket(calls_per_minute=self.settings.OPENWEATHER_CALLS_PER_MINUTE, burst=self.settings.OPENWEATHER_BURST),
+            concurrency=self.settings.WEATHER_REFRESH_CONCURRENCY,
+            max_queue_size=self.settings.WEATHER_REFRESH_QUEUE_SIZE,
+        )
+        refresh_lease = (
+            RefreshLease(self.redis, lease_ttl_ms=self.settings.WEATHER_REFRESH_LEASE_TTL_MS)
+            if self.settings.WEATHER_REFRESH_LEASE
+            else None
+        )
+        popularity = (
+            PopularityTracker(self.redis, half_life=self.settings.WEATHER_HOT_HALF_LIFE, max_tracked=self.settings.WEATHER_HOT_MAX_TRACKED)
+            if self.settings.WEATHER_HOT_TRACKING
+            else None
+        )
+        self.cache_service = WeatherCacheService(
+            self.redis,
+            self.openweather_service,
+            cache_duration=self.settings.WEATHER_CACHE_HARD_TTL,
+            refresh_threshold=self.settings.WEATHER_CACHE_SOFT_TTL,
+            stale_if_error=self.settings.WEATHER_CACHE_STALE_IF_ERROR,
+            negative_ttl=self.settings.WEATHER_NEGATIVE_CACHE_TTL,
+            pointer_ttl=self.settings.WEATHER_POINTER_TTL,
+            popularity=popularity,
+            warm_top_n=self.settings.WEATHER_WARM_TOP_N,
+            warm_interval=self.settings.WEATHER_WARM_INTERVAL,
+            redis_single_flight=redis_single_flight,
+            local_cache=local_cache,
+            invalidator=invalidator,
+            proximity_radius_km=self.settings.WEATHER_PROXIMITY_RADIUS_KM,
+            refresh_interval=self.settings.WEATHER_REFRESH_INTERVAL,
+            refresh_batch_size=self.settings.WEATHER_REFRESH_BATCH_SIZE,
+            refresh_retry_delay=self.settings.WEATHER_REFRESH_RETRY_DELAY,
+            refresh_scheduler=refresh_scheduler,
+            refresh_lease=refresh_lease,
+            batch_concurrency=self.settings.WEATHER_BATCH_CONCURRENCY,
+            derive_from_forecast=self.settings.WEATHER_DERIVED_CURRENT,
+            derived_max_forecast_age=self.settings.WEATHER_DERIVED_MAX_FORECAST_AGE,
+            derived_max_temp_delta=self.settings.WEATHER_DERIVED_MAX_TEMP_DELTA,
+            codec=get_codec(self.settings.WEATHER_CACHE_CODEC, self.settings.WEATHER_CACHE_COMPRESSION),
+            binary_redis=self.binary_redis,
+        )
+        await self.cache_service.start_background_task()
+        logger.info(f"App resources started (Redis max connections: {self.settings.REDIS_MAX_CONNECTIONS})")
+
+    async def shutdown(self):
+        """Stop background work and release every pooled connection"""
+        if self.cache_service:
+            await self.cache_service.stop_background_refresh()
+        if self.openweather_service:
+            await self.openweather_service.close()
+        if self.redis:
+            await self.redis.close()
+        if self.redis_pool:
+            await self.redis_pool.disconnect()
+        if self.binary_redis:
+            await self.binary_redis.close()
+        if self.binary_redis_pool:
+            await self.binary_redis_pool.disconnect()
+        logger.info("App resources released")
@@ -0,0 +1,25 @@
+from typing import List, Optional
+from pydantic import BaseModel, Field
+from app.schemas.weather import WeatherRequest, WeatherResponse
+
+
+class BatchWeatherRequest(BaseModel):
+    locations: List[WeatherRequest] = Field(..., min_length=1, description="Cities (with optional country code) and/or lat/lon pairs")
+
+    class Config:
+        json_schema_extra = {
+            "examples": [
+                {"locations": [{"city": "Warsaw", "country_code": "PL"}, {"city": "London"}, {"latitude": 52.2297, "longitude": 21.0122}]}
+            ]
+        }
+
+
+class BatchWeatherItem(BaseModel):
+    location: WeatherRequest = Field(..., description="Requested location, as sent by the client")
+    status_code: int = Field(200, description="Per-item HTTP-like status code")
+    weather: Optional[WeatherResponse] = Field(None, description="Weather data, absent on error")
+    error: Optional[str] = Field(None, description="Error detail, absent on success")
+
+
+class BatchWeatherResponse(BaseModel):
+    results: List[BatchWeatherItem] = Field(..., description="One result per requested location, in request order")
@@ -1,4 +1,6 @@
-from typing import List, Optional
+from bisect import bisect_left, bisect_right
+from functools import cached_property
+from typing import Any, Dict, List, Optional, Tuple
 from pydantic import BaseModel, Field
 
 
@@ -94,3 +96,139 @@ class ForecastResponse(BaseModel):
 
     class Config:
         populate_by_name = True
+
+
+# Per-point columns of the columnar forecast, in the order of ForecastColumns' fields
+FORECAST_COLUMNS = (
+    "dt", "dt_txt", "temp", "feels_like", "temp_min", "temp_max", "pressure", "sea_level", "grnd_level", "humidity",
+    "temp_kf", "weather_id", "weather_main", "weather_description", "weather_icon", "clouds", "wind_speed", "wind_deg",
+    "wind_gust", "visibility", "pop", "rain_3h", "snow_3h", "pod",
+)
+
+
+class ForecastColumns(BaseModel):
+    """
+    Columnar (struct of arrays) form of ForecastResponse, as stored in the cache: one list per field,
+    index i describing forecast point i. Slicing a time window or projecting fields is plain list slicing.
+    The weather_* columns hold the primary weather condition of each point, `weather_extra` the others (if any).
+    """
+    code: str = Field(..., description="Internal parameter")
+    message: int = Field(..., description="Internal parameter")
+    city: CityInfo
+    fetched_at: Optional[int] = Field(None, description="When the forecast was fetched, Unix UTC")
+    dt: List[int]
+    dt_txt: List[str]
+    temp: List[float]
+    feels_like: List[float]
+    temp_min: List[float]
+    temp_max: List[float]
+    pressure: List[int]
+    sea_level: List[int]
+    grnd_level: List[int]
+    humidity: List[int]
+    temp_kf: List[float]
+    weather_id: List[int]
+    weather_main: List[str]
+    weather_description: List[str]
+    weather_icon: List[str]
+    clouds: List[int]
+    wind_speed: List[float]
+    wind_deg: List[int]
+    wind_gust: List[Optional[float]]
+    visibility: List[Optional[int]]
+    pop: List[float]
+    rain_3h: List[Optional[float]]
+    snow_3h: List[Optional[float]]
+    pod: List[str]
+    weather_extra: List[List[WeatherCondition]] = Field(
+        default_factory=list, description="Secondary weather conditions of each point (empty in older entries)")
+
+    @classmethod
+    def from_response(cls, forecast: ForecastResponse, fetched_at: Optional[int] = None) -> "ForecastColumns":
+        points = forecast.forecast_points
+        return cls(
+            code=forecast.code,
+            message=forecast.message,
+            city=forecast.city,
+            fetched_at=fetched_at,
+            dt=[p.dt for p in points],
+            dt_txt=[p.dt_txt for p in points],
+            temp=[p.main.temperature for p in points],
+            feels_like=[p.main.feels_like for p in points],
+            temp_min=[p.main.temperature_min for p in points],
+            temp_max=[p.main.temperature_max for p in points],
+            pressure=[p.main.pressure for p in points],
+            sea_level=[p.main.sea_level for p in points],
+            grnd_level=[p.main.ground_level for p in points],
+            humidity=[p.main.humidity for p in points],
+            temp_kf=[p.main.temp_kf for p in points],
+            weather_id=[p.weather[0].id for p in points],
+            weather_main=[p.weather[0].main for p in points],
+            weather_description=[p.weather[0].description for p in points],
+            weather_icon=[p.weather[0].icon for p in points],
+            clouds=[p.clouds.all for p in points],
+            wind_speed=[p.wind.speed for p in points],
+            wind_deg=[p.wind.deg for p in points],
+            wind_gust=[p.wind.gust for p in points],
+            visibility=[p.visibility for p in points],
+            pop=[p.pop for p in points],
+            rain_3h=[p.rain.three_hour if p.rain else None for p in points],
+            snow_3h=[p.snow.three_hour if p.snow else None for p in points],
+            pod=[p.sys.pod for p in points],
+            weather_extra=[p.weather[1:] for p in points],
+        )
+
+    def to_response(self) -> ForecastResponse:
+        """
+        The full ForecastResponse (used when no window/projection is requested). It is rebuilt once per cached
+        entry: L1 hands out the same ForecastColumns instance until the entry is refreshed.
+        """
+        return self._response
+
+    @cached_property
+    def _response(self) -> ForecastResponse:
+        points = []
+        for i in range(len(self.dt)):
+            extra = self.weather_extra[i] if self.weather_extra else []
+            points.append({
+                "dt": self.dt[i],
+                "main": {"temp": self.temp[i], "feels_like": self.feels_like[i], "temp_min": self.temp_min[i],
+                         "temp_max": self.temp_max[i], "pressure": self.pressure[i], "sea_level": self.sea_level[i],
+                         "grnd_level": self.grnd_level[i], "humidity": self.humidity[i], "temp_kf": self.temp_kf[i]},
+                "weather": [{"id": self.weather_id[i], "main": self.weather_main[i],
+                             "description": self.weather_description[i], "icon": self.weather_icon[i]}] + extra,
+                "clouds": {"all": self.clouds[i]},
+                "wind": {"speed": self.wind_speed[i], "deg": self.wind_deg[i], "gust": self.wind_gust[i]},
+                "visibility": self.visibility[i],
+                "pop": self.pop[i],
+                "rain": {"3h": self.rain_3h[i]} if self.rain_3h[i] is not None else None,
+                "snow": {"3h": self.snow_3h[i]} if self.snow_3h[i] is not None else None,
+                "sys": {"pod": self.pod[i]},
+                "dt_txt": self.dt_txt[i],
+            })
+        return ForecastResponse(cod=self.code, message=self.message, cnt=len(points), list=points, city=self.city)
+
+    def window(self, start: Optional[int] = None, hours: Optional[int] = None) -> Tuple[int, int]:
+        """
+        Index range [lo, hi) of the points overlapping the window from `start` (unix UTC) lasting `hours`.
+        The point whose 3-hour interval contains `start` is included.
+        """
+        lo = max(bisect_right(self.dt, start) - 1, 0) if start is not None else 0
+        if hours is None:
+            return lo, len(self.dt)
+        end = (start if start is not None else (self.dt[0] if self.dt else 0)) + hours * 3600
+        return lo, max(bisect_left(self.dt, end), lo)
+
+    def slice(self, start: Optional[int] = None, hours: Optional[int] = None,
+              fields: Optional[List[str]] = None) -> "ForecastSlice":
+        """Time-window slice with an optional field projection, without building per-point objects"""
+        lo, hi = self.window(start, hours)
+        names = ["dt"] + [name for name in (fields or FORECAST_COLUMNS) if name != "dt"]
+        return ForecastSlice(city=self.city, count=hi - lo,
+                             columns={name: getattr(self, name)[lo:hi] for name in names})
+
+
+class ForecastSlice(BaseModel):
+    city: CityInfo
+    count: int = Field(..., description="Number of timestamps returned")
+    columns: Dict[str, List[Any]] = Field(..., description="Requested forecast fields, one list per field aligned with 'dt'")
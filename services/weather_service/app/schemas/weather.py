@@ -24,6 +24,10 @@ class WeatherResponse(WeatherBase):
     timestamp: int = Field(..., description="UNIX timestamp of the weather data")
     sunrise: int = Field(..., description="UNIX timestamp for sunrise")
     sunset: int = Field(..., description="UNIX timestamp for sunset")
+    city_id: Optional[int] = Field(None, description="OpenWeather location id")
+    latitude: Optional[float] = Field(None, description="Latitude of the observed location")
+    longitude: Optional[float] = Field(None, description="Longitude of the observed location")
+    derived: bool = Field(False, description="True when interpolated from a cached forecast instead of observed")
 
 
 class WeatherRequest(BaseModel):
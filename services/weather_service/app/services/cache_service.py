@@ -1,27 +1,35 @@
 import asyncio
-import json
 import logging
+import time
+from bisect import bisect_right
+from functools import partial
 from math import radians, cos, sin, sqrt, atan2
 import aioredis
-from typing import Optional
-from datetime import datetime
+from aioredis.exceptions import WatchError
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Type, TypeVar, Union
 from fastapi import BackgroundTasks
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError
 from app.services.openweather import OpenWeatherService
-from app.schemas.weather import WeatherResponse
-from app.core.exceptions import WeatherServiceException
-from app.schemas.forecast import ForecastResponse
+from app.schemas.weather import WeatherResponse, WeatherRequest
+from app.schemas.batch import BatchWeatherItem
+from fastapi import HTTPException
+from app.core.exceptions import WeatherServiceException, WeatherDataNotFoundException
+from app.schemas.forecast import ForecastColumns
+from app.services.single_flight import SingleFlight, RedisSingleFlight
+from app.services.local_cache import LocalTTLCache
+from app.services.invalidation import L1Invalidator
+from app.services.refresh_lease import RefreshLease, current_lease
+from app.services.refresh_scheduler import RefreshScheduler, TokenBucket
+from app.services.popularity import PopularityTracker
+from app.services.locations import LocationResolver
+from app.services import codecs
+from app.services.codecs import CacheCodec, JsonCodec
+from app.core.metrics import DISTANCE_KM_BUCKETS, Histogram, MetricsWriter
 
 
 logger = logging.getLogger(__name__)
 
-
-class LocationCache(BaseModel):
-    """Location Cache Metadata Model"""
-    location_key: str
-    last_updated: datetime
-    active: bool = True
-    request_count: int = 0
+M = TypeVar("M", bound=BaseModel)
 
 
 def haversine(lat1, lon1, lat2, lon2):
@@ -52,19 +60,185 @@ def get_proximity_key(lat: float, lon: float, precision: float = 1.0) -> str:
     return f"weather:proximity:{lat_cluster:.2f}:{lon_cluster:.2f}"
 
 
+def get_city_key(city: str, country_code: Optional[str] = None) -> str:
+    """Cache key for current weather by city and optional country code"""
+    return f"weather:city:{city.lower()}" + (f":{country_code.lower()}" if country_code else "")
+
+
+def get_forecast_key(city: str, country_code: Optional[str] = None) -> str:
+    """Cache key for the 5-day/3-hour forecast by city and optional country code"""
+    return f"forecast:city:{city.lower()}" + (f":{country_code.lower()}" if country_code else "")
+
+
+def get_observation_key(city_id: int) -> str:
+    """Canonical key of a current-weather observation: the OpenWeather location id"""
+    return f"{OBSERVATION_KEY_PREFIX}{city_id}"
+
+
+def get_storage_key(cache_key: str, value: BaseModel) -> str:
+    """
+    Key `value` is stored under: the observation key for observations with an OpenWeather location id (`cache_key`
+    then only points to it), `cache_key` itself otherwise (forecasts, observations without an id)
+    """
+    city_id = getattr(value, "city_id", None)
+    return get_observation_key(city_id) if city_id else cache_key
+
+
+def get_pointer(value: Union[bytes, str, None]) -> Optional[str]:
+    """Observation key held by a pointer entry, None for a regular entry"""
+    if isinstance(value, bytes):
+        return value.decode() if value.startswith(OBSERVATION_KEY_PREFIX.encode()) else None
+    return value if value and value.startswith(OBSERVATION_KEY_PREFIX) else None
+
+
+def get_key_family(cache_key: str) -> str:
+    """Key family of a city/proximity/forecast cache key, used as a metrics label (one of KEY_FAMILIES)"""
+    if cache_key.startswith("forecast:"):
+        return "forecast"
+    if cache_key.startswith("weather:proximity:"):
+        return "proximity"
+    # weather:city:<city>:<country> vs weather:city:<city>
+    return "city_country" if cache_key.count(":") > 2 else "city"
+
+
+def get_negative_key(cache_key: str) -> str:
+    """Negative-cache key remembering that OpenWeather answered 404 for `cache_key`'s location"""
+    return f"notfound:{cache_key}"
+
+
+def get_data_timestamp(value: BaseModel) -> int:
+    """
+    When a cached weather value was produced: its observation (WeatherResponse.timestamp) or the forecast fetch
+    (ForecastColumns.fetched_at, first point for entries without it)
+    """
+    if isinstance(value, ForecastColumns):
+        return value.fetched_at if value.fetched_at is not None else (value.dt[0] if value.dt else 0)
+    return value.timestamp
+
+
+def get_data_age(value: BaseModel, now: Optional[float] = None) -> int:
+    """Age in seconds of a cached weather value, see `get_data_timestamp`"""
+    return max(int((time.time() if now is None else now) - get_data_timestamp(value)), 0)
+
+
+# Observations are stored once under their OpenWeather location id; city and proximity keys hold the
+# observation key as a pointer
+OBSERVATION_KEY_PREFIX = "weather:id:"
+# Reads a cache key in one round trip, following it if it holds a pointer (ARGV[1] = pointer prefix).
+# The pointed-to key is not declared in KEYS: fine for a single Redis instance, not for Redis Cluster.
+DEREFERENCE_SCRIPT = """
+local value = redis.call("GET", KEYS[1])
+if value and string.sub(value, 1, string.len(ARGV[1])) == ARGV[1] then
+    return redis.call("GET", value)
+end
+return value
+"""
+# TTL of the entry a cache key resolves to (following pointers), -2 if missing
+DEREFERENCE_TTL_SCRIPT = """
+local value = redis.call("GET", KEYS[1])
+if value and string.sub(value, 1, string.len(ARGV[1])) == ARGV[1] then
+    return redis.call("TTL", value)
+end
+return redis.call("TTL", KEYS[1])
+"""
+# GEO set (sorted set) of cached proximity observations: member = proximity cache key
+PROXIMITY_GEO_KEY = "weather:geo:proximity"
+# Cache key families lookups are counted by (metrics labels)
+KEY_FAMILIES = ("city", "city_country", "proximity", "forecast")
+# Sorted set of cache keys scored by their next refresh time (unix seconds)
+REFRESH_SCHEDULE_KEY = "weather:refresh:schedule"
+
+
 class WeatherCacheService:
     """Service for managing weather data caching"""
     def __init__(self, redis: aioredis.Redis, weather_service: OpenWeatherService,
-                 cache_duration: int = 14400, refresh_threshold: int = 13200, proximity_precision: float = 5.0):
+                 cache_duration: int = 14400, refresh_threshold: int = 13200, proximity_precision: float = 5.0,
+                 single_flight: Optional[SingleFlight] = None, redis_single_flight: Optional[RedisSingleFlight] = None,
+                 local_cache: Optional[LocalTTLCache] = None, proximity_radius_km: float = 5.0,
+                 proximity_candidates: int = 5, refresh_interval: float = 60.0, refresh_batch_size: int = 100,
+                 refresh_retry_delay: float = 300.0, refresh_scheduler: Optional[RefreshScheduler] = None,
+                 batch_concurrency: int = 10, codec: Optional[CacheCodec] = None,
+                 binary_redis: Optional[aioredis.Redis] = None, derive_from_forecast: bool = False,
+                 derived_max_forecast_age: int = 3600, derived_max_temp_delta: float = 3.0,
+                 stale_if_error: int = 3600, popularity: Optional[PopularityTracker] = None,
+                 warm_top_n: int = 100, warm_interval: float = 300.0, negative_ttl: int = 300,
+                 locations: Optional[LocationResolver] = None, pointer_ttl: int = 604800,
+                 invalidator: Optional[L1Invalidator] = None, refresh_lease: Optional[RefreshLease] = None):
         self.redis = redis
+        # Cached payloads are read/written through a client without response decoding (binary codecs),
+        # the text client serves everything else
+        self.binary_redis = binary_redis or redis
+        self.codec = codec or JsonCodec()
         self.weather_service = weather_service
+        # Soft TTL (refresh_threshold): past it entries are served and refreshed in the background.
+        # Hard TTL (cache_duration): past it the entry is refetched, but it is kept in Redis for another
+        # stale_if_error seconds and served while the upstream fetch fails.
         self.cache_duration = cache_duration
         self.refresh_threshold = refresh_threshold
+        self.stale_if_error = stale_if_error
+        self.stale_served = 0
+        # Request outcomes per key family: fresh hit, miss (fetched) and stale (served past the hard TTL)
+        self.lookups: Dict[str, Dict[str, int]] = {family: {"hit": 0, "miss": 0, "stale": 0}
+                                                   for family in KEY_FAMILIES}
+        # City queries are canonicalized (normalization + learned aliases) so that all spellings share one entry
+        self.locations = locations or LocationResolver(redis)
+        # Unknown locations (upstream 404) are remembered for negative_ttl seconds (0 disables)
+        self.negative_ttl = negative_ttl
+        self.negative_hits = 0
+        self.negative_writes = 0
         self.proximity_precision = proximity_precision
+        # Proximity misses are served from the nearest fresh cached observation within this radius
+        self.proximity_radius_km = proximity_radius_km
+        self.proximity_candidates = proximity_candidates
+        self.nearest_hits = 0
+        self.nearest_misses = 0
+        self.nearest_distance_km_total = 0.0
+        self.nearest_distance_km_max = 0.0
+        self.nearest_distance_km = Histogram(DISTANCE_KM_BUCKETS)
+        # Concurrent misses on the same key share one upstream fetch (in-process and optionally across replicas)
+        self.single_flight = single_flight or SingleFlight()
+        self.redis_single_flight = redis_single_flight
+        # Pointer keys (city/proximity -> observation) map stable locations, they outlive the observations
+        self.pointer_ttl = pointer_ttl
+        self._dereference_script = self.binary_redis.register_script(DEREFERENCE_SCRIPT)
+        self._dereference_ttl_script = redis.register_script(DEREFERENCE_TTL_SCRIPT)
+        # L1: in-process validated models with a TTL shorter than Redis (L2)
+        self.local_cache = local_cache if local_cache is not None else LocalTTLCache()
+        self.local_cache.ttl = min(self.local_cache.ttl, self.cache_duration + stale_if_error)
+        # Cache writes are broadcast so that other replicas evict their L1 copies
+        self.invalidator = invalidator
+        self.redis_hits = 0
+        self.redis_misses = 0
+        # Background refresh driven by the REFRESH_SCHEDULE_KEY sorted set
+        self.refresh_interval = refresh_interval
+        self.refresh_batch_size = refresh_batch_size
+        self.refresh_retry_delay = refresh_retry_delay
+        # Shared worker pool + OpenWeather quota limiter for loop and request-triggered refreshes
+        self.refresh_scheduler = refresh_scheduler or RefreshScheduler(TokenBucket(calls_per_minute=60, burst=10))
+        # Cross-replica per-key lease: a refresh runs on one replica only, the others keep serving the cached value
+        self.refresh_lease = refresh_lease
+        # Upper bound on concurrent upstream fetches for the misses of one batch request
+        self.batch_concurrency = batch_concurrency
+        # City misses answered by interpolating a fresh cached forecast instead of calling OpenWeather
+        self.derive_from_forecast = derive_from_forecast
+        self.derived_max_forecast_age = derived_max_forecast_age
+        self.derived_max_temp_delta = derived_max_temp_delta
+        self.derived_hits = 0
+        self.derived_rejections = 0
+        # Hot-location tracking; the refresh loop pre-fetches the top `warm_top_n` keys (at startup, then every
+        # `warm_interval` seconds) when they are missing or past their soft TTL
+        self.popularity = popularity
+        self.warm_top_n = warm_top_n
+        self.warm_interval = warm_interval
+        self._last_warm_up = 0.0
+        self.warm_up_progress: Dict[str, Any] = {}
         self._background_task: Optional[asyncio.Task] = None
 
     async def start_background_task(self):
         """Start background refresh task"""
+        self.refresh_scheduler.start()
+        if self.invalidator:
+            self.invalidator.start()
         if not self._background_task or self._background_task.done():
             self._background_task = asyncio.create_task(self._refresh_loop())
             logger.info("Started background refresh task")
@@ -79,95 +253,417 @@ class WeatherCacheService:
             except asyncio.CancelledError as e:
                 logger.info(f"Error in stopping background task: {str(e)}")
             logger.info("Stopped the background task")
+        await self.refresh_scheduler.stop()
+        if self.invalidator:
+            await self.invalidator.stop()
 
-    def _get_cache_key(self, city: str, country_code: Optional[str]=None) -> str:
-        """Generate cache key for location"""
-        logger.info(f"Generated the cache key for the city: {city.capitalize()}")
-        return f"weather:{city.lower()}" + (f":{country_code.lower()}" if country_code else "")
-
-    def _get_metadata_key(self, cache_key: str) -> str:
-        """Generate metadata key for cache entry"""
-        logger.info(f"Generating the metadata key for the cache entry.")
-        return f"metadata:{cache_key}"
-
-    async def get_weather(self, background_tasks: BackgroundTasks, city: str,
-                          country_code: Optional[str]=None) -> WeatherResponse:
-        """Get weather data with smart caching mechanism"""
-        cache_key = self._get_cache_key(city, country_code)
-        metadata_key = self._get_metadata_key(cache_key)
-
-        # Try to get the cached data if any
-        cached_data = await self.redis.get(cache_key)
-        metadata_data = await self.redis.get(metadata_key)
-
-        if cached_data:
-            weather_data = WeatherResponse(**json.load(cached_data))
-            metadata_ = LocationCache(**json.loads(metadata_data)) if metadata_data else None
-            # Update the counter for the request
-            if metadata_:
-                metadata_.request_count += 1
-                await self.redis.set(
-                    metadata_key,
-                    metadata_.model_dump_json(),
-                    ex=self.cache_duration
-                )
-            # Check the need of the refresh process
-            if metadata_ and (datetime.now() - metadata_.last_updated).total_seconds() > self.refresh_threshold:
-                background_tasks.add_task(self._refresh_cache, city, country_code)
+    def get_stats(self) -> Dict[str, Any]:
+        """Cache service counters"""
+        stats = {
+            "l1": self.local_cache.get_stats(),
+            "l2": {"hits": self.redis_hits, "misses": self.redis_misses},
+            "stale_served": self.stale_served,
+            "lookups": self.lookups,
+            # negative hits = upstream calls avoided for unknown locations
+            "negative": {"hits": self.negative_hits, "writes": self.negative_writes},
+            "locations": self.locations.get_stats(),
+            "single_flight": self.single_flight.get_stats(),
+            "refresh": self.refresh_scheduler.get_stats(),
+            "proximity": {
+                "nearest_hits": self.nearest_hits,
+                "nearest_misses": self.nearest_misses,
+                "avg_distance_km": round(self.nearest_distance_km_total / self.nearest_hits, 3)
+                if self.nearest_hits else 0.0,
+                "max_distance_km": round(self.nearest_distance_km_max, 3),
+            },
+        }
+        if self.derive_from_forecast:
+            stats["derived"] = {"hits": self.derived_hits, "rejections": self.derived_rejections}
+        if self.invalidator:
+            stats["invalidation"] = self.invalidator.get_stats()
+        if self.refresh_lease:
+            stats["refresh_lease"] = self.refresh_lease.get_stats()
+        if self.redis_single_flight:
+            stats["redis_single_flight"] = self.redis_single_flight.get_stats()
+        return stats
 
-            return weather_data
-        # If no cached data, fetch and cache
-        return await self._fetch_and_cache(city, country_code)
+    def write_metrics(self, writer: MetricsWriter):
+        """Cache effectiveness and refresh pipeline metrics (read from the counters at scrape time)"""
+        writer.counter("cache_lookups_total", "Weather requests by key family and result (hit, miss, stale).",
+                       [((("family", family), ("result", result)), count)
+                        for family, results in self.lookups.items() for result, count in results.items()])
+        l1 = self.local_cache.get_stats()
+        writer.counter("cache_tier_reads_total", "Cache reads by tier (l1 in-process, l2 Redis) and result.",
+                       [((("tier", "l1"), ("result", "hit")), l1["hits"]),
+                        ((("tier", "l1"), ("result", "miss")), l1["misses"]),
+                        ((("tier", "l2"), ("result", "hit")), self.redis_hits),
+                        ((("tier", "l2"), ("result", "miss")), self.redis_misses)])
+        writer.gauge("cache_l1_entries", "Entries in the in-process L1 cache.", [((), l1["size"])])
+        writer.counter("cache_negative_hits_total", "Requests answered from the negative cache.",
+                       [((), self.negative_hits)])
+        writer.histogram("proximity_match_distance_km", "Distance of proximity requests to the cached observation "
+                         "serving them (nearest-observation matches).", [((), self.nearest_distance_km)])
+        writer.counter("single_flight_coalesced_total", "Cache misses that joined an in-flight fetch.",
+                       [((), self.single_flight.coalesced)])
+        refresh = self.refresh_scheduler
+        writer.gauge("refresh_queue_depth", "Refreshes waiting in the refresh scheduler queue.",
+                     [((), refresh.queue_depth)])
+        writer.gauge("refresh_in_progress", "Refreshes currently running.", [((), refresh.in_progress)])
+        writer.histogram("refresh_lag_seconds", "Delay between a refresh becoming due and starting.",
+                         [((), refresh.lag_histogram)])
+        writer.counter("refreshes_total", "Refreshes by outcome.",
+                       [((("result", "completed"),), refresh.completed), ((("result", "failed"),), refresh.failed),
+                        ((("result", "dropped"),), refresh.dropped),
+                        ((("result", "deduplicated"),), refresh.deduplicated)])
+        if self.refresh_lease:
+            lease = self.refresh_lease.get_stats()
+            writer.counter("refresh_leases_total", "Refresh lease attempts by outcome.",
+                           [((("result", result),), count) for result, count in lease.items()])
+        if self.invalidator:
+            writer.counter("l1_invalidations_evicted_total", "L1 entries evicted on other replicas' writes.",
+                           [((), self.invalidator.evicted)])
 
-    async def _fetch_and_cache(self, city: str, country_code: Optional[str]=None) -> WeatherResponse:
-        """Fetch weather data and cache it"""
+    async def _read_cached(self, cache_key: str, model: Type[M]) -> Optional[M]:
+        """Read a cached entry from L1, then Redis (promoting it to L1). None on miss."""
+        value = self.local_cache.get(cache_key)
+        if value is not None:
+            return value
+        value = await self._read_redis(cache_key, model)
+        if value is None:
+            self.redis_misses += 1
+            return None
+        self.redis_hits += 1
+        self._set_local(cache_key, value)
+        return value
+
+    async def _read_redis(self, cache_key: str, model: Type[M]) -> Optional[M]:
+        """Read and decode an entry from Redis (following pointers), without touching the hit/miss counters"""
+        cached_data = await self._dereference_script(keys=[cache_key], args=[OBSERVATION_KEY_PREFIX])
+        if not cached_data:
+            return None
         try:
-            weather_data = await self.weather_service.get_current_weather(city, country_code)
-            cache_key = self._get_cache_key(city, country_code)
-            metadata_key = self._get_metadata_key(cache_key)
-            metadata = LocationCache(location_key=cache_key, last_updated=datetime.now(), request_count=1)
+            return codecs.decode(cached_data, model)
+        except (ValueError, ValidationError) as e:
+            # Entry in an outdated or unreadable format: treat it as a miss, the fetch overwrites it
+            logger.warning(f"Discarding unreadable cache entry {cache_key}: {str(e)}")
+            return None
 
-            # Cache data
-            await self.redis.set(cache_key, weather_data.model_dump_json(), ex=self.cache_duration)
-            await self.redis.set(metadata_key, metadata.model_dump_json(), ex=self.cache_duration)
+    def _set_local(self, cache_key: str, value: BaseModel, observation_key: Optional[str] = None):
+        """
+        Store a value in L1 under the key it is stored at in Redis (its observation key for observations with an
+        OpenWeather location id); `cache_key` then only points to it, so a refresh or invalidation of the
+        observation reaches every city/proximity key that resolves to it.
+        """
+        if observation_key is None:
+            observation_key = get_observation_key(value.city_id) if getattr(value, "city_id", None) else cache_key
+        self.local_cache.set(observation_key, value)
+        if observation_key != cache_key:
+            self.local_cache.set_pointer(cache_key, observation_key)
 
-            return weather_data
-        except Exception as e:
-            logger.error(f"Error fetching weather data: {str(e)}")
-            raise WeatherServiceException(str(e))
+    async def _write_cache(self, cache_key: str, value: BaseModel):
+        """
+        Write a fresh value to Redis and L1 and schedule its next background refresh.
+
+        Observations with an OpenWeather location id are stored once under their observation key, indexed for
+        proximity lookups at the observed coordinates; `cache_key` (city/proximity) then only points to it.
+        Writes made by a refresh holding a lease are fenced: they are dropped once the lease is no longer ours.
+        """
+        observation_key = get_storage_key(cache_key, value)
+        lease = current_lease()
+        async with self.binary_redis.pipeline(transaction=lease is not None) as pipe:
+            try:
+                if lease is not None:
+                    # WATCH: the transaction fails if the lease changes hands between this check and EXEC
+                    await pipe.watch(lease.key)
+                    held_by = await pipe.get(lease.key)
+                    if (held_by.decode() if isinstance(held_by, bytes) else held_by) != lease.token:
+                        raise WatchError(f"lease {lease.key} expired")
+                    pipe.multi()
+                pipe.set(observation_key, self.codec.encode(value), ex=self.cache_duration + self.stale_if_error)
+                pipe.zadd(REFRESH_SCHEDULE_KEY, {observation_key: time.time() + self.refresh_threshold})
+                if observation_key != cache_key:
+                    pipe.set(cache_key, observation_key, ex=self.pointer_ttl)
+                if observation_key != cache_key and value.latitude is not None and value.longitude is not None:
+                    # execute_command: the geoadd() signature differs between aioredis and redis-py
+                    pipe.execute_command("GEOADD", PROXIMITY_GEO_KEY, value.longitude, value.latitude,
+                                         observation_key)
+                await pipe.execute()
+            except WatchError:
+                self.refresh_lease.fenced += 1
+                logger.warning(f"Dropped refresh of {cache_key}: lease {lease.key} is no longer held")
+                return
+        self._set_local(cache_key, value, observation_key)
+        if self.invalidator:
+            await self.invalidator.publish({cache_key, observation_key})
 
-    async def _refresh_cache(self, city: str, country_code: Optional[str]=None):
-        """Refresh cached weather data"""
+    async def _coalesced_fetch(self, cache_key: str, fetch: Callable[[], Awaitable[M]], model: Type[M]) -> M:
+        """
+        Run a cache-miss fetch through single-flight so that concurrent misses on the same key
+        share one upstream call.
+
+        Args:
+            cache_key (str): Cache key the fetch populates.
+            fetch (Callable[[], Awaitable[M]]): Coroutine factory that fetches from upstream and caches the result.
+            model (Type[M]): Model of the cached value, used when waiting on another replica.
+
+        Returns:
+            M: Result of the shared fetch.
+        """
+        guarded_fetch = partial(self._fetch_unless_not_found, cache_key, fetch)
+        if self.redis_single_flight is None:
+            return await self.single_flight.do(cache_key, guarded_fetch)
+
+        async def fetch_across_replicas() -> M:
+            return await self.redis_single_flight.do(self.redis, cache_key, guarded_fetch,
+                                                     partial(self._read_fresh, cache_key, model))
+
+        return await self.single_flight.do(cache_key, fetch_across_replicas)
+
+    async def _fetch_unless_not_found(self, cache_key: str, fetch: Callable[[], Awaitable[M]]) -> M:
+        """
+        Run an upstream fetch unless the location is negatively cached; a 404 from upstream is negatively cached
+        for `negative_ttl` seconds so that repeats (typos, bots) are answered without an upstream call.
+        """
+        if self.negative_ttl <= 0:
+            return await fetch()
+        negative_key = get_negative_key(cache_key)
+        detail = await self.redis.get(negative_key)
+        if detail is not None:
+            self.negative_hits += 1
+            logger.info(f"Negative cache hit for key: {cache_key}")
+            raise WeatherServiceException(detail, status_code=404)
+        try:
+            return await fetch()
+        except WeatherDataNotFoundException as e:
+            await self.redis.set(negative_key, e.detail, ex=self.negative_ttl)
+            self.negative_writes += 1
+            raise
+
+    def _is_fresh(self, value: BaseModel) -> bool:
+        """Within the hard TTL: servable without a synchronous refetch"""
+        return get_data_age(value) <= self.cache_duration
+
+    async def _read_fresh(self, cache_key: str, model: Type[M]) -> Optional[M]:
+        """
+        Fresh entry written by another replica, polled while it holds the fetch lock. Reads Redis directly
+        (the other replica's write is not in this L1) and leaves the hit/miss counters alone, so empty polls
+        are not counted as misses.
+        """
+        value = await self._read_redis(cache_key, model)
+        if value is None or not self._is_fresh(value):
+            return None
+        self._set_local(cache_key, value)
+        return value
+
+    async def _fetch_or_serve_stale(self, cache_key: str, stale: Optional[M], fetch: Callable[[], Awaitable[M]]) -> M:
+        """
+        Refetch an entry past its hard TTL (or missing). While the upstream fails, the stale entry is served
+        for up to `stale_if_error` seconds past the hard TTL; client errors (e.g. 404) are always raised.
+
+        Args:
+            cache_key (str): Cache key being refetched.
+            stale (Optional[M]): Entry past its hard TTL, None on a plain miss.
+            fetch (Callable[[], Awaitable[M]]): Coroutine factory performing the (coalesced) fetch.
+
+        Returns:
+            M: Fresh value, or the stale one if the fetch failed.
+        """
+        family = get_key_family(cache_key)
+        self.lookups[family]["miss"] += 1
         try:
-            await self._fetch_and_cache(city, country_code)
-            logger.info(f"Refreshed cache for {city.capitalize()}")
+            return await fetch()
         except Exception as e:
-            logger.error(f"Failed to refresh cache data for {city.capitalize()}: {str(e)}")
+            if (stale is None or (isinstance(e, HTTPException) and e.status_code < 500)
+                    or get_data_age(stale) > self.cache_duration + self.stale_if_error):
+                raise
+            self.stale_served += 1
+            self.lookups[family]["stale"] += 1
+            logger.warning(f"Serving stale entry {cache_key} (age {get_data_age(stale)}s), fetch failed: {str(e)}")
+            return stale
 
     async def _refresh_loop(self):
-        """Background task to refresh cached locations"""
+        """Background task refreshing the cached locations that are due in the refresh schedule"""
         while True:
             try:
-                # retrieve all metadata keys
-                metadata_keys = await self.redis.keys("metadata:weather:*")
-                for metadata_key in metadata_keys:
-                    metadata_data = await self.redis.get(metadata_key)
-                    if metadata_data:
-                        metadata_ = LocationCache(**json.loads(metadata_data))
-                        # Refresh is needed?
-                        if (datetime.now() - metadata_.last_updated).total_seconds() > self.refresh_threshold:
-                            # Extract city/country from cache key
-                            _, _, city, *country = metadata_.location_key.split(":")
-                            country_code = country[0] if country else None
-                            # Refresh cache
-                            await self._refresh_cache(city, country_code)
-                            # Delay to prevent rate limiting
-                            await asyncio.sleep(0.5)
+                submitted = await self._refresh_due_entries()
+                if submitted:
+                    logger.info(f"Refresh loop queued {submitted} due cache entries")
+                if self.popularity:
+                    await self.popularity.flush()
+                    if not self._last_warm_up or time.monotonic() - self._last_warm_up >= self.warm_interval:
+                        await self.warm_up()
             except Exception as e:
                 logger.error(f"Error in refresh loop: {str(e)}")
 
-            # Wait next refresh cycle ~ 5 minutes
-            await asyncio.sleep(300)
+            # Wait next refresh cycle
+            await asyncio.sleep(self.refresh_interval)
+
+    async def _refresh_due_entries(self) -> int:
+        """
+        Hand every entry whose scheduled refresh time has passed to the refresh scheduler, in bounded batches.
+        Only due entries are read from the schedule ZSET, so the cost does not depend on the keyspace size.
+
+        Returns:
+            int: Number of entries submitted for refresh.
+        """
+        submitted = 0
+        while self.refresh_scheduler.has_capacity:
+            due_entries = await self.redis.zrangebyscore(REFRESH_SCHEDULE_KEY, "-inf", time.time(), start=0,
+                                                         num=self.refresh_batch_size, withscores=True)
+            if not due_entries:
+                break
+            for cache_key, due_at in due_entries:
+                if not self.refresh_scheduler.has_capacity:
+                    break
+                # ZREM claims the entry, a successful refresh re-schedules it through _write_cache
+                if not await self.redis.zrem(REFRESH_SCHEDULE_KEY, cache_key):
+                    continue
+                if self.refresh_scheduler.submit(cache_key, partial(self._refresh_scheduled, cache_key),
+                                                 due_at=due_at):
+                    submitted += 1
+                else:
+                    # Already pending (e.g. a request-triggered refresh, which does not re-schedule on failure)
+                    # or queue full: keep the key scheduled, the write of a successful refresh moves it forward
+                    await self.redis.zadd(REFRESH_SCHEDULE_KEY,
+                                          {cache_key: time.time() + self.refresh_retry_delay}, nx=True)
+        return submitted
+
+    async def _refresh_scheduled(self, cache_key: str):
+        """Refresh an entry popped from the schedule, re-scheduling it on failure"""
+        try:
+            if not await self._leased_refresh(cache_key, partial(self._refresh_key, cache_key)):
+                # Refreshed by the lease holder, whose write re-schedules the key; this is a fallback if it fails
+                await self.redis.zadd(REFRESH_SCHEDULE_KEY, {cache_key: time.time() + self.refresh_retry_delay},
+                                      nx=True)
+        except Exception:
+            await self.redis.zadd(REFRESH_SCHEDULE_KEY, {cache_key: time.time() + self.refresh_retry_delay})
+            logger.error(f"Failed to refresh {cache_key}, retrying in {self.refresh_retry_delay}s")
+            raise
+
+    async def warm_up(self) -> Dict[str, Any]:
+        """
+        Pre-fetch the most requested locations that are missing from Redis (cold start, failover, eviction)
+        or past their soft TTL, through the rate-limited refresh scheduler.
+
+        Returns:
+            Dict[str, Any]: Progress of this warm-up pass (also kept in `warm_up_progress`).
+        """
+        self._last_warm_up = time.monotonic()
+        hot = await self._canonical_keys([cache_key for cache_key, _ in await self.popularity.top(self.warm_top_n)])
+        progress = {"started_at": int(time.time()), "hot": len(hot), "cached": 0, "submitted": 0, "completed": 0,
+                    "failed": 0, "skipped": 0}
+        self.warm_up_progress = progress
+        if not hot:
+            return progress
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for cache_key in hot:
+                await self._dereference_ttl_script(keys=[cache_key], args=[OBSERVATION_KEY_PREFIX], client=pipe)
+            ttls = await pipe.execute()
+        # Remaining Redis TTL at which an entry passes its soft TTL (entries live hard TTL + stale window)
+        soft_ttl_left = self.stale_if_error + self.cache_duration - self.refresh_threshold
+        for cache_key, ttl in zip(hot, ttls):
+            if ttl == -1 or ttl > soft_ttl_left:
+                progress["cached"] += 1
+            elif self.refresh_scheduler.has_capacity and self.refresh_scheduler.submit(
+                    cache_key, partial(self._warm_key, cache_key, progress)):
+                progress["submitted"] += 1
+            else:
+                progress["skipped"] += 1
+        if progress["submitted"]:
+            logger.info(f"Warm-up queued {progress['submitted']} of {len(hot)} hot locations")
+        return progress
+
+    async def _canonical_keys(self, cache_keys: List[str]) -> List[str]:
+        """City keys mapped to their canonical location (aliases learned since they were recorded), deduplicated"""
+        families = ("weather:city:", "forecast:city:")
+        queries = []
+        for cache_key in cache_keys:
+            if cache_key.startswith(families):
+                parts = cache_key.split(":")
+                queries.append((parts[2], parts[3] if len(parts) > 3 else None))
+        resolved = iter(await self.locations.resolve_many(queries)) if queries else iter(())
+        canonical = []
+        for cache_key in cache_keys:
+            if cache_key.startswith("weather:city:"):
+                cache_key = get_city_key(*next(resolved))
+            elif cache_key.startswith("forecast:city:"):
+                cache_key = get_forecast_key(*next(resolved))
+            if cache_key not in canonical:
+                canonical.append(cache_key)
+        return canonical
+
+    async def _warm_key(self, cache_key: str, progress: Dict[str, Any]):
+        try:
+            await self._fetch_unless_not_found(
+                cache_key, partial(self._leased_refresh, cache_key, partial(self._refresh_key, cache_key)))
+            progress["completed"] += 1
+        except Exception:
+            progress["failed"] += 1
+            raise
+
+    async def get_hot_locations(self, limit: int = 20) -> Dict[str, Any]:
+        """Current hot set (decayed request counts) and the progress of the last warm-up pass"""
+        hot = await self.popularity.top(limit) if self.popularity else []
+        return {
+            "hot": [{"key": cache_key, "score": score} for cache_key, score in hot],
+            "warm_up": self.warm_up_progress,
+            "tracker": self.popularity.get_stats() if self.popularity else None,
+        }
+
+    def _track(self, cache_key: str):
+        if self.popularity:
+            self.popularity.record(cache_key)
+
+    async def _request_refresh(self, cache_key: str, value: BaseModel, fn: Callable[[], Awaitable[None]]):
+        """
+        Queue a request-triggered refresh of the entry `cache_key` resolved to (`value`) on the shared (rate
+        limited) refresh scheduler. The scheduler slot and the lease are taken on the key the value is stored
+        under, so city, city-country and proximity keys pointing to one observation, and the scheduled refresh of
+        that observation, share one refresh.
+        """
+        storage_key = get_storage_key(cache_key, value)
+        self.refresh_scheduler.submit(storage_key, partial(self._leased_refresh, storage_key, fn))
+
+    async def _leased_refresh(self, cache_key: str, fn: Callable[[], Awaitable[None]]) -> bool:
+        """
+        Run a refresh under the cross-replica refresh lease (directly when leases are disabled).
+
+        Returns:
+            bool: False when another replica holds the lease and the refresh was skipped.
+        """
+        if self.refresh_lease:
+            return await self.refresh_lease.run(cache_key, fn)
+        await fn()
+        return True
+
+    async def _refresh_key(self, cache_key: str):
+        """
+        Refresh a scheduled cache entry, dispatching on its key family.
+
+        Args:
+            cache_key (str): Cache key from the refresh schedule.
+        """
+        parts = cache_key.split(":")
+        if cache_key.startswith("weather:city:"):
+            city, country_code = parts[2], (parts[3] if len(parts) > 3 else None)
+            if country_code:
+                fetch = partial(self._fetch_and_cache_by_city_country, city, country_code, cache_key)
+            else:
+                fetch = partial(self._fetch_and_cache_by_city, city, cache_key)
+        elif cache_key.startswith("weather:proximity:"):
+            # Refresh at the originally requested coordinates, falling back to the cell centre
+            position = await self.redis.geopos(PROXIMITY_GEO_KEY, cache_key)
+            lon, lat = position[0] if position and position[0] else (float(parts[3]), float(parts[2]))
+            fetch = partial(self._fetch_and_cache_by_proximity, float(lat), float(lon), cache_key)
+        elif cache_key.startswith("forecast:city:"):
+            city, country_code = parts[2], (parts[3] if len(parts) > 3 else None)
+            fetch = partial(self._fetch_and_cache_forecast, city, country_code)
+        elif cache_key.startswith(OBSERVATION_KEY_PREFIX):
+            fetch = partial(self._fetch_and_cache_by_id, int(parts[2]), cache_key)
+        else:
+            logger.warning(f"Dropping unknown key from the refresh schedule: {cache_key}")
+            return
+        await self.single_flight.do(cache_key, fetch)
 
     async def get_weather_by_proximity(self, background_tasks: BackgroundTasks, lat: float,
                                        lon: float) -> WeatherResponse:
@@ -182,17 +678,73 @@ class WeatherCacheService:
             WeatherResponse: Weather data for the location.
         """
         proximity_key = get_proximity_key(lat, lon, self.proximity_precision)
-        cached_data = await self.redis.get(proximity_key)
+        self._track(proximity_key)
+        weather_data = await self._read_cached(proximity_key, WeatherResponse)
 
-        if cached_data:
+        if weather_data and self._is_fresh(weather_data):
             logger.info(f"Cache hit for proximity key: {proximity_key}")
-            weather_data = WeatherResponse(**json.loads(cached_data))
+            self.lookups["proximity"]["hit"] += 1
             # Schedule background refresh if needed
-            if (datetime.now() - datetime.fromtimestamp(weather_data.timestamp)).total_seconds() > self.refresh_threshold:
-                background_tasks.add_task(self._refresh_cache_by_proximity, lat, lon)
+            if get_data_age(weather_data) > self.refresh_threshold:
+                background_tasks.add_task(self._request_refresh, proximity_key, weather_data,
+                                          partial(self._refresh_cache_by_proximity, lat, lon))
+            return weather_data
+        # Nearest fresh observation cached for a neighbouring cell
+        nearest = await self._find_nearest_observation(lat, lon)
+        if nearest:
+            weather_data, distance_km, observation_key = nearest
+            self.nearest_hits += 1
+            self.nearest_distance_km_total += distance_km
+            self.nearest_distance_km_max = max(self.nearest_distance_km_max, distance_km)
+            self.nearest_distance_km.observe(distance_km)
+            logger.info(f"Served proximity request ({lat}, {lon}) from cached observation {distance_km:.2f} km away")
+            self.lookups["proximity"]["hit"] += 1
+            # Repeats from this cell are answered from L1 without another GEO lookup, as long as the observation
+            # (read into L1 above) is neither refreshed nor invalidated
+            self.local_cache.set_pointer(proximity_key, observation_key)
             return weather_data
+        self.nearest_misses += 1
         # If not found in cache -> fetch from Weather API and cache the results
-        return await self._fetch_and_cache_by_proximity(lat, lon, proximity_key)
+        fetch = partial(self._fetch_and_cache_by_proximity, lat, lon, proximity_key)
+        return await self._fetch_or_serve_stale(
+            proximity_key, weather_data, partial(self._coalesced_fetch, proximity_key, fetch, WeatherResponse))
+
+    async def _find_nearest_observation(self, lat: float,
+                                        lon: float) -> Optional[Tuple[WeatherResponse, float, str]]:
+        """
+        Find the nearest fresh cached proximity observation within `proximity_radius_km`.
+
+        Args:
+            lat (float): Latitude of the location.
+            lon (float): Longitude of the location.
+
+        Returns:
+            Optional[Tuple[WeatherResponse, float, str]]: Weather data, its distance in km and its cache key,
+            None if nothing fresh is near.
+        """
+        if self.proximity_radius_km <= 0:
+            return None
+        try:
+            candidates = await self.redis.georadius(PROXIMITY_GEO_KEY, lon, lat, self.proximity_radius_km, unit="km",
+                                                    withdist=True, count=self.proximity_candidates, sort="ASC")
+        except Exception as e:
+            logger.error(f"Nearest observation lookup failed for ({lat}, {lon}): {str(e)}")
+            return None
+
+        nearest = None
+        expired = []
+        for member, distance_km in candidates:
+            weather_data = await self._read_cached(member, WeatherResponse)
+            if weather_data is None:
+                # Cache entry expired, the GEO member is left behind
+                expired.append(member)
+                continue
+            if get_data_age(weather_data) <= self.refresh_threshold:
+                nearest = (weather_data, float(distance_km), member)
+                break
+        if expired:
+            await self.redis.zrem(PROXIMITY_GEO_KEY, *expired)
+        return nearest
 
     async def get_weather_by_city(self, background_tasks: BackgroundTasks, city: str) -> WeatherResponse:
         """
@@ -205,17 +757,24 @@ class WeatherCacheService:
         Returns:
             WeatherResponse: Weather data for the city.
         """
-        cache_key = f"weather:city:{city.lower()}"
+        city, country_code = await self.locations.resolve(city)
+        if country_code:
+            # "City,CC" or an alias learned for the bare city name
+            return await self.get_weather_by_city_country(background_tasks, city, country_code)
+        cache_key = get_city_key(city)
+        self._track(cache_key)
 
-        cached_data = await self.redis.get(cache_key)
-        if cached_data:
+        weather_data = await self._read_cached(cache_key, WeatherResponse)
+        if weather_data and self._is_fresh(weather_data):
             logger.info(f"Cache hit for city key: {cache_key}")
-            weather_data = WeatherResponse(**json.loads(cached_data))
-            if (datetime.now() - datetime.fromtimestamp(weather_data.timestamp)).total_seconds() > self.refresh_threshold:
-                background_tasks.add_task(self._refresh_cache_by_city, city)
+            self.lookups["city"]["hit"] += 1
+            if get_data_age(weather_data) > self.refresh_threshold:
+                background_tasks.add_task(self._request_refresh, cache_key, weather_data,
+                                          partial(self._refresh_cache_by_city, city))
             return weather_data
 
-        return await self._fetch_and_cache_by_city(city, cache_key)
+        return await self._fetch_or_serve_stale(cache_key, weather_data,
+                                                partial(self._fetch_current_by_city, city, None, cache_key))
 
     async def get_weather_by_city_country(self, background_tasks: BackgroundTasks, city: str, country_code: str) -> WeatherResponse:
         """
@@ -229,17 +788,191 @@ class WeatherCacheService:
         Returns:
             WeatherResponse: Weather data for the city and country.
         """
-        cache_key = f"weather:city:{city.lower()}:{country_code.lower()}"
+        city, country_code = await self.locations.resolve(city, country_code)
+        cache_key = get_city_key(city, country_code)
+        self._track(cache_key)
 
-        cached_data = await self.redis.get(cache_key)
-        if cached_data:
+        weather_data = await self._read_cached(cache_key, WeatherResponse)
+        if weather_data and self._is_fresh(weather_data):
             logger.info(f"Cache hit for city-country key: {cache_key}")
-            weather_data = WeatherResponse(**json.loads(cached_data))
-            if (datetime.now() - datetime.fromtimestamp(weather_data.timestamp)).total_seconds() > self.refresh_threshold:
-                background_tasks.add_task(self._refresh_cache_by_city_country, city, country_code)
+            self.lookups["city_country"]["hit"] += 1
+            if get_data_age(weather_data) > self.refresh_threshold:
+                background_tasks.add_task(self._request_refresh, cache_key, weather_data,
+                                          partial(self._refresh_cache_by_city_country, city, country_code))
             return weather_data
 
-        return await self._fetch_and_cache_by_city_country(city, country_code, cache_key)
+        return await self._fetch_or_serve_stale(cache_key, weather_data,
+                                                partial(self._fetch_current_by_city, city, country_code, cache_key))
+
+    async def _fetch_current_by_city(self, city: str, country_code: Optional[str], cache_key: str) -> WeatherResponse:
+        """Resolve a city cache miss: derived from the cached forecast when allowed, otherwise fetched upstream"""
+        if self.derive_from_forecast:
+            derived = await self._derive_from_forecast(city, country_code)
+            if derived:
+                return derived
+        if country_code:
+            return await self._coalesced_fetch(
+                cache_key, partial(self._fetch_and_cache_by_city_country, city, country_code, cache_key),
+                WeatherResponse)
+        return await self._coalesced_fetch(
+            cache_key, partial(self._fetch_and_cache_by_city, city, cache_key), WeatherResponse)
+
+    async def _derive_from_forecast(self, city: str, country_code: Optional[str] = None,
+                                    now: Optional[float] = None) -> Optional[WeatherResponse]:
+        """
+        Current conditions interpolated between the cached forecast points around now.
+
+        Returns None (caller falls back to the live weather endpoint) when no forecast is cached, it is older than
+        `derived_max_forecast_age`, now is outside its points, or the bracketing points differ by more than
+        `derived_max_temp_delta` or in weather group (linear interpolation would be unreliable).
+        The derived value is not cached: it is recomputed from the (L1-cached) forecast.
+        """
+        forecast = await self._read_cached(get_forecast_key(city, country_code), ForecastColumns)
+        if not forecast:
+            return None
+        now = time.time() if now is None else now
+        i = bisect_right(forecast.dt, now) - 1
+        if (forecast.fetched_at is None or now - forecast.fetched_at > self.derived_max_forecast_age
+                or i < 0 or i + 1 >= len(forecast.dt)
+                or abs(forecast.temp[i + 1] - forecast.temp[i]) > self.derived_max_temp_delta
+                or forecast.weather_main[i] != forecast.weather_main[i + 1]):
+            self.derived_rejections += 1
+            return None
+
+        weight = (now - forecast.dt[i]) / (forecast.dt[i + 1] - forecast.dt[i])
+
+        def lerp(column: List[float]) -> float:
+            return column[i] + (column[i + 1] - column[i]) * weight
+
+        nearest = i if weight < 0.5 else i + 1
+        interval_hours = (forecast.dt[i + 1] - forecast.dt[i]) / 3600
+        self.derived_hits += 1
+        logger.info(f"Derived current weather for {city} from the cached forecast")
+        return WeatherResponse(
+            location=forecast.city.name,
+            country=forecast.city.country,
+            temperature=round(lerp(forecast.temp), 2),
+            feels_like=round(lerp(forecast.feels_like), 2),
+            temperature_min=round(lerp(forecast.temp_min), 2),
+            temperature_max=round(lerp(forecast.temp_max), 2),
+            humidity=round(lerp(forecast.humidity)),
+            pressure=round(lerp(forecast.pressure)),
+            description=forecast.weather_description[nearest],
+            weather_group=forecast.weather_main[nearest],
+            weather_id=forecast.weather_id[nearest],
+            wind_speed=round(lerp(forecast.wind_speed), 2),
+            # forecast precipitation is the volume over the point's interval, the API reports mm/h
+            rain=round(forecast.rain_3h[i] / interval_hours, 2) if forecast.rain_3h[i] is not None else None,
+            snow=round(forecast.snow_3h[i] / interval_hours, 2) if forecast.snow_3h[i] is not None else None,
+            date=int(now),
+            timestamp=int(now),
+            sunrise=forecast.city.sunrise,
+            sunset=forecast.city.sunset,
+            derived=True,
+        )
+
+    async def get_weather_batch(self, background_tasks: BackgroundTasks,
+                                locations: List[WeatherRequest]) -> List[BatchWeatherItem]:
+        """
+        Get weather data for many locations in one call.
+
+        Identical locations are resolved once, cache hits are read with a single MGET and misses are
+        fetched concurrently (at most `batch_concurrency` at a time). Failures are reported per item.
+
+        Args:
+            background_tasks (BackgroundTasks): FastAPI background tasks for async cache refresh.
+            locations (List[WeatherRequest]): Cities (with optional country code) and/or lat/lon pairs.
+
+        Returns:
+            List[BatchWeatherItem]: One result per requested location, in request order.
+        """
+        # City queries are canonicalized in one alias lookup; misses are fetched for the canonical location
+        cities = iter(await self.locations.resolve_many([(loc.city, loc.country_code)
+                                                         for loc in locations if loc.city]))
+        canonical = []
+        for location in locations:
+            if location.city:
+                city, country_code = next(cities)
+                location = WeatherRequest(city=city, country_code=country_code)
+            canonical.append(location)
+        keys = [get_city_key(loc.city, loc.country_code) if loc.city
+                else get_proximity_key(loc.latitude, loc.longitude, self.proximity_precision)
+                for loc in canonical]
+        for cache_key in keys:
+            self._track(cache_key)
+        # Deduplicate, keeping the first request for each key
+        unique: Dict[str, WeatherRequest] = {}
+        for cache_key, location in zip(keys, canonical):
+            unique.setdefault(cache_key, location)
+
+        resolved: Dict[str, Union[WeatherResponse, Exception]] = {}
+        for cache_key in unique:
+            value = self.local_cache.get(cache_key)
+            if value is not None:
+                resolved[cache_key] = value
+
+        l2_keys = [cache_key for cache_key in unique if cache_key not in resolved]
+        if l2_keys:
+            values = await self.binary_redis.mget(l2_keys)
+            # Pointer keys are followed with one more MGET for all of them
+            pointers = {i: get_pointer(value) for i, value in enumerate(values) if get_pointer(value)}
+            if pointers:
+                for i, value in zip(pointers, await self.binary_redis.mget(list(pointers.values()))):
+                    values[i] = value
+            for cache_key, cached_data in zip(l2_keys, values):
+                if not cached_data:
+                    self.redis_misses += 1
+                    continue
+                try:
+                    weather_data = codecs.decode(cached_data, WeatherResponse)
+                except (ValueError, ValidationError) as e:
+                    # Unreadable entry: resolved as a miss below, the fetch overwrites it
+                    logger.warning(f"Discarding unreadable cache entry {cache_key}: {str(e)}")
+                    self.redis_misses += 1
+                    continue
+                self.redis_hits += 1
+                self._set_local(cache_key, weather_data)
+                resolved[cache_key] = weather_data
+
+        stale: Dict[str, WeatherResponse] = {}
+        for cache_key, weather_data in list(resolved.items()):
+            if not self._is_fresh(weather_data):
+                # Past the hard TTL: refetched below like a miss, served only if that fails
+                stale[cache_key] = resolved.pop(cache_key)
+                continue
+            self.lookups[get_key_family(cache_key)]["hit"] += 1
+            if get_data_age(weather_data) > self.refresh_threshold:
+                background_tasks.add_task(self._request_refresh, cache_key, weather_data,
+                                          partial(self._refresh_key, cache_key))
+
+        semaphore = asyncio.Semaphore(self.batch_concurrency)
+
+        async def resolve_miss(cache_key: str, location: WeatherRequest):
+            async with semaphore:
+                try:
+                    if location.city:
+                        resolved[cache_key] = await self._fetch_or_serve_stale(
+                            cache_key, stale.get(cache_key),
+                            partial(self._fetch_current_by_city, location.city, location.country_code, cache_key))
+                    else:
+                        resolved[cache_key] = await self.get_weather_by_proximity(
+                            background_tasks, location.latitude, location.longitude)
+                except Exception as e:
+                    resolved[cache_key] = e
+
+        await asyncio.gather(*(resolve_miss(cache_key, location) for cache_key, location in unique.items()
+                               if cache_key not in resolved))
+
+        results = []
+        for cache_key, location in zip(keys, locations):
+            value = resolved[cache_key]
+            if isinstance(value, Exception):
+                status_code = value.status_code if isinstance(value, HTTPException) else 500
+                detail = value.detail if isinstance(value, HTTPException) else str(value)
+                results.append(BatchWeatherItem(location=location, status_code=status_code, error=detail))
+            else:
+                results.append(BatchWeatherItem(location=location, weather=value))
+        return results
 
     async def _fetch_and_cache_by_proximity(self, lat: float, lon: float, proximity_key: str) -> WeatherResponse:
         """
@@ -255,19 +988,48 @@ class WeatherCacheService:
         """
         try:
             weather_data = await self.weather_service.get_current_weather_by_coordinates(lat, lon)
-            await self.redis.set(proximity_key, weather_data.model_dump_json(), ex=self.cache_duration)
+            await self._write_cache(proximity_key, weather_data)
+            if not weather_data.city_id:
+                # Stored under the proximity key itself, indexed at the requested coordinates
+                await self._index_observation(lat, lon, proximity_key)
             logger.info(f"Cached weather data for proximity key: {proximity_key}")
             return weather_data
+        except WeatherServiceException:
+            # Keep the upstream status (e.g. 404 for unknown locations)
+            raise
         except Exception as e:
             logger.error(f"Error fetching weather data for proximity key: {proximity_key} - {str(e)}")
             raise WeatherServiceException(str(e))
 
+    async def _fetch_and_cache_by_id(self, city_id: int, cache_key: str) -> WeatherResponse:
+        try:
+            weather_data = await self.weather_service.get_current_weather_by_id(city_id)
+            await self._write_cache(cache_key, weather_data)
+            logger.info(f"Cached weather data for observation key: {cache_key}")
+            return weather_data
+        except WeatherServiceException:
+            raise
+        except Exception as e:
+            logger.error(f"Error fetching weather data for observation key: {cache_key} - {str(e)}")
+            raise WeatherServiceException(str(e))
+
+    async def _index_observation(self, lat: float, lon: float, proximity_key: str):
+        """Record the observation's coordinates in the proximity GEO set"""
+        try:
+            # execute_command: the geoadd() signature differs between aioredis and redis-py
+            await self.redis.execute_command("GEOADD", PROXIMITY_GEO_KEY, lon, lat, proximity_key)
+        except Exception as e:
+            logger.error(f"Failed to index observation {proximity_key} at ({lat}, {lon}): {str(e)}")
+
     async def _fetch_and_cache_by_city(self, city: str, cache_key: str) -> WeatherResponse:
         try:
             weather_data = await self.weather_service.get_current_weather(city)
-            await self.redis.set(cache_key, weather_data.model_dump_json(), ex=self.cache_duration)
+            cache_key = await self._canonical_city_key(city, None, weather_data, cache_key)
+            await self._write_cache(cache_key, weather_data)
             logger.info(f"Cached weather data for city key: {cache_key}")
             return weather_data
+        except WeatherServiceException:
+            raise
         except Exception as e:
             logger.error(f"Error fetching weather data for city key: {cache_key} - {str(e)}")
             raise WeatherServiceException(str(e))
@@ -275,13 +1037,25 @@ class WeatherCacheService:
     async def _fetch_and_cache_by_city_country(self, city: str, country_code: str, cache_key: str) -> WeatherResponse:
         try:
             weather_data = await self.weather_service.get_current_weather(city, country_code)
-            await self.redis.set(cache_key, weather_data.model_dump_json(), ex=self.cache_duration)
+            cache_key = await self._canonical_city_key(city, country_code, weather_data, cache_key)
+            await self._write_cache(cache_key, weather_data)
             logger.info(f"Cached weather data for city-country key: {cache_key}")
             return weather_data
+        except WeatherServiceException:
+            raise
         except Exception as e:
             logger.error(f"Error fetching weather data for city-country key: {cache_key} - {str(e)}")
             raise WeatherServiceException(str(e))
 
+    async def _canonical_city_key(self, city: str, country_code: Optional[str], weather_data: WeatherResponse,
+                                  cache_key: str) -> str:
+        """Learn the alias query -> returned location; the cache key the data is stored under"""
+        canonical_city, canonical_country = await self.locations.learn((city, country_code), weather_data.location,
+                                                                       weather_data.country)
+        if (canonical_city, canonical_country) == (city, country_code):
+            return cache_key
+        return get_city_key(canonical_city, canonical_country)
+
     async def _refresh_cache_by_proximity(self, lat: float, lon: float):
         """
         Refresh the cache entry for a proximity cluster.
@@ -291,52 +1065,69 @@ class WeatherCacheService:
             lon (float): Longitude of the location.
         """
         proximity_key = get_proximity_key(lat, lon, self.proximity_precision)
-        await self._fetch_and_cache_by_proximity(lat, lon, proximity_key)
+        await self.single_flight.do(proximity_key, partial(self._fetch_and_cache_by_proximity, lat, lon, proximity_key))
 
     async def _refresh_cache_by_city(self, city: str):
-        cache_key = f"weather:city:{city.lower()}"
-        await self._fetch_and_cache_by_city(city, cache_key)
+        cache_key = get_city_key(city)
+        await self.single_flight.do(cache_key, partial(self._fetch_and_cache_by_city, city, cache_key))
 
     async def _refresh_cache_by_city_country(self, city: str, country_code: str):
-        cache_key = f"weather:city:{city.lower()}:{country_code.lower()}"
-        await self._fetch_and_cache_by_city
+        cache_key = get_city_key(city, country_code)
+        await self.single_flight.do(
+            cache_key, partial(self._fetch_and_cache_by_city_country, city, country_code, cache_key))
 
     async def get_forecast_by_city(self, background_tasks: BackgroundTasks, city: str,
-                                   country_code: Optional[str] = None) -> ForecastResponse:
-        cache_key = f"forecast:city:{city.lower()}" + (f":{country_code.lower()}" if country_code else "")
+                                   country_code: Optional[str] = None) -> ForecastColumns:
+        """
+        Get the 5-day/3-hour forecast for a city using caching. Forecasts are cached in columnar form,
+        callers slice/project it or rebuild the full ForecastResponse.
+
+        Args:
+            background_tasks (BackgroundTasks): FastAPI background tasks for async cache refresh.
+            city (str): City name.
+            country_code (Optional[str]): ISO country code.
+
+        Returns:
+            ForecastColumns: Columnar forecast for the city.
+        """
+        city, country_code = await self.locations.resolve(city, country_code)
+        cache_key = get_forecast_key(city, country_code)
+        self._track(cache_key)
         # Try to get cached data
-        cached_data = await self.redis.get(cache_key)
-        if cached_data:
+        forecast_data = await self._read_cached(cache_key, ForecastColumns)
+        if forecast_data and self._is_fresh(forecast_data):
             logger.info(f"Cache hit for forecast key: {cache_key}")
-            forecast_data = ForecastResponse(**json.loads(cached_data))
+            self.lookups["forecast"]["hit"] += 1
             # Check if refresh is needed
-            if (datetime.now() - datetime.fromtimestamp(
-                    forecast_data.forecast_points[0].dt)).total_seconds() > self.refresh_threshold:
-                background_tasks.add_task(self._refresh_forecast_cache, city, country_code)
+            if get_data_age(forecast_data) > self.refresh_threshold:
+                background_tasks.add_task(self._request_refresh, cache_key, forecast_data,
+                                          partial(self._refresh_forecast_cache, city, country_code))
             return forecast_data
         # If not in cache, fetch and cache
-        return await self._fetch_and_cache_forecast(city, country_code)
+        fetch = partial(self._fetch_and_cache_forecast, city, country_code)
+        return await self._fetch_or_serve_stale(
+            cache_key, forecast_data, partial(self._coalesced_fetch, cache_key, fetch, ForecastColumns))
 
-    async def _fetch_and_cache_forecast(self, city: str, country_code: Optional[str] = None) -> ForecastResponse:
+    async def _fetch_and_cache_forecast(self, city: str, country_code: Optional[str] = None) -> ForecastColumns:
         try:
-            forecast_data = await self.weather_service.get_forecast(city, country_code)
-            cache_key = f"forecast:city:{city.lower()}" + (f":{country_code.lower()}" if country_code else "")
+            forecast_data = ForecastColumns.from_response(await self.weather_service.get_forecast(city, country_code),
+                                                          fetched_at=int(time.time()))
+            cache_key = get_forecast_key(*await self.locations.learn((city, country_code), forecast_data.city.name,
+                                                                     forecast_data.city.country))
             # Cache the forecast data
-            await self.redis.set(
-                cache_key,
-                forecast_data.model_dump_json(),
-                ex=self.cache_duration
-            )
+            await self._write_cache(cache_key, forecast_data)
             logger.info(f"Cached forecast data for key: {cache_key}")
             return forecast_data
-
+        except WeatherServiceException:
+            raise
         except Exception as e:
             logger.error(f"Error fetching forecast data: {str(e)}")
             raise WeatherServiceException(str(e))
 
     async def _refresh_forecast_cache(self, city: str, country_code: Optional[str] = None):
+        cache_key = get_forecast_key(city, country_code)
         try:
-            await self._fetch_and_cache_forecast(city, country_code)
+            await self.single_flight.do(cache_key, partial(self._fetch_and_cache_forecast, city, country_code))
             logger.info(f"Refreshed forecast cache for {city}")
         except Exception as e:
             logger.error(f"Failed to refresh forecast cache for {city}: {str(e)}")
@@ -0,0 +1,157 @@
+import logging
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Tuple
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Failure-rate circuit breaker for upstream calls.
+
+    Closed: calls pass and their outcomes are kept for `window_seconds`; once at least `min_calls` were made
+    and the failure rate reaches `failure_rate_threshold` the breaker opens.
+    Open: calls are rejected (fail fast) for `open_seconds`, then the breaker turns half-open.
+    Half-open: up to `half_open_max_calls` probes pass; a successful probe closes the breaker, a failed one reopens it.
+    """
+
+    def __init__(
+        self,
+        failure_rate_threshold: float = 0.5,
+        window_seconds: float = 30.0,
+        min_calls: int = 20,
+        open_seconds: float = 30.0,
+        half_open_max_calls: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_rate_threshold = failure_rate_threshold
+        self.window_seconds = window_seconds
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self.half_open_max_calls = half_open_max_calls
+        self._clock = clock
+        self.state = CLOSED
+        # (time, succeeded) of the calls within the window
+        self._outcomes: Deque[Tuple[float, bool]] = deque()
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self.opened = 0
+        self.rejected = 0
+
+    def _trim(self, now: float):
+        while self._outcomes and self._outcomes[0][0] < now - self.window_seconds:
+            _, succeeded = self._outcomes.popleft()
+            if not succeeded:
+                self._failures -= 1
+
+    def _transition(self, state: str):
+        if state != self.state:
+            logger.warning(f"OpenWeather circuit breaker: {self.state} -> {state}")
+        self.state = state
+        if state == OPEN:
+            self._opened_at = self._clock()
+            self.opened += 1
+        if state != CLOSED:
+            self._outcomes.clear()
+            self._failures = 0
+        self._probes = 0
+
+    def allow_request(self) -> bool:
+        """Whether an upstream call may be made now (counts a rejection otherwise)"""
+        if self.state == OPEN and self._clock() - self._opened_at >= self.open_seconds:
+            self._transition(HALF_OPEN)
+            self._opened_at = self._clock()
+        if self.state == HALF_OPEN:
+            # Probes that never reported back (e.g. cancelled) are given up on after another open period
+            if self._probes >= self.half_open_max_calls and self._clock() - self._opened_at >= self.open_seconds:
+                self._probes = 0
+                self._opened_at = self._clock()
+            if self._probes < self.half_open_max_calls:
+                self._probes += 1
+                return True
+        elif self.state == CLOSED:
+            return True
+        self.rejected += 1
+        return False
+
+    def record_success(self):
+        if self.state == HALF_OPEN:
+            self._transition(CLOSED)
+            return
+        self._record(True)
+
+    def record_failure(self):
+        if self.state == HALF_OPEN:
+            self._transition(OPEN)
+            return
+        if self.state == CLOSED:
+            self._record(False)
+            if len(self._outcomes) >= self.min_calls and self.failure_rate >= self.failure_rate_threshold:
+                self._transition(OPEN)
+
+    def _record(self, succeeded: bool):
+        now = self._clock()
+        self._trim(now)
+        self._outcomes.append((now, succeeded))
+        if not succeeded:
+            self._failures += 1
+
+    @property
+    def failure_rate(self) -> float:
+        return self._failures / len(self._outcomes) if self._outcomes else 0.0
+
+    def get_stats(self) -> Dict[str, Any]:
+        self._trim(self._clock())
+        return {
+            "state": self.state,
+            "failure_rate": round(self.failure_rate, 3),
+            "calls_in_window": len(self._outcomes),
+            "opened": self.opened,
+            "rejected": self.rejected,
+        }
+
+
+class RetryBudget:
+    """
+    Global cap on retries: within a sliding window, retries may make up at most `ratio` of the calls
+    (plus `min_retries` always allowed so that low traffic can still retry).
+    """
+
+    def __init__(
+        self, ratio: float = 0.1, min_retries: int = 10, window_seconds: float = 10.0, clock: Callable[[], float] = time.monotonic
+    ):
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.window_seconds = window_seconds
+        self._clock = clock
+        self._calls: Deque[float] = deque()
+        self._retries: Deque[float] = deque()
+        self.exhausted = 0
+
+    def _trim(self, now: float):
+        for events in (self._calls, self._retries):
+            while events and events[0] < now - self.window_seconds:
+                events.popleft()
+
+    def record_call(self):
+        self._calls.append(self._clock())
+
+    def try_retry(self) -> bool:
+        """Take a retry from the budget; False (and counted) when it is spent"""
+        now = self._clock()
+        self._trim(now)
+        if len(self._retries) >= self.min_retries + self.ratio * len(self._calls):
+            self.exhausted += 1
+            return False
+        self._retries.append(now)
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        self._trim(self._clock())
+        return {"calls_in_window": len(self._calls), "retries_in_window": len(self._retries), "exhausted": self.exhausted}
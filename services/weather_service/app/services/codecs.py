@@ -0,0 +1,124 @@
+import logging
+import zlib
+from abc import ABC, abstractmethod
+from typing import Dict, Type, TypeVar, Union
+
+from pydantic import BaseModel
+
+try:
+    import msgpack
+except ImportError:  # optional dependency, only needed for the msgpack codec
+    msgpack = None
+
+
+logger = logging.getLogger(__name__)
+
+M = TypeVar("M", bound=BaseModel)
+
+# Entries written before the codec layer are plain JSON objects, i.e. their first byte is "{"
+LEGACY_JSON_PREFIX = ord("{")
+
+
+class CacheCodec(ABC):
+    """
+    Serializes cached models. Every encoded value starts with a one-byte header identifying the codec,
+    so values written by any registered codec (and legacy plain JSON) stay readable whatever codec is configured.
+    """
+
+    codec_id: int = 0
+    name: str = ""
+
+    def __init__(self, compress: bool = False, compression_level: int = 6):
+        self.compress = compress
+        self.compression_level = compression_level
+
+    @property
+    def header(self) -> int:
+        return self.codec_id | (0x80 if self.compress else 0)
+
+    def encode(self, value: BaseModel) -> bytes:
+        payload = self._dump(value)
+        if self.compress:
+            payload = zlib.compress(payload, self.compression_level)
+        return bytes([self.header]) + payload
+
+    @abstractmethod
+    def _dump(self, value: BaseModel) -> bytes:
+        """Serialize the model (without the header byte)"""
+
+    @staticmethod
+    @abstractmethod
+    def load(payload: bytes, model: Type[M]) -> M:
+        """Deserialize a payload produced by `_dump`"""
+
+
+class JsonCodec(CacheCodec):
+    codec_id = 0x01
+    name = "json"
+
+    def _dump(self, value: BaseModel) -> bytes:
+        return value.model_dump_json().encode()
+
+    @staticmethod
+    def load(payload: bytes, model: Type[M]) -> M:
+        return model.model_validate_json(payload)
+
+
+class MsgpackCodec(CacheCodec):
+    codec_id = 0x02
+    name = "msgpack"
+
+    def __init__(self, compress: bool = False, compression_level: int = 6):
+        if msgpack is None:
+            raise ImportError("The msgpack cache codec requires the 'msgpack' package")
+        super().__init__(compress, compression_level)
+
+    def _dump(self, value: BaseModel) -> bytes:
+        return msgpack.packb(value.model_dump(mode="json"))
+
+    @staticmethod
+    def load(payload: bytes, model: Type[M]) -> M:
+        if msgpack is None:
+            raise ImportError("Reading msgpack cache entries requires the 'msgpack' package")
+        return model.model_validate(msgpack.unpackb(payload))
+
+
+CODECS: Dict[str, Type[CacheCodec]] = {JsonCodec.name: JsonCodec, MsgpackCodec.name: MsgpackCodec}
+CODECS_BY_ID: Dict[int, Type[CacheCodec]] = {codec.codec_id: codec for codec in CODECS.values()}
+
+
+def get_codec(name: str = "json", compress: bool = False) -> CacheCodec:
+    """Codec used for writing new cache entries"""
+    try:
+        return CODECS[name](compress=compress)
+    except KeyError:
+        raise ValueError(f"Unknown cache codec: {name} (available: {', '.join(CODECS)})")
+
+
+def decode(data: Union[bytes, str], model: Type[M]) -> M:
+    """
+    Decode a cached value written by any codec (or a legacy plain-JSON entry).
+    Unreadable values (unknown header, corrupted compressed payload) raise ValueError.
+
+    Args:
+        data (Union[bytes, str]): Raw Redis value.
+        model (Type[M]): Model to validate into.
+
+    Returns:
+        M: The cached model.
+    """
+    if isinstance(data, str):
+        data = data.encode()
+    header = data[0]
+    if header == LEGACY_JSON_PREFIX:
+        return model.model_validate_json(data)
+    codec = CODECS_BY_ID.get(header & 0x7F)
+    if codec is None:
+        raise ValueError(f"Unknown cache codec header: {header:#04x}")
+    payload = data[1:]
+    if header & 0x80:
+        try:
+            payload = zlib.decompress(payload)
+        except zlib.error as e:
+            raise ValueError(f"Corrupted compressed cache entry: {str(e)}") from e
+    return codec.load(payload, model)
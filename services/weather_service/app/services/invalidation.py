@@ -0,0 +1,131 @@
+import asyncio
+import json
+import logging
+import uuid
+from typing import Dict, Iterable, Optional
+
+import aioredis
+
+from app.services.local_cache import LocalTTLCache
+
+logger = logging.getLogger(__name__)
+
+# Pub/sub channel carrying {"origin": <replica id>, "keys": [...]} for every cache write
+INVALIDATION_CHANNEL = "weather:cache:invalidate"
+
+
+class L1Invalidator:
+    """
+    Keeps the in-process L1 caches of all replicas consistent with Redis.
+
+    Every cache write publishes the written keys on `INVALIDATION_CHANNEL`; each replica's listener evicts those
+    keys from its L1, so the next read goes to Redis and picks up the new value. City and proximity keys are only
+    pointers to their observation in L1, so evicting an observation key (which every refresh writes) also evicts
+    every key that resolves to it. Pub/sub delivery is at most once: after the subscription is (re)established the
+    whole L1 is dropped, since events may have been missed meanwhile.
+    """
+
+    def __init__(
+        self, redis: aioredis.Redis, local_cache: LocalTTLCache, channel: str = INVALIDATION_CHANNEL, reconnect_delay: float = 1.0
+    ):
+        self.redis = redis
+        self.local_cache = local_cache
+        self.channel = channel
+        self.reconnect_delay = reconnect_delay
+        # Identifies this replica's own events, which need no eviction
+        self.origin = uuid.uuid4().hex
+        self._listener: Optional[asyncio.Task] = None
+        self._subscribed = asyncio.Event()
+        self.published = 0
+        self.received = 0
+        self.evicted = 0
+        self.resubscribed = 0
+        self.errors = 0
+
+    def start(self):
+        """Start listening for invalidation events"""
+        if not self._listener or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+            logger.info(f"Listening for L1 invalidations on {self.channel}")
+
+    async def stop(self):
+        if self._listener and not self._listener.done():
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+        self._listener = None
+        self._subscribed.clear()
+
+    async def wait_subscribed(self, timeout: float = 5.0):
+        """Wait until the listener is subscribed (events published before that are not received)"""
+        await asyncio.wait_for(self._subscribed.wait(), timeout)
+
+    async def publish(self, keys: Iterable[str]):
+        """
+        Tell the other replicas that `keys` were written.
+
+        Failures are logged and ignored: the other replicas' L1 entries then expire after their TTL.
+        """
+        message = json.dumps({"origin": self.origin, "keys": list(keys)})
+        try:
+            await self.redis.publish(self.channel, message)
+            self.published += 1
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"Failed to publish L1 invalidation: {str(e)}")
+
+    def handle(self, data) -> int:
+        """
+        Evict the keys of one invalidation event from the local L1.
+
+        Returns:
+            int: Number of keys evicted (0 for own or malformed events).
+        """
+        try:
+            event = json.loads(data)
+            origin, keys = event["origin"], event["keys"]
+        except (ValueError, TypeError, KeyError) as e:
+            logger.warning(f"Ignoring malformed L1 invalidation {data!r}: {str(e)}")
+            return 0
+        self.received += 1
+        if origin == self.origin:
+            return 0
+        for key in keys:
+            self.local_cache.delete(key)
+        self.evicted += len(keys)
+        return len(keys)
+
+    async def _listen(self):
+        while True:
+            pubsub = self.redis.pubsub()
+            try:
+                await pubsub.subscribe(self.channel)
+                if self._subscribed.is_set():
+                    # Events published while we were disconnected are lost
+                    self.resubscribed += 1
+                    self.local_cache.clear()
+                    logger.warning("L1 invalidation subscription re-established, local cache cleared")
+                self._subscribed.set()
+                while True:
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                    if message and message["type"] == "message":
+                        self.handle(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"L1 invalidation listener failed, resubscribing: {str(e)}")
+                await asyncio.sleep(self.reconnect_delay)
+            finally:
+                try:
+                    await pubsub.close()
+                except Exception:
+                    pass
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "published": self.published,
+            "received": self.received,
+            "evicted": self.evicted,
+            "resubscribed": self.resubscribed,
+            "errors": self.errors,
+        }
@@ -0,0 +1,88 @@
+import time
+import logging
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class L1Pointer(NamedTuple):
+    """Entry standing for the value cached under `target` (e.g. a city key pointing to its observation)"""
+
+    target: Hashable
+
+
+class LocalTTLCache:
+    """
+    Bounded in-process LRU cache with a per-entry TTL.
+
+    Used as the L1 tier in front of Redis: it stores already-validated model objects so a hit
+    costs neither a Redis round trip nor JSON parsing/validation. Keys sharing one value hold a pointer to it
+    (`set_pointer`), so replacing or deleting the target updates or evicts all of them at once.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float = 60.0, clock: Callable[[], float] = time.monotonic):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value (following a pointer), None when missing or expired"""
+        value = self._lookup(key)
+        if isinstance(value, L1Pointer):
+            value = self._lookup(value.target)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return value
+
+    def _lookup(self, key: Hashable) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            self.expirations += 1
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """Store a value, evicting the least recently used entry when the cache is full"""
+        if self.max_size <= 0:
+            return
+        self._entries[key] = (self._clock() + (self.ttl if ttl is None else ttl), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def set_pointer(self, key: Hashable, target: Hashable, ttl: Optional[float] = None):
+        """Make `key` resolve to whatever is cached under `target`"""
+        self.set(key, L1Pointer(target), ttl)
+
+    def delete(self, key: Hashable):
+        self._entries.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
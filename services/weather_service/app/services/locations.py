@@ -0,0 +1,117 @@
+import logging
+import unicodedata
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import aioredis
+
+from app.services.local_cache import LocalTTLCache
+
+logger = logging.getLogger(__name__)
+
+# Hash of learned aliases: field = normalized query ("warszawa", "warsaw:pl"), value = canonical "city:country"
+LOCATION_ALIASES_KEY = "weather:location:aliases"
+
+Location = Tuple[str, Optional[str]]
+
+
+def normalize_location(city: str, country_code: Optional[str] = None) -> Location:
+    """
+    Normalize a location query: trim and collapse whitespace, case-fold, strip diacritics from Latin letters
+    ("Kraków" -> "krakow", other scripts are kept as they are) and split a "City,CC" suffix.
+
+    Args:
+        city (str): City name as typed by the user, optionally with a ",CC" country suffix.
+        country_code (Optional[str]): ISO country code, takes precedence over the suffix.
+
+    Returns:
+        Location: (normalized city, lower-case country code or None).
+    """
+    if "," in city:
+        city, suffix = city.rsplit(",", 1)
+        country_code = country_code or suffix
+    decomposed = unicodedata.normalize("NFKD", city)
+    chars = []
+    for char in decomposed:
+        if unicodedata.combining(char) and chars and chars[-1].isascii():
+            continue
+        chars.append(char)
+    city = " ".join(unicodedata.normalize("NFC", "".join(chars)).casefold().split())
+    country_code = country_code.strip().lower() if country_code and country_code.strip() else None
+    return city, country_code
+
+
+def _alias_field(location: Location) -> str:
+    city, country_code = location
+    return f"{city}:{country_code}" if country_code else city
+
+
+class LocationResolver:
+    """
+    Maps location queries to canonical locations so that every spelling shares one cache entry.
+
+    Queries are normalized (see `normalize_location`) and then looked up in an alias map learned from
+    OpenWeather answers (query -> returned `name`/`sys.country`), kept in Redis and mirrored in-process.
+    """
+
+    def __init__(self, redis: aioredis.Redis, local_cache: Optional[LocalTTLCache] = None):
+        self.redis = redis
+        self.local_cache = local_cache if local_cache is not None else LocalTTLCache(max_size=10000, ttl=300.0)
+        self.resolved = 0
+        self.learned = 0
+
+    async def resolve(self, city: str, country_code: Optional[str] = None) -> Location:
+        """Canonical (city, country code) for a query, the normalized query when no alias is known"""
+        return (await self.resolve_many([(city, country_code)]))[0]
+
+    async def resolve_many(self, queries: Sequence[Tuple[str, Optional[str]]]) -> List[Location]:
+        """Resolve several queries with at most one Redis round trip (HMGET)"""
+        normalized = [normalize_location(city, country_code) for city, country_code in queries]
+        fields = [_alias_field(location) for location in normalized]
+        aliases = {field: self.local_cache.get(field) for field in set(fields)}
+        unknown = [field for field, alias in aliases.items() if alias is None]
+        if unknown:
+            try:
+                for field, alias in zip(unknown, await self.redis.hmget(LOCATION_ALIASES_KEY, unknown)):
+                    # Fields without alias are cached as "" so repeats skip Redis as well
+                    aliases[field] = alias or ""
+                    self.local_cache.set(field, aliases[field])
+            except Exception as e:
+                logger.error(f"Location alias lookup failed: {str(e)}")
+        resolved = []
+        for field, location in zip(fields, normalized):
+            alias = aliases.get(field)
+            if alias:
+                self.resolved += 1
+                city, _, country_code = alias.rpartition(":")
+                resolved.append((city, country_code or None))
+            else:
+                resolved.append(location)
+        return resolved
+
+    async def learn(self, query: Location, name: str, country: Optional[str]) -> Location:
+        """
+        Record that OpenWeather answered `query` with location `name`/`country`.
+
+        Args:
+            query (Location): Normalized query the upstream call was made for.
+            name (str): Location name returned by OpenWeather.
+            country (Optional[str]): Country code returned by OpenWeather.
+
+        Returns:
+            Location: Canonical location the data belongs to.
+        """
+        canonical = normalize_location(name, country)
+        if not canonical[0] or canonical == query:
+            return query
+        field, alias = _alias_field(query), f"{canonical[0]}:{canonical[1] or ''}"
+        try:
+            await self.redis.hset(LOCATION_ALIASES_KEY, field, alias)
+            self.local_cache.set(field, alias)
+            self.learned += 1
+            logger.info(f"Learned location alias {field} -> {alias}")
+        except Exception as e:
+            logger.error(f"Failed to store location alias {field}: {str(e)}")
+        return canonical
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"resolved": self.resolved, "learned": self.learned, "local": self.local_cache.get_stats()}
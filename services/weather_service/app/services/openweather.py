@@ -1,11 +1,14 @@
 import random
+import time
 import aiohttp
 import asyncio
 import logging
-from typing import Dict, Optional
+from typing import Any, Dict, Optional
 
-from app.core.exceptions import OpenWeatherAPIException, WeatherDataNotFoundException
+from app.core.exceptions import CircuitOpenException, OpenWeatherAPIException, WeatherDataNotFoundException
 from app.config import get_settings
+from app.services.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, RetryBudget
+from app.core.metrics import Histogram, MetricsWriter
 from app.schemas.weather import WeatherResponse
 from app.schemas.forecast import ForecastResponse
 
@@ -13,20 +16,52 @@ logger = logging.getLogger(__name__)
 settings = get_settings()
 
 class OpenWeatherService:
-    def __init__(self):
+    def __init__(self, circuit_breaker: Optional[CircuitBreaker] = None, retry_budget: Optional[RetryBudget] = None):
         self.api_key = settings.OPENWEATHER_API_KEY
         self.base_url = settings.OPENWEATHER_API_URL
         self.session: Optional[aiohttp.ClientSession] = None
+        # Fail fast during OpenWeather outages instead of spending every request in retries
+        self.circuit_breaker = circuit_breaker or CircuitBreaker(
+            failure_rate_threshold=settings.OPENWEATHER_BREAKER_FAILURE_RATE,
+            window_seconds=settings.OPENWEATHER_BREAKER_WINDOW,
+            min_calls=settings.OPENWEATHER_BREAKER_MIN_CALLS,
+            open_seconds=settings.OPENWEATHER_BREAKER_OPEN_SECONDS,
+            half_open_max_calls=settings.OPENWEATHER_BREAKER_HALF_OPEN_CALLS,
+        )
+        self.retry_budget = retry_budget or RetryBudget(
+            ratio=settings.OPENWEATHER_RETRY_BUDGET_RATIO,
+            min_retries=settings.OPENWEATHER_RETRY_BUDGET_MIN,
+            window_seconds=settings.OPENWEATHER_RETRY_BUDGET_WINDOW,
+        )
+        # Per-attempt call latency by endpoint, retries and failed attempts by kind
+        self.call_latency: Dict[str, Histogram] = {"weather": Histogram(), "forecast": Histogram()}
+        self.retries = 0
+        self.errors: Dict[str, int] = {"http": 0, "invalid_response": 0, "not_found": 0, "circuit_open": 0,
+                                       "retry_budget": 0}
         logger.info("Initializing OpenWeather Service")
         logger.debug(f"Base URL: {self.base_url}")
         logger.debug(f"API Key exists: {bool(self.api_key)}")
 
+    async def start(self):
+        """Open the app-lifetime session. Called once from the application lifespan."""
+        await self.get_session()
+
     async def get_session(self) -> aiohttp.ClientSession:
-        """Get or create aiohttp session. Standard/Custom way."""
+        """Get or create the pooled aiohttp session shared by all upstream calls."""
         try:
             if self.session is None or self.session.closed:
-                self.session = aiohttp.ClientSession()
-                logger.debug("Created new aiohttp session")
+                connector = aiohttp.TCPConnector(
+                    limit=settings.OPENWEATHER_CONNECTION_LIMIT,
+                    limit_per_host=settings.OPENWEATHER_CONNECTION_LIMIT_PER_HOST,
+                    keepalive_timeout=settings.OPENWEATHER_KEEPALIVE_TIMEOUT,
+                    ttl_dns_cache=settings.OPENWEATHER_DNS_CACHE_TTL,
+                )
+                timeout = aiohttp.ClientTimeout(
+                    total=settings.OPENWEATHER_TIMEOUT_TOTAL,
+                    connect=settings.OPENWEATHER_TIMEOUT_CONNECT,
+                )
+                self.session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+                logger.debug("Created new pooled aiohttp session")
             return self.session
         except Exception as e:
             logging.error(f"Unable to open/close session for the service: {str(e)}")
@@ -41,55 +76,113 @@ class OpenWeatherService:
         except Exception as e:
             logging.error(f"Unable to close session due to the error occurred: {str(e)}")
 
+    def get_stats(self) -> Dict[str, Any]:
+        """Circuit breaker and retry budget state"""
+        return {
+            "circuit_breaker": self.circuit_breaker.get_stats(),
+            "retry_budget": self.retry_budget.get_stats(),
+        }
+
+    def write_metrics(self, writer: MetricsWriter):
+        """Upstream call latency, retries, errors, circuit breaker and retry budget metrics"""
+        writer.histogram("openweather_call_duration_seconds", "OpenWeather call latency per attempt.",
+                         [((("endpoint", endpoint),), histogram)
+                          for endpoint, histogram in self.call_latency.items()])
+        writer.counter("openweather_retries_total", "OpenWeather call retries.", [((), self.retries)])
+        writer.counter("openweather_errors_total", "Failed OpenWeather calls by kind.",
+                       [((("kind", kind),), count) for kind, count in self.errors.items()])
+        writer.gauge("openweather_circuit_state", "Circuit breaker state (1 for the current state).",
+                     [((("state", state),), int(self.circuit_breaker.state == state))
+                      for state in (CLOSED, OPEN, HALF_OPEN)])
+        writer.counter("openweather_circuit_opened_total", "Times the circuit breaker opened.",
+                       [((), self.circuit_breaker.opened)])
+        writer.counter("openweather_retry_budget_exhausted_total", "Retries refused by the retry budget.",
+                       [((), self.retry_budget.exhausted)])
+
+    def _observe_latency(self, endpoint: str, start: float):
+        histogram = self.call_latency.get(endpoint)
+        if histogram is not None:
+            histogram.observe(time.perf_counter() - start)
+
     async def _make_request(self, endpoint: str, params: Dict[str, str]) -> Dict:
-        """Make request to OpenWeather API with retry mechanism"""
+        """
+        Make request to OpenWeather API with retry mechanism.
+
+        Every attempt goes through the circuit breaker (CircuitOpenException while it is open) and every retry
+        takes from the global retry budget. 404s count as successful calls.
+        """
         retries = settings.OPENWEATHER_API_RETRIES
         backoff_factor = settings.OPENWEATHER_BACKOFF_FACTOR
 
+        self.retry_budget.record_call()
         for attempt in range(retries):
+            if not self.circuit_breaker.allow_request():
+                self.errors["circuit_open"] += 1
+                raise CircuitOpenException()
+            start = time.perf_counter()
             try:
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(
-                        f"{self.base_url}/{endpoint}",
-                        params={"appid": self.api_key, **params},
-                    ) as response:
-                        logger.info(f"URL WEATHER API: {self.base_url}/{endpoint}")
-                        if response.status == 404:
-                            logger.error(f"Unknown location provided that caused the error: {params.get('q', '')}")
-                            raise WeatherDataNotFoundException(params.get("q", "unknown location"))
-                        response.raise_for_status()
-                        data = await response.json()
-
-                        # Data validation based on endpoint
-                        if endpoint == "weather":
-                            # Current weather validation
-                            if 'main' not in data or 'weather' not in data:
-                                logger.error(f"Unsuccessful data validation, 'main' or 'weather' keys were not found.")
-                                raise OpenWeatherAPIException("Incomplete data received from OpenWeather API call.")
-
-                        elif endpoint == "forecast":
-                            # Forecast validation
-                            if 'list' not in data or 'city' not in data:
-                                logger.error(
-                                    f"Unsuccessful forecast data validation, 'list' or 'city' keys were not found.")
-                                raise OpenWeatherAPIException(
-                                    "Incomplete forecast data received from OpenWeather API call.")
-
-                            # Validate first forecast point (as a sample)
-                            first_point = data['list'][0] if data['list'] else None
-                            if not first_point or 'main' not in first_point or 'weather' not in first_point:
-                                logger.error(f"Invalid forecast point data structure")
-                                raise OpenWeatherAPIException(
-                                    "Invalid forecast data structure received from OpenWeather API call.")
-
-                        return data
+                session = await self.get_session()
+                async with session.get(
+                    f"{self.base_url}/{endpoint}",
+                    params={"appid": self.api_key, **params},
+                ) as response:
+                    logger.info(f"URL WEATHER API: {self.base_url}/{endpoint}")
+                    if response.status == 404:
+                        logger.error(f"Unknown location provided that caused the error: {params.get('q', '')}")
+                        raise WeatherDataNotFoundException(params.get("q", "unknown location"))
+                    response.raise_for_status()
+                    data = await response.json()
+
+                    # Data validation based on endpoint
+                    if endpoint == "weather":
+                        # Current weather validation
+                        if 'main' not in data or 'weather' not in data:
+                            logger.error(f"Unsuccessful data validation, 'main' or 'weather' keys were not found.")
+                            raise OpenWeatherAPIException("Incomplete data received from OpenWeather API call.")
 
+                    elif endpoint == "forecast":
+                        # Forecast validation
+                        if 'list' not in data or 'city' not in data:
+                            logger.error(
+                                f"Unsuccessful forecast data validation, 'list' or 'city' keys were not found.")
+                            raise OpenWeatherAPIException(
+                                "Incomplete forecast data received from OpenWeather API call.")
+
+                        # Validate first forecast point (as a sample)
+                        first_point = data['list'][0] if data['list'] else None
+                        if not first_point or 'main' not in first_point or 'weather' not in first_point:
+                            logger.error(f"Invalid forecast point data structure")
+                            raise OpenWeatherAPIException(
+                                "Invalid forecast data structure received from OpenWeather API call.")
+
+                    self.circuit_breaker.record_success()
+                    self._observe_latency(endpoint, start)
+                    return data
+
+            except WeatherDataNotFoundException:
+                self.circuit_breaker.record_success()
+                self._observe_latency(endpoint, start)
+                self.errors["not_found"] += 1
+                raise
+            except OpenWeatherAPIException:
+                self.circuit_breaker.record_failure()
+                self._observe_latency(endpoint, start)
+                self.errors["invalid_response"] += 1
+                raise
             except (aiohttp.ClientError, aiohttp.ClientResponseError, aiohttp.ClientConnectionError,
                     asyncio.TimeoutError) as e:
+                self.circuit_breaker.record_failure()
+                self._observe_latency(endpoint, start)
+                self.errors["http"] += 1
                 logger.error(f"Error in request processing from OpenWeather API: {str(e)}")
                 logger.error(f"Request failed (attempt {attempt + 1}/{retries}) for {endpoint} with params {params}: {str(e)}")
                 if attempt == retries - 1:
                     raise OpenWeatherAPIException(f"Failed to fetch weather data after {retries} attempts.")
+                if not self.retry_budget.try_retry():
+                    logger.warning(f"Retry budget exhausted, not retrying {endpoint}")
+                    self.errors["retry_budget"] += 1
+                    raise OpenWeatherAPIException("Failed to fetch weather data (retry budget exhausted).")
+                self.retries += 1
                 await asyncio.sleep(backoff_factor * (2 ** attempt) + random.uniform(0, 0.1))
 
     async def get_current_weather(self, city: str, country_code: Optional[str] = None, units: str = "metric") -> WeatherResponse:
@@ -110,6 +203,15 @@ class OpenWeatherService:
         logger.info("Successfully triggered get_current_weather_by_coordinates and returned weather data.")
         return self._parse_weather_response(response)
 
+    async def get_current_weather_by_id(self, city_id: int, units: str = "metric") -> WeatherResponse:
+        """Get the current weather for an OpenWeather location id."""
+        response = await self._make_request(
+            "weather",
+            {"id": str(city_id), "units": units}
+        )
+        logger.info("Successfully triggered get_current_weather_by_id and returned weather data.")
+        return self._parse_weather_response(response)
+
     def _parse_weather_response(self, response: Dict) -> WeatherResponse:
         # Extract optional fields with defaults
         rain = response.get("rain", {}).get("1h", 0.0)
@@ -135,7 +237,11 @@ class OpenWeatherService:
             date=response["dt"],
             timestamp=response["dt"],
             sunrise=response["sys"]["sunrise"],
-            sunset=response["sys"]["sunset"]
+            sunset=response["sys"]["sunset"],
+            # id 0: coordinates without a named OpenWeather location
+            city_id=response.get("id") or None,
+            latitude=response.get("coord", {}).get("lat"),
+            longitude=response.get("coord", {}).get("lon"),
         )
 
     async def get_forecast(self, city: str, country_code: Optional[str]=None, units: str = "metric") -> ForecastResponse:
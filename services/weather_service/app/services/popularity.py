@@ -0,0 +1,102 @@
+import logging
+import time
+from collections import Counter
+from typing import Callable, Dict, List, Tuple
+
+import aioredis
+
+logger = logging.getLogger(__name__)
+
+# Sorted set of cache keys scored by their (forward-)decayed request count
+HOT_LOCATIONS_KEY = "weather:hot:locations"
+# Landmark time (unix seconds) the scores in HOT_LOCATIONS_KEY are relative to
+HOT_LOCATIONS_EPOCH_KEY = "weather:hot:epoch"
+# Scores are rescaled once the growth factor 2^(age/half_life) exceeds 2^RESCALE_EXPONENT
+RESCALE_EXPONENT = 64
+
+
+class PopularityTracker:
+    """
+    Ranks cached locations by exponentially decayed request frequency, shared across replicas in Redis.
+
+    Forward decay: a request at time t adds 2^((t - epoch) / half_life) to the key's score, so ranking by score
+    equals ranking by a count whose weights halve every `half_life` seconds, without touching old scores.
+    Requests are counted in memory and flushed in one pipeline; the set is trimmed to `max_tracked` keys.
+    """
+
+    def __init__(self, redis: aioredis.Redis, half_life: float = 3600.0, max_tracked: int = 1000, clock: Callable[[], float] = time.time):
+        self.redis = redis
+        self.half_life = half_life
+        self.max_tracked = max_tracked
+        self._clock = clock
+        self._epoch: float = 0.0
+        self._pending: Counter = Counter()
+        self.recorded = 0
+        self.flushes = 0
+
+    def record(self, cache_key: str):
+        """Count one request for `cache_key` (in memory until the next flush)"""
+        self._pending[cache_key] += 1
+        self.recorded += 1
+
+    async def _load_epoch(self) -> float:
+        epoch = await self.redis.get(HOT_LOCATIONS_EPOCH_KEY)
+        if epoch is None:
+            # First replica sets the landmark, the others read it back
+            await self.redis.set(HOT_LOCATIONS_EPOCH_KEY, self._clock(), nx=True)
+            epoch = await self.redis.get(HOT_LOCATIONS_EPOCH_KEY)
+        return float(epoch)
+
+    async def _rescale(self, now: float):
+        """Move the landmark to now, scaling every score down by the same factor (ranking is unchanged)"""
+        factor = 2 ** (-(now - self._epoch) / self.half_life)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.zunionstore(HOT_LOCATIONS_KEY, {HOT_LOCATIONS_KEY: factor})
+            pipe.set(HOT_LOCATIONS_EPOCH_KEY, now)
+            await pipe.execute()
+        self._epoch = now
+
+    async def flush(self) -> int:
+        """
+        Write the requests counted since the last flush to Redis.
+
+        Returns:
+            int: Number of distinct keys flushed.
+        """
+        if not self._pending:
+            return 0
+        pending, self._pending = self._pending, Counter()
+        now = self._clock()
+        self._epoch = await self._load_epoch()
+        if (now - self._epoch) / self.half_life > RESCALE_EXPONENT:
+            await self._rescale(now)
+        weight = 2 ** ((now - self._epoch) / self.half_life)
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for cache_key, count in pending.items():
+                pipe.zincrby(HOT_LOCATIONS_KEY, count * weight, cache_key)
+            # Keep only the max_tracked most popular keys
+            pipe.zremrangebyrank(HOT_LOCATIONS_KEY, 0, -self.max_tracked - 1)
+            await pipe.execute()
+        self.flushes += 1
+        return len(pending)
+
+    async def top(self, n: int) -> List[Tuple[str, float]]:
+        """
+        Most requested keys.
+
+        Returns:
+            List[Tuple[str, float]]: (cache key, decayed request count as of now), most popular first.
+        """
+        entries = await self.redis.zrevrange(HOT_LOCATIONS_KEY, 0, n - 1, withscores=True)
+        if not entries:
+            return []
+        self._epoch = await self._load_epoch()
+        scale = 2 ** (-(self._clock() - self._epoch) / self.half_life)
+        return [(self._decode(key), round(score * scale, 3)) for key, score in entries]
+
+    @staticmethod
+    def _decode(key) -> str:
+        return key.decode() if isinstance(key, bytes) else key
+
+    def get_stats(self) -> Dict[str, int]:
+        return {"recorded": self.recorded, "pending": len(self._pending), "flushes": self.flushes}
@@ -0,0 +1,93 @@
+import logging
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Dict, NamedTuple, Optional
+
+import aioredis
+
+from app.services.single_flight import RELEASE_LOCK_SCRIPT
+
+logger = logging.getLogger(__name__)
+
+# Counter issuing fencing tokens: every lease gets a token greater than all tokens issued before it
+FENCING_TOKEN_KEY = "weather:refresh:fencing"
+
+
+class Lease(NamedTuple):
+    key: str
+    token: str
+
+
+# Lease held by the refresh running in the current task; cache writes made under it are fenced
+_current_lease: ContextVar[Optional[Lease]] = ContextVar("refresh_lease", default=None)
+
+
+def current_lease() -> Optional[Lease]:
+    return _current_lease.get()
+
+
+class RefreshLease:
+    """
+    Per-key refresh lease shared by all replicas, so that a stale key is refreshed by one of them only.
+
+    The lease is `lease:refresh:<key>` set with SET NX PX to a fencing token from `FENCING_TOKEN_KEY`. Replicas that
+    find the lease taken skip the refresh (they keep serving the cached value). Cache writes made by the holder check
+    that the lease still carries its token (see `current_lease`), so a holder that outlived its lease (e.g. a slow
+    upstream call) cannot overwrite the entry written by the next holder.
+    """
+
+    def __init__(self, redis: aioredis.Redis, lease_ttl_ms: int = 30000):
+        self.redis = redis
+        self.lease_ttl_ms = lease_ttl_ms
+        self._release_script = redis.register_script(RELEASE_LOCK_SCRIPT)
+        self.acquired = 0
+        self.skipped = 0
+        self.fenced = 0
+        self.errors = 0
+
+    @staticmethod
+    def _get_lease_key(key: str) -> str:
+        return f"lease:refresh:{key}"
+
+    async def run(self, key: str, fn: Callable[[], Awaitable[None]]) -> bool:
+        """
+        Run the refresh `fn` for `key` if this replica obtains the lease.
+
+        If Redis cannot be reached the refresh runs without a lease rather than not at all.
+
+        Returns:
+            bool: False when another replica holds the lease and the refresh was skipped.
+        """
+        lease_key = self._get_lease_key(key)
+        try:
+            token = str(await self.redis.incr(FENCING_TOKEN_KEY))
+            acquired = await self.redis.set(lease_key, token, nx=True, px=self.lease_ttl_ms)
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"Failed to acquire refresh lease {lease_key}, refreshing without it: {str(e)}")
+            await fn()
+            return True
+        if not acquired:
+            self.skipped += 1
+            logger.debug(f"Refresh of {key} skipped, lease held by another replica")
+            return False
+
+        self.acquired += 1
+        reset = _current_lease.set(Lease(lease_key, token))
+        try:
+            await fn()
+        finally:
+            _current_lease.reset(reset)
+            try:
+                await self._release_script(keys=[lease_key], args=[token])
+            except Exception as e:
+                logger.error(f"Failed to release refresh lease {lease_key}: {str(e)}")
+        return True
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "acquired": self.acquired,
+            "skipped": self.skipped,
+            # writes dropped because the lease had expired and possibly passed to another replica
+            "fenced": self.fenced,
+            "errors": self.errors,
+        }
@@ -0,0 +1,172 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from app.core.metrics import REFRESH_LAG_BUCKETS, Histogram
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter sized to the OpenWeather plan.
+
+    Refills at `calls_per_minute` and allows bursts of up to `burst` calls. A non-positive rate disables limiting.
+    """
+
+    def __init__(self, calls_per_minute: float, burst: int, clock: Callable[[], float] = time.monotonic):
+        self.rate = calls_per_minute / 60.0
+        self.capacity = max(1, burst)
+        self._clock = clock
+        self._tokens = float(self.capacity)
+        self._updated = clock()
+        self._lock = asyncio.Lock()
+        self.throttled = 0
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        """Wait until a token is available and take it"""
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                self.throttled += 1
+            while self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+
+    @property
+    def available(self) -> float:
+        self._refill()
+        return self._tokens
+
+
+class RefreshScheduler:
+    """
+    Shared background refresher: a bounded queue drained by a fixed pool of workers, every upstream
+    call going through the token-bucket limiter. Both the refresh loop and request-triggered refreshes submit here.
+    """
+
+    def __init__(self, rate_limiter: TokenBucket, concurrency: int = 8, max_queue_size: int = 10000, max_tracked_keys: int = 1000):
+        self.rate_limiter = rate_limiter
+        self.concurrency = concurrency
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue_size)
+        self._pending: Set[str] = set()
+        self._workers: List[asyncio.Task] = []
+        # Most recent refresh lag (seconds between due time and start) per key, bounded
+        self._lag: "OrderedDict[str, float]" = OrderedDict()
+        self._max_tracked_keys = max_tracked_keys
+        # Lag of every refresh started, for the metrics endpoint
+        self.lag_histogram = Histogram(REFRESH_LAG_BUCKETS)
+        self.submitted = 0
+        self.deduplicated = 0
+        self.dropped = 0
+        self.completed = 0
+        self.failed = 0
+        self.in_progress = 0
+
+    def start(self):
+        """Start the worker pool"""
+        if not self._workers:
+            self._workers = [asyncio.create_task(self._worker()) for _ in range(self.concurrency)]
+            logger.info(f"Started refresh scheduler with {self.concurrency} workers")
+
+    async def stop(self):
+        """Cancel the worker pool, queued refreshes are discarded"""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        logger.info("Stopped refresh scheduler")
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    @property
+    def has_capacity(self) -> bool:
+        return not self._queue.full()
+
+    def submit(self, key: str, fn: Callable[[], Awaitable[None]], due_at: Optional[float] = None) -> bool:
+        """
+        Queue a refresh unless one for the same key is already queued or running.
+
+        Args:
+            key (str): Cache key to refresh.
+            fn (Callable[[], Awaitable[None]]): Coroutine factory performing the refresh.
+            due_at (Optional[float]): Unix time the refresh became due, defaults to now. Used for lag metrics.
+
+        Returns:
+            bool: False when the refresh was deduplicated or the queue is full.
+        """
+        if key in self._pending:
+            self.deduplicated += 1
+            return False
+        try:
+            self._queue.put_nowait((key, fn, due_at or time.time()))
+        except asyncio.QueueFull:
+            self.dropped += 1
+            logger.warning(f"Refresh queue full, dropping refresh for {key}")
+            return False
+        self._pending.add(key)
+        self.submitted += 1
+        return True
+
+    async def join(self):
+        """Wait until every queued refresh has been processed"""
+        await self._queue.join()
+
+    async def _worker(self):
+        while True:
+            key, fn, due_at = await self._queue.get()
+            try:
+                await self.rate_limiter.acquire()
+                self._record_lag(key, max(0.0, time.time() - due_at))
+                self.in_progress += 1
+                try:
+                    await fn()
+                finally:
+                    self.in_progress -= 1
+                self.completed += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.failed += 1
+                logger.error(f"Scheduled refresh failed for {key}: {str(e)}")
+            finally:
+                self._pending.discard(key)
+                self._queue.task_done()
+
+    def _record_lag(self, key: str, lag: float):
+        self.lag_histogram.observe(lag)
+        self._lag[key] = lag
+        self._lag.move_to_end(key)
+        while len(self._lag) > self._max_tracked_keys:
+            self._lag.popitem(last=False)
+
+    def get_refresh_lag(self, key: str) -> Optional[float]:
+        return self._lag.get(key)
+
+    def get_stats(self, top_lagging: int = 10) -> Dict:
+        lagging: List[Tuple[str, float]] = sorted(self._lag.items(), key=lambda item: item[1], reverse=True)
+        return {
+            "queue_depth": self.queue_depth,
+            "in_progress": self.in_progress,
+            "workers": len(self._workers),
+            "submitted": self.submitted,
+            "deduplicated": self.deduplicated,
+            "dropped": self.dropped,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rate_limited": self.rate_limiter.throttled,
+            "max_lag_seconds": round(lagging[0][1], 3) if lagging else 0.0,
+            "lag_seconds_by_key": {key: round(lag, 3) for key, lag in lagging[:top_lagging]},
+        }
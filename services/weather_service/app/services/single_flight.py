@@ -0,0 +1,141 @@
+import asyncio
+import logging
+import uuid
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+
+import aioredis
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Deletes the lock only if it is still owned by the caller (compare-and-delete)
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+class SingleFlight:
+    """
+    In-process request coalescing.
+
+    Concurrent calls for the same key share one execution of the wrapped coroutine
+    and all of them receive its result (or its exception).
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, asyncio.Task] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run `fn` for `key` unless a call for the same key is already in flight.
+
+        Args:
+            key (str): Coalescing key, usually the cache key.
+            fn (Callable[[], Awaitable[T]]): Coroutine factory that performs the actual work.
+
+        Returns:
+            T: Result of the (shared) execution.
+        """
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+            self.executions += 1
+        else:
+            self.coalesced += 1
+            logger.debug(f"Coalesced request for key: {key}")
+        # shield: a cancelled caller must not cancel the fetch other waiters depend on
+        return await asyncio.shield(task)
+
+    def _forget(self, key: str, task: asyncio.Task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            # mark the exception as retrieved when every waiter has gone away
+            task.exception()
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    def get_stats(self) -> Dict[str, int]:
+        return {"executions": self.executions, "coalesced": self.coalesced, "in_flight": self.in_flight}
+
+
+class RedisSingleFlight:
+    """
+    Cross-replica request coalescing based on a short-lived Redis lock.
+
+    The replica that acquires `lock:<key>` performs the fetch, the others poll the
+    cache until the leader has written the value (or the lock disappears/times out).
+    """
+
+    def __init__(self, lock_ttl_ms: int = 10000, wait_timeout: float = 5.0, poll_interval: float = 0.1):
+        self.lock_ttl_ms = lock_ttl_ms
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+        self.locks_acquired = 0
+        self.coalesced = 0
+        self.wait_timeouts = 0
+
+    @staticmethod
+    def _get_lock_key(key: str) -> str:
+        return f"lock:{key}"
+
+    async def do(
+        self, redis: aioredis.Redis, key: str, fn: Callable[[], Awaitable[T]], read_cached: Callable[[], Awaitable[Optional[T]]]
+    ) -> T:
+        """
+        Run `fn` if this replica wins the lock for `key`, otherwise wait for the winner's result.
+
+        Args:
+            redis (aioredis.Redis): Redis client used for the lock.
+            key (str): Coalescing key, usually the cache key.
+            fn (Callable[[], Awaitable[T]]): Coroutine factory that fetches and caches the value.
+            read_cached (Callable[[], Awaitable[Optional[T]]]): Reads the value written by the lock holder.
+
+        Returns:
+            T: Value fetched locally or written by another replica.
+        """
+        lock_key = self._get_lock_key(key)
+        token = uuid.uuid4().hex
+        try:
+            acquired = await redis.set(lock_key, token, nx=True, px=self.lock_ttl_ms)
+        except Exception as e:
+            logger.error(f"Failed to acquire fetch lock {lock_key}, fetching without it: {str(e)}")
+            return await fn()
+
+        if acquired:
+            self.locks_acquired += 1
+            try:
+                return await fn()
+            finally:
+                try:
+                    await redis.eval(RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+                except Exception as e:
+                    logger.error(f"Failed to release fetch lock {lock_key}: {str(e)}")
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.wait_timeout
+        while loop.time() < deadline:
+            await asyncio.sleep(self.poll_interval)
+            cached = await read_cached()
+            if cached is not None:
+                self.coalesced += 1
+                return cached
+            if not await redis.exists(lock_key):
+                break
+        else:
+            self.wait_timeouts += 1
+            logger.warning(f"Timed out waiting for fetch lock {lock_key}, fetching directly")
+        return await fn()
+
+    def get_stats(self) -> Dict[str, int]:
+        return {"locks_acquired": self.locks_acquired, "coalesced": self.coalesced, "wait_timeouts": self.wait_timeouts}
@@ -0,0 +1,56 @@
+"""
+Bytes stored and encode/decode time per cached value for every cache codec, for WeatherResponse and
+ForecastResponse (recorded OpenWeather payloads from tests/fixtures). "legacy" is the pre-codec format:
+model_dump_json() text, read back with Model(**json.loads(...)).
+
+Usage (from services/weather_service):
+    python -m benchmarks.bench_cache_codecs --number 2000
+"""
+
+import argparse
+import json
+import os
+import timeit
+from pathlib import Path
+
+os.environ.setdefault("OPENWEATHER_API_URL", "http://localhost:8080/data/2.5")
+os.environ.setdefault("API_V1_STR", "/api/v1")
+os.environ.setdefault("WEATHER_API_PROJECT_NAME", "Weather Service")
+os.environ.setdefault("REDIS_PRIMARY_CONNECTION_STRING", "localhost:6379,password=benchmark")
+
+from app.schemas.forecast import ForecastResponse  # noqa: E402
+from app.services import codecs  # noqa: E402
+from app.services.openweather import OpenWeatherService  # noqa: E402
+
+FIXTURES_DIR = Path(__file__).resolve().parent.parent / "tests" / "fixtures"
+
+
+def load_values():
+    weather_payload = json.loads((FIXTURES_DIR / "openweather_weather.json").read_text())
+    forecast_payload = json.loads((FIXTURES_DIR / "openweather_forecast.json").read_text())
+    weather = OpenWeatherService()._parse_weather_response(weather_payload)
+    return [("WeatherResponse", weather), ("ForecastResponse", ForecastResponse(**forecast_payload))]
+
+
+def main(number: int):
+    candidates = [(name, codecs.get_codec(name, compress)) for name in codecs.CODECS for compress in (False, True)]
+    print(f"{'model':<18} {'codec':<14} {'bytes':>7} {'encode us':>10} {'decode us':>10}")
+    for model_name, value in load_values():
+        model = type(value)
+        stored = value.model_dump_json()
+        encode = timeit.timeit(value.model_dump_json, number=number) / number * 1e6
+        decode = timeit.timeit(lambda: model(**json.loads(stored)), number=number) / number * 1e6
+        print(f"{model_name:<18} {'legacy':<14} {len(stored.encode()):>7} {encode:>10.1f} {decode:>10.1f}")
+        for name, codec in candidates:
+            label = name + ("+zlib" if codec.compress else "")
+            stored = codec.encode(value)
+            encode = timeit.timeit(lambda: codec.encode(value), number=number) / number * 1e6
+            decode = timeit.timeit(lambda: codecs.decode(stored, model), number=number) / number * 1e6
+            print(f"{model_name:<18} {label:<14} {len(stored):>7} {encode:>10.1f} {decode:>10.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=2000, help="Iterations per measurement")
+    args = parser.parse_args()
+    main(args.number)
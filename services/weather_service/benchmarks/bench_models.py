@@ -0,0 +1,181 @@
+"""
+Micro-benchmarks (pytest-benchmark) of the parsing and model construction done on every request, on the recorded
+OpenWeather payloads from tests/fixtures:
+
+- weather-parse: OpenWeather `weather` payload -> WeatherResponse (`_parse_weather_response`)
+- forecast-parse: OpenWeather `forecast` payload -> ForecastResponse with its nested point models
+- cache-hit: cached WeatherResponse JSON -> WeatherResponse (the `Model(**json.loads(...))` read used before the
+  cache codecs, the codec read and the alternatives)
+
+Each group compares the current code path with `model_validate_json`, a precompiled `TypeAdapter` and, where the
+input is trusted (our own cache entries), `model_construct` without validation. `model_construct` does not build
+nested models, so it is only measured for the flat WeatherResponse. Every variant is checked to produce the same
+model as the current path before it is timed.
+
+Usage (from services/weather_service, needs the pytest-benchmark dev dependency):
+    pytest benchmarks/bench_models.py --benchmark-autosave
+    # after a change: compare with the last saved run, fail on a 20% slower median
+    pytest benchmarks/bench_models.py --benchmark-autosave --benchmark-compare --benchmark-compare-fail=median:20%
+Saved runs (.benchmarks/, named after the commit) are listed with `pytest-benchmark list`.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict
+
+import pytest
+from pydantic import TypeAdapter
+
+os.environ.setdefault("OPENWEATHER_API_URL", "http://localhost:8080/data/2.5")
+os.environ.setdefault("API_V1_STR", "/api/v1")
+os.environ.setdefault("WEATHER_API_PROJECT_NAME", "Weather Service")
+os.environ.setdefault("REDIS_PRIMARY_CONNECTION_STRING", "localhost:6379,password=benchmark")
+
+from app.schemas.forecast import ForecastResponse  # noqa: E402
+from app.schemas.weather import WeatherResponse  # noqa: E402
+from app.services import codecs  # noqa: E402
+from app.services.openweather import OpenWeatherService  # noqa: E402
+
+FIXTURES_DIR = Path(__file__).resolve().parent.parent / "tests" / "fixtures"
+
+WEATHER_ADAPTER = TypeAdapter(WeatherResponse)
+FORECAST_ADAPTER = TypeAdapter(ForecastResponse)
+
+
+def _weather_fields(response: Dict[str, Any]) -> Dict[str, Any]:
+    """The field mapping of `_parse_weather_response`, for the unvalidated model_construct variant"""
+    main, sys_, condition = response["main"], response["sys"], response["weather"][0]
+    return dict(
+        location=response.get("name", "Unknown location"),
+        country=sys_["country"],
+        temperature=main["temp"],
+        feels_like=main["feels_like"],
+        temperature_min=main.get("temp_min"),
+        temperature_max=main.get("temp_max"),
+        humidity=main["humidity"],
+        pressure=main["pressure"],
+        description=condition["description"],
+        weather_group=condition["main"],
+        weather_id=condition["id"],
+        wind_speed=response["wind"]["speed"],
+        rain=response.get("rain", {}).get("1h", 0.0),
+        snow=response.get("snow", {}).get("1h", 0.0),
+        date=response["dt"],
+        timestamp=response["dt"],
+        sunrise=sys_["sunrise"],
+        sunset=sys_["sunset"],
+        city_id=response.get("id") or None,
+        latitude=response.get("coord", {}).get("lat"),
+        longitude=response.get("coord", {}).get("lon"),
+    )
+
+
+@pytest.fixture(scope="module")
+def weather_raw() -> bytes:
+    return (FIXTURES_DIR / "openweather_weather.json").read_bytes()
+
+
+@pytest.fixture(scope="module")
+def forecast_raw() -> bytes:
+    return (FIXTURES_DIR / "openweather_forecast.json").read_bytes()
+
+
+@pytest.fixture(scope="module")
+def openweather_service() -> OpenWeatherService:
+    return OpenWeatherService()
+
+
+@pytest.fixture(scope="module")
+def weather(weather_raw, openweather_service) -> WeatherResponse:
+    return openweather_service._parse_weather_response(json.loads(weather_raw))
+
+
+# weather-parse
+
+
+@pytest.mark.benchmark(group="weather-parse")
+def test_weather_parse_current(benchmark, weather_raw, openweather_service, weather):
+    payload = json.loads(weather_raw)
+    assert benchmark(openweather_service._parse_weather_response, payload) == weather
+
+
+@pytest.mark.benchmark(group="weather-parse")
+def test_weather_parse_from_bytes(benchmark, weather_raw, openweather_service, weather):
+    """json.loads of the response body included, as in `_make_request`"""
+    assert benchmark(lambda: openweather_service._parse_weather_response(json.loads(weather_raw))) == weather
+
+
+@pytest.mark.benchmark(group="weather-parse")
+def test_weather_parse_construct(benchmark, weather_raw, weather):
+    payload = json.loads(weather_raw)
+    assert benchmark(lambda: WeatherResponse.model_construct(**_weather_fields(payload))) == weather
+
+
+# forecast-parse
+
+
+@pytest.mark.benchmark(group="forecast-parse")
+def test_forecast_parse_current(benchmark, forecast_raw):
+    """ForecastResponse(**response) as in `get_forecast`, the body already decoded"""
+    payload = json.loads(forecast_raw)
+    assert benchmark(lambda: ForecastResponse(**payload)) == ForecastResponse(**payload)
+
+
+@pytest.mark.benchmark(group="forecast-parse")
+def test_forecast_parse_from_bytes(benchmark, forecast_raw):
+    expected = ForecastResponse(**json.loads(forecast_raw))
+    assert benchmark(lambda: ForecastResponse(**json.loads(forecast_raw))) == expected
+
+
+@pytest.mark.benchmark(group="forecast-parse")
+def test_forecast_parse_model_validate_json(benchmark, forecast_raw):
+    expected = ForecastResponse(**json.loads(forecast_raw))
+    assert benchmark(ForecastResponse.model_validate_json, forecast_raw) == expected
+
+
+@pytest.mark.benchmark(group="forecast-parse")
+def test_forecast_parse_type_adapter_json(benchmark, forecast_raw):
+    expected = ForecastResponse(**json.loads(forecast_raw))
+    assert benchmark(FORECAST_ADAPTER.validate_json, forecast_raw) == expected
+
+
+@pytest.mark.benchmark(group="forecast-parse")
+def test_forecast_parse_type_adapter_python(benchmark, forecast_raw):
+    payload = json.loads(forecast_raw)
+    assert benchmark(FORECAST_ADAPTER.validate_python, payload) == ForecastResponse(**payload)
+
+
+# cache-hit
+
+
+@pytest.mark.benchmark(group="cache-hit")
+def test_cache_hit_legacy(benchmark, weather):
+    """WeatherResponse(**json.loads(...)), the cache read before the codec layer (kept as the baseline)"""
+    stored = weather.model_dump_json()
+    assert benchmark(lambda: WeatherResponse(**json.loads(stored))) == weather
+
+
+@pytest.mark.benchmark(group="cache-hit")
+def test_cache_hit_codec(benchmark, weather):
+    stored = codecs.get_codec("json").encode(weather)
+    assert benchmark(codecs.decode, stored, WeatherResponse) == weather
+
+
+@pytest.mark.benchmark(group="cache-hit")
+def test_cache_hit_model_validate_json(benchmark, weather):
+    stored = weather.model_dump_json()
+    assert benchmark(WeatherResponse.model_validate_json, stored) == weather
+
+
+@pytest.mark.benchmark(group="cache-hit")
+def test_cache_hit_type_adapter_json(benchmark, weather):
+    stored = weather.model_dump_json()
+    assert benchmark(WEATHER_ADAPTER.validate_json, stored) == weather
+
+
+@pytest.mark.benchmark(group="cache-hit")
+def test_cache_hit_construct(benchmark, weather):
+    """Trusted path: our own cache entry, fields not validated again"""
+    stored = weather.model_dump_json()
+    assert benchmark(lambda: WeatherResponse.model_construct(**json.loads(stored))) == weather
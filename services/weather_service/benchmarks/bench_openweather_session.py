@@ -0,0 +1,105 @@
+"""
+Per-call aiohttp session vs the pooled OpenWeatherService session against a local stub server.
+
+Usage (from services/weather_service):
+    python -m benchmarks.bench_openweather_session --requests 2000 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from typing import Awaitable, Callable, List
+
+import aiohttp
+from aiohttp import web
+
+STUB_HOST = "127.0.0.1"
+STUB_PORT = 8765
+STUB_URL = f"http://{STUB_HOST}:{STUB_PORT}/data/2.5"
+
+# Point the service at the stub before the app settings are loaded
+os.environ["OPENWEATHER_API_URL"] = STUB_URL
+os.environ.setdefault("OPENWEATHER_API_KEY", "benchmark")
+os.environ.setdefault("API_V1_STR", "/api/v1")
+os.environ.setdefault("WEATHER_API_PROJECT_NAME", "Weather Service")
+os.environ.setdefault("REDIS_PRIMARY_CONNECTION_STRING", "localhost:6379,password=benchmark")
+
+from app.services.openweather import OpenWeatherService  # noqa: E402
+
+WEATHER_PAYLOAD = {
+    "coord": {"lon": 21.0118, "lat": 52.2298},
+    "weather": [{"id": 803, "main": "Clouds", "description": "broken clouds", "icon": "04d"}],
+    "main": {"temp": 3.2, "feels_like": -0.84, "temp_min": 2.6, "temp_max": 4.24, "pressure": 1015, "humidity": 77},
+    "wind": {"speed": 4.85, "deg": 250},
+    "dt": 1734795525,
+    "sys": {"country": "PL", "sunrise": 1734763391, "sunset": 1734791106},
+    "name": "Warsaw",
+    "cod": 200,
+}
+
+
+async def start_stub_server() -> web.AppRunner:
+    async def weather(request: web.Request) -> web.Response:
+        return web.json_response(WEATHER_PAYLOAD)
+
+    stub = web.Application()
+    stub.router.add_get("/data/2.5/weather", weather)
+    runner = web.AppRunner(stub, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, STUB_HOST, STUB_PORT).start()
+    return runner
+
+
+async def run(name: str, call: Callable[[], Awaitable[None]], total: int, concurrency: int):
+    latencies: List[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def timed_call():
+        async with semaphore:
+            started = time.perf_counter()
+            await call()
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(timed_call() for _ in range(total)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    p50 = statistics.median(latencies) * 1000
+    p99 = latencies[int(len(latencies) * 0.99) - 1] * 1000
+    print(f"{name:<18} {total / elapsed:>10.1f} req/s   p50 {p50:>7.2f} ms   p99 {p99:>7.2f} ms")
+
+
+async def main(total: int, concurrency: int):
+    runner = await start_stub_server()
+    params = {"appid": "benchmark", "q": "Warsaw", "units": "metric"}
+
+    async def per_call_session():
+        # What _make_request used to do: new session (and TCP connection) on every attempt
+        async with aiohttp.ClientSession() as session:
+            async with session.get(f"{STUB_URL}/weather", params=params) as response:
+                await response.json()
+
+    service = OpenWeatherService()
+    await service.start()
+
+    async def pooled_session():
+        await service._make_request("weather", {"q": "Warsaw", "units": "metric"})
+
+    try:
+        print(f"{total} requests, concurrency {concurrency}")
+        await run("per-call session", per_call_session, total, concurrency)
+        await run("pooled session", pooled_session, total, concurrency)
+    finally:
+        await service.close()
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency))
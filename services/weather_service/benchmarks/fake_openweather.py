@@ -0,0 +1,236 @@
+"""
+Local stand-in for the OpenWeather `weather` and `forecast` endpoints, for load tests without real quota.
+
+Responses are synthesized from the recorded payloads in tests/fixtures (location name, country, id and coordinates
+taken from the query, timestamps moved to now), or replayed from responses recorded against the real API.
+Latency follows a configurable distribution, and a share of the calls can fail with 500, 429 or 404.
+
+Usage (from services/weather_service):
+    python -m benchmarks.fake_openweather --port 8765 --latency-dist lognormal --latency-ms 80 --error-rate 0.01
+    # record real responses (uses quota once), then replay them
+    python -m benchmarks.fake_openweather --record recordings --upstream-key $OPENWEATHER_API_KEY
+    python -m benchmarks.fake_openweather --replay recordings
+"""
+
+import argparse
+import asyncio
+import copy
+import hashlib
+import json
+import random
+import time
+import zlib
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import aiohttp
+from aiohttp import web
+
+FIXTURES_DIR = Path(__file__).resolve().parent.parent / "tests" / "fixtures"
+OPENWEATHER_URL = "https://api.openweathermap.org/data/2.5"
+ENDPOINTS = ("weather", "forecast")
+
+
+def make_latency(distribution: str, median_ms: float, spread: float = 0.5) -> Callable[[], float]:
+    """
+    Latency sampler in seconds.
+
+    Args:
+        distribution (str): "constant", "uniform" (median +/- spread * median) or "lognormal" (sigma = spread).
+        median_ms (float): Median latency in milliseconds.
+        spread (float): Width of the distribution, see above.
+    """
+    median = median_ms / 1000
+    if distribution == "constant":
+        return lambda: median
+    if distribution == "uniform":
+        return lambda: random.uniform(max(median * (1 - spread), 0.0), median * (1 + spread))
+    if distribution == "lognormal":
+        return lambda: random.lognormvariate(0.0, spread) * median
+    raise ValueError(f"Unknown latency distribution: {distribution}")
+
+
+def _location_hash(name: str) -> int:
+    return zlib.crc32(name.lower().encode())
+
+
+class FakeOpenWeather:
+    """
+    aiohttp application answering /data/2.5/weather and /data/2.5/forecast like OpenWeather.
+
+    Calls are counted per endpoint and per status (`calls`, `statuses`) so that a load test can report upstream calls
+    per user request. Cities listed in `unknown_cities` always get a 404, like a typo against the real API.
+    """
+
+    def __init__(
+        self,
+        latency: Callable[[], float] = lambda: 0.0,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        not_found_rate: float = 0.0,
+        unknown_cities: Tuple[str, ...] = (),
+        replay_dir: Optional[Path] = None,
+        record_dir: Optional[Path] = None,
+        upstream_url: str = OPENWEATHER_URL,
+        upstream_key: Optional[str] = None,
+    ):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.not_found_rate = not_found_rate
+        self.unknown_cities = {city.lower() for city in unknown_cities}
+        self.replay_dir = replay_dir
+        self.record_dir = record_dir
+        self.upstream_url = upstream_url
+        self.upstream_key = upstream_key
+        self.weather_template = json.loads((FIXTURES_DIR / "openweather_weather.json").read_text())
+        self.forecast_template = json.loads((FIXTURES_DIR / "openweather_forecast.json").read_text())
+        # id -> (name, country) of every synthesized location, so that by-id calls answer consistently
+        self._locations: Dict[int, Tuple[str, str]] = {}
+        self._session: Optional[aiohttp.ClientSession] = None
+        self.calls: Counter = Counter()
+        self.statuses: Counter = Counter()
+
+    @property
+    def total_calls(self) -> int:
+        return sum(self.calls.values())
+
+    def reset_counters(self):
+        self.calls.clear()
+        self.statuses.clear()
+
+    def make_app(self) -> web.Application:
+        app = web.Application()
+        for endpoint in ENDPOINTS:
+            app.router.add_get(f"/data/2.5/{endpoint}", lambda request, endpoint=endpoint: self.handle(request, endpoint))
+        app.on_cleanup.append(self._close_session)
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8765) -> web.AppRunner:
+        runner = web.AppRunner(self.make_app(), access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, host, port).start()
+        return runner
+
+    async def _close_session(self, app: web.Application):
+        if self._session:
+            await self._session.close()
+
+    async def handle(self, request: web.Request, endpoint: str) -> web.Response:
+        self.calls[endpoint] += 1
+        await asyncio.sleep(self.latency())
+        params = {key: value for key, value in request.query.items() if key != "appid"}
+        status, payload = await self._answer(endpoint, params)
+        self.statuses[status] += 1
+        headers = {"Retry-After": "1"} if status == 429 else None
+        return web.json_response(payload, status=status, headers=headers)
+
+    async def _answer(self, endpoint: str, params: Dict[str, str]) -> Tuple[int, Dict[str, Any]]:
+        draw = random.random()
+        if draw < self.error_rate:
+            return 500, {"cod": 500, "message": "Internal error"}
+        if draw < self.error_rate + self.rate_limit_rate:
+            return 429, {"cod": 429, "message": "Your account is temporary blocked due to exceeding of requests " "limitation"}
+        city = params.get("q", "").split(",")[0].strip()
+        if draw < self.error_rate + self.rate_limit_rate + self.not_found_rate or city.lower() in self.unknown_cities:
+            return 404, {"cod": "404", "message": "city not found"}
+        if self.record_dir:
+            return await self._record(endpoint, params)
+        if self.replay_dir:
+            recorded = self._recording_path(self.replay_dir, endpoint, params)
+            if recorded.exists():
+                return tuple(json.loads(recorded.read_text()))
+        return 200, self._synthesize(endpoint, params)
+
+    @staticmethod
+    def _recording_path(directory: Path, endpoint: str, params: Dict[str, str]) -> Path:
+        digest = hashlib.sha1(json.dumps(sorted(params.items())).encode()).hexdigest()
+        return directory / endpoint / f"{digest}.json"
+
+    async def _record(self, endpoint: str, params: Dict[str, str]) -> Tuple[int, Dict[str, Any]]:
+        """Proxy the call to the real API and store the answer for replay"""
+        if self._session is None:
+            self._session = aiohttp.ClientSession()
+        async with self._session.get(f"{self.upstream_url}/{endpoint}", params={"appid": self.upstream_key, **params}) as response:
+            answer = (response.status, await response.json(content_type=None))
+        path = self._recording_path(self.record_dir, endpoint, params)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(answer))
+        return answer
+
+    def _resolve_location(self, params: Dict[str, str]) -> Tuple[int, str, str, float, float]:
+        """(id, name, country, lat, lon) for a q=, id= or lat=/lon= query"""
+        if "id" in params:
+            city_id = int(params["id"])
+            name, country = self._locations.get(city_id, (f"City {city_id}", "XX"))
+        elif "q" in params:
+            name, _, country = params["q"].partition(",")
+            name, country = name.strip().title(), (country.strip().upper() or "XX")
+            city_id = _location_hash(f"{name},{country}") % 10_000_000
+        else:
+            lat, lon = float(params.get("lat", 0)), float(params.get("lon", 0))
+            name, country = f"Place {lat:.2f} {lon:.2f}", "XX"
+            city_id = _location_hash(name) % 10_000_000
+            return city_id, name, country, lat, lon
+        self._locations[city_id] = (name, country)
+        location_hash = _location_hash(name)
+        return city_id, name, country, (location_hash % 18000) / 100 - 90, (location_hash // 18000 % 36000) / 100 - 180
+
+    def _synthesize(self, endpoint: str, params: Dict[str, str]) -> Dict[str, Any]:
+        city_id, name, country, lat, lon = self._resolve_location(params)
+        now = int(time.time())
+        # A stable per-location temperature offset so that locations differ
+        offset = (_location_hash(name) % 200) / 10 - 10
+        if endpoint == "weather":
+            payload = copy.deepcopy(self.weather_template)
+            payload.update(id=city_id, name=name, dt=now, coord={"lat": lat, "lon": lon})
+            payload["sys"]["country"] = country
+            payload["main"]["temp"] = round(payload["main"]["temp"] + offset, 2)
+            return payload
+        payload = copy.deepcopy(self.forecast_template)
+        payload["city"].update(id=city_id, name=name, country=country, coord={"lat": lat, "lon": lon})
+        # Move the points so that the first one is the current 3-hour slot
+        shift = now - now % 10800 - payload["list"][0]["dt"]
+        for point in payload["list"]:
+            point["dt"] += shift
+            point["main"]["temp"] = round(point["main"]["temp"] + offset, 2)
+        return payload
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-dist", choices=("constant", "uniform", "lognormal"), default="lognormal")
+    parser.add_argument("--latency-ms", type=float, default=80.0, help="median upstream latency")
+    parser.add_argument("--latency-spread", type=float, default=0.5)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of calls answered with 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="share of calls answered with 429")
+    parser.add_argument("--not-found-rate", type=float, default=0.0, help="share of calls answered with 404")
+    parser.add_argument("--unknown-city", action="append", default=[], help="city always answered with 404")
+    parser.add_argument("--replay", type=Path, help="directory of recorded responses to serve")
+    parser.add_argument("--record", type=Path, help="proxy to the real API and record responses here")
+    parser.add_argument("--upstream-url", default=OPENWEATHER_URL)
+    parser.add_argument("--upstream-key", help="OpenWeather API key used when recording")
+    args = parser.parse_args()
+    if args.record and not args.upstream_key:
+        parser.error("--record needs --upstream-key")
+
+    fake = FakeOpenWeather(
+        make_latency(args.latency_dist, args.latency_ms, args.latency_spread),
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        not_found_rate=args.not_found_rate,
+        unknown_cities=tuple(args.unknown_city),
+        replay_dir=args.replay,
+        record_dir=args.record,
+        upstream_url=args.upstream_url,
+        upstream_key=args.upstream_key,
+    )
+    print(f"Fake OpenWeather on http://{args.host}:{args.port}/data/2.5")
+    web.run_app(fake.make_app(), host=args.host, port=args.port, access_log=None, print=None)
+
+
+if __name__ == "__main__":
+    main()
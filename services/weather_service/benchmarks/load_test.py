@@ -0,0 +1,175 @@
+"""
+Load test of the weather service against the local OpenWeather stand-in (benchmarks.fake_openweather) and Redis.
+
+City popularity follows a Zipf distribution (rank r is requested with weight 1 / r^s). The FastAPI app runs
+in-process (its lifespan included) unless --target points at a running instance, which must then be configured
+with OPENWEATHER_API_URL=http://<fake host>:<fake port>/data/2.5. Reports throughput, p50/p95/p99 latency, statuses
+and OpenWeather calls per user request.
+
+Needs a local Redis, e.g.:
+    docker run --rm -p 6379:6379 redis:alpine --requirepass loadtest
+
+Usage (from services/weather_service):
+    python -m benchmarks.load_test --requests 20000 --concurrency 100 --cities 2000 --zipf-s 1.1 --flush-redis
+    python -m benchmarks.load_test --latency-ms 200 --error-rate 0.05 --rate-limit-rate 0.02 --unknown-rate 0.01
+"""
+
+import argparse
+import asyncio
+import itertools
+import os
+import random
+import time
+from collections import Counter
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+import aioredis
+import httpx
+
+from benchmarks.fake_openweather import FakeOpenWeather, make_latency
+
+FAKE_HOST = "127.0.0.1"
+FAKE_PORT = 8765
+
+# Point the in-process app at the stand-in and a local Redis before the app settings are loaded
+os.environ.setdefault("OPENWEATHER_API_URL", f"http://{FAKE_HOST}:{FAKE_PORT}/data/2.5")
+os.environ.setdefault("OPENWEATHER_API_KEY", "loadtest")
+os.environ.setdefault("API_V1_STR", "/api/v1")
+os.environ.setdefault("WEATHER_API_PROJECT_NAME", "Weather Service")
+os.environ.setdefault("REDIS_PRIMARY_CONNECTION_STRING", "localhost:6379,password=loadtest,ssl=False")
+os.environ.setdefault("ENVIRONMENT", "loadtest")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+from app.config import get_settings  # noqa: E402
+from app.main import app  # noqa: E402
+from app.resources import parse_redis_connection_string  # noqa: E402
+
+
+class ZipfCities:
+    """Samples city names, the city of rank r with probability proportional to 1 / r^s"""
+
+    def __init__(self, count: int, s: float, unknown_rate: float = 0.0):
+        self.names = [f"city{rank:05d}" for rank in range(1, count + 1)]
+        self.cum_weights = list(itertools.accumulate(1 / rank**s for rank in range(1, count + 1)))
+        self.unknown_rate = unknown_rate
+        self.unknown = [f"nowhere{i:03d}" for i in range(100)]
+
+    def sample(self) -> str:
+        if self.unknown_rate and random.random() < self.unknown_rate:
+            return random.choice(self.unknown)
+        return random.choices(self.names, cum_weights=self.cum_weights)[0]
+
+
+def percentile(latencies: Sequence[float], q: float) -> float:
+    return latencies[min(int(len(latencies) * q), len(latencies) - 1)] if latencies else 0.0
+
+
+async def drive(
+    client: httpx.AsyncClient, api_prefix: str, cities: ZipfCities, total: int, concurrency: int, forecast_ratio: float
+) -> Tuple[List[float], Counter, float]:
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    remaining = iter(range(total))
+
+    async def worker():
+        for _ in remaining:
+            city = cities.sample()
+            path = f"/weather/city/{city}/forecast" if random.random() < forecast_ratio else f"/weather/city/{city}"
+            started = time.perf_counter()
+            try:
+                response = await client.get(f"{api_prefix}{path}")
+                statuses[response.status_code] += 1
+            except httpx.HTTPError as e:
+                statuses[type(e).__name__] += 1
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, statuses, time.perf_counter() - started
+
+
+def report(latencies: List[float], statuses: Counter, elapsed: float, fake: FakeOpenWeather):
+    latencies.sort()
+    print(f"{len(latencies)} requests in {elapsed:.1f}s: {len(latencies) / elapsed:.1f} req/s")
+    print(
+        "latency ms: "
+        + "   ".join(
+            f"{name} {percentile(latencies, q) * 1000:.2f}" for name, q in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99), ("max", 1.0))
+        )
+    )
+    print(f"statuses: {dict(sorted(statuses.items(), key=str))}")
+    per_request = fake.total_calls / len(latencies) if latencies else 0.0
+    print(f"OpenWeather calls: {dict(fake.calls)} ({per_request:.4f} per user request), " f"statuses {dict(sorted(fake.statuses.items()))}")
+
+
+async def run(args: argparse.Namespace):
+    fake = FakeOpenWeather(
+        make_latency(args.latency_dist, args.latency_ms, args.latency_spread),
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        replay_dir=args.replay,
+    )
+    cities = ZipfCities(args.cities, args.zipf_s, args.unknown_rate)
+    fake.unknown_cities = set(cities.unknown)
+    runner = await fake.start(FAKE_HOST, FAKE_PORT)
+    try:
+        if args.target:
+            async with httpx.AsyncClient(base_url=args.target, timeout=30.0) as client:
+                await measure(client, args, cities, fake)
+            return
+
+        if args.flush_redis:
+            await flush_redis()
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+            async with httpx.AsyncClient(transport=transport, base_url="http://weather-service") as client:
+                await measure(client, args, cities, fake, api_prefix=get_settings().API_V1_STR)
+    finally:
+        await runner.cleanup()
+
+
+async def measure(
+    client: httpx.AsyncClient, args: argparse.Namespace, cities: ZipfCities, fake: FakeOpenWeather, api_prefix: Optional[str] = None
+):
+    api_prefix = api_prefix if api_prefix is not None else get_settings().API_V1_STR
+    if args.warmup:
+        await drive(client, api_prefix, cities, args.warmup, args.concurrency, args.forecast_ratio)
+        print(f"warm-up: {args.warmup} requests, {fake.total_calls} OpenWeather calls")
+        fake.reset_counters()
+    latencies, statuses, elapsed = await drive(client, api_prefix, cities, args.requests, args.concurrency, args.forecast_ratio)
+    report(latencies, statuses, elapsed, fake)
+
+
+async def flush_redis():
+    """Start from an empty cache (only the local load-test Redis should ever be configured here)"""
+    redis = aioredis.from_url(parse_redis_connection_string(get_settings().REDIS_PRIMARY_CONNECTION_STRING))
+    try:
+        await redis.flushdb()
+    finally:
+        await redis.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=10000)
+    parser.add_argument("--warmup", type=int, default=0, help="requests sent (and not measured) first")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--cities", type=int, default=1000)
+    parser.add_argument("--zipf-s", type=float, default=1.1, help="Zipf exponent of city popularity")
+    parser.add_argument("--forecast-ratio", type=float, default=0.1, help="share of forecast requests")
+    parser.add_argument("--unknown-rate", type=float, default=0.0, help="share of requests for unknown cities")
+    parser.add_argument("--latency-dist", choices=("constant", "uniform", "lognormal"), default="lognormal")
+    parser.add_argument("--latency-ms", type=float, default=80.0, help="median OpenWeather latency")
+    parser.add_argument("--latency-spread", type=float, default=0.5)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of OpenWeather calls failing with 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="share of OpenWeather calls with 429")
+    parser.add_argument("--replay", type=Path, help="recorded responses (benchmarks.fake_openweather)")
+    parser.add_argument("--target", help="base URL of a running service instead of the in-process app")
+    parser.add_argument("--flush-redis", action="store_true", help="FLUSHDB the configured Redis before the run")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,69 @@
+import os
+import json
+import time
 import pytest
 import aioredis
 import asyncio
 from fastapi.testclient import TestClient
+from pathlib import Path
 from typing import Generator
-from ..app.main import app
-from ..app.dependencies import get_redis
+
+# Minimal settings so that the app modules can be imported without a .env file
+os.environ.setdefault("API_V1_STR", "/api/v1")
+os.environ.setdefault("WEATHER_API_PROJECT_NAME", "Weather Service")
+os.environ.setdefault("OPENWEATHER_API_URL", "http://localhost:8080/data/2.5")
+os.environ.setdefault("REDIS_PRIMARY_CONNECTION_STRING", "localhost:6379,password=test,ssl=False")
+
+# Recorded OpenWeather responses (Warsaw): current weather and 5-day/3-hour forecast
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+
+@pytest.fixture
+def openweather_weather_payload() -> dict:
+    return json.loads((FIXTURES_DIR / "openweather_weather.json").read_text())
+
+
+@pytest.fixture
+def openweather_forecast_payload() -> dict:
+    return json.loads((FIXTURES_DIR / "openweather_forecast.json").read_text())
+
+
+@pytest.fixture
+def forecast_response(openweather_forecast_payload):
+    from app.schemas.forecast import ForecastResponse
+    return ForecastResponse(**openweather_forecast_payload)
+
+
+@pytest.fixture
+def weather_response():
+    from app.schemas.weather import WeatherResponse
+    return WeatherResponse(
+        location="Warsaw",
+        country="PL",
+        temperature=20.5,
+        feels_like=18.4,
+        humidity=65,
+        pressure=1013,
+        description="clear sky",
+        weather_group="Clear",
+        wind_speed=3.5,
+        date=1734795525,
+        weather_id=800,
+        timestamp=1734795525,
+        sunrise=1734763391,
+        sunset=1734791106,
+    )
+
+
+@pytest.fixture
+def fresh_weather(weather_response):
+    """weather_response observed just now (within the soft TTL)"""
+    return weather_response.model_copy(update={"timestamp": int(time.time())})
 
 
 @pytest.fixture
 def test_client() -> Generator:
+    from app.main import app
     with TestClient(app) as client:
         yield client
 
@@ -23,3 +78,26 @@ async def redis():
         yield redis
     finally:
         await redis.close()
+
+
+@pytest.fixture
+async def fake_redis():
+    import fakeredis.aioredis
+    redis = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    try:
+        yield redis
+    finally:
+        await redis.flushall()
+        await redis.close()
+
+
+@pytest.fixture
+async def fake_binary_redis(fake_redis):
+    """Client without response decoding on the same fake server as `fake_redis`"""
+    import fakeredis.aioredis
+    redis = fakeredis.aioredis.FakeRedis(server=fake_redis.connection_pool.connection_kwargs["server"],
+                                         decode_responses=False)
+    try:
+        yield redis
+    finally:
+        await redis.close()
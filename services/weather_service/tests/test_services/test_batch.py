@@ -0,0 +1,60 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.core.exceptions import WeatherDataNotFoundException
+from app.schemas.weather import WeatherRequest
+from app.services.cache_service import WeatherCacheService
+from app.services.codecs import JsonCodec
+
+
+@pytest.mark.asyncio
+async def test_batch_dedupes_uses_one_mget_and_reports_item_errors(fake_redis, fresh_weather):
+    await fake_redis.set("weather:city:warsaw:pl", fresh_weather.model_dump_json())
+
+    async def get_current_weather(city, country_code=None):
+        if city == "atlantis":
+            raise WeatherDataNotFoundException(city)
+        return fresh_weather.model_copy(update={"location": city.title(), "country": country_code or "GB"})
+
+    weather_service = MagicMock()
+    weather_service.get_current_weather = AsyncMock(side_effect=get_current_weather)
+    cache_service = WeatherCacheService(fake_redis, weather_service)
+    redis_mget = fake_redis.mget
+
+    async def counted_mget(keys):
+        return await redis_mget(keys)
+
+    fake_redis.mget = AsyncMock(side_effect=counted_mget)
+
+    locations = [
+        WeatherRequest(city="Warsaw", country_code="PL"),
+        WeatherRequest(city="London"),
+        WeatherRequest(city="warsaw", country_code="pl"),
+        WeatherRequest(city="Atlantis"),
+    ]
+    results = await cache_service.get_weather_batch(MagicMock(), locations)
+
+    assert [r.status_code for r in results] == [200, 200, 200, 404]
+    assert results[0].weather.location == results[2].weather.location == "Warsaw"
+    assert results[1].weather.location == "London"
+    assert "atlantis" in results[3].error
+    fake_redis.mget.assert_awaited_once()
+    assert sorted(fake_redis.mget.await_args.args[0]) == ["weather:city:atlantis", "weather:city:london", "weather:city:warsaw:pl"]
+    # only the two misses went upstream
+    assert weather_service.get_current_weather.await_count == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("stored", [b"\x7fnot a cache entry", bytes([JsonCodec(compress=True).header]) + b"not zlib"])
+async def test_batch_treats_unreadable_entry_as_miss(fake_redis, fake_binary_redis, fresh_weather, stored):
+    await fake_binary_redis.set("weather:city:warsaw:pl", stored)
+    weather_service = MagicMock()
+    weather_service.get_current_weather = AsyncMock(return_value=fresh_weather)
+    cache_service = WeatherCacheService(fake_redis, weather_service, binary_redis=fake_binary_redis)
+
+    results = await cache_service.get_weather_batch(MagicMock(), [WeatherRequest(city="Warsaw", country_code="PL")])
+
+    assert results[0].status_code == 200
+    assert results[0].weather == fresh_weather
+    assert cache_service.redis_misses == 1
+    weather_service.get_current_weather.assert_awaited_once()
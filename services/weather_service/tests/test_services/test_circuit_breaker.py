@@ -0,0 +1,77 @@
+import aiohttp
+import pytest
+from unittest.mock import AsyncMock
+
+from app.core.exceptions import CircuitOpenException, OpenWeatherAPIException
+from app.services.circuit_breaker import CircuitBreaker, RetryBudget, CLOSED, OPEN, HALF_OPEN
+from app.services.openweather import OpenWeatherService
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_breaker_opens_on_failure_rate_and_recovers_through_half_open():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_rate_threshold=0.5, window_seconds=10, min_calls=4, open_seconds=30, clock=clock)
+    for succeeded in (True, False, True):
+        breaker.record_success() if succeeded else breaker.record_failure()
+    assert breaker.state == CLOSED
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow_request()
+
+    clock.now = 31
+    assert breaker.allow_request()
+    assert breaker.state == HALF_OPEN
+    # only one probe at a time
+    assert not breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+
+    clock.now = 62
+    assert breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.get_stats() == {"state": CLOSED, "failure_rate": 0.0, "calls_in_window": 0, "opened": 2, "rejected": 2}
+
+
+def test_old_failures_leave_the_window():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_rate_threshold=0.5, window_seconds=10, min_calls=2, clock=clock)
+    breaker.record_failure()
+    clock.now = 11
+    breaker.record_success()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.failure_rate == 0.0
+
+
+def test_retry_budget_caps_retries_to_a_fraction_of_calls():
+    budget = RetryBudget(ratio=0.1, min_retries=1, window_seconds=10, clock=FakeClock())
+    for _ in range(20):
+        budget.record_call()
+    assert [budget.try_retry() for _ in range(4)] == [True, True, True, False]
+    assert budget.get_stats() == {"calls_in_window": 20, "retries_in_window": 3, "exhausted": 1}
+
+
+@pytest.mark.asyncio
+async def test_requests_fail_fast_while_the_breaker_is_open():
+    breaker = CircuitBreaker(min_calls=1, open_seconds=60)
+    service = OpenWeatherService(circuit_breaker=breaker, retry_budget=RetryBudget(ratio=0, min_retries=0))
+    service.get_session = AsyncMock(side_effect=aiohttp.ClientConnectionError("connection refused"))
+
+    with pytest.raises(OpenWeatherAPIException):
+        await service.get_current_weather("Warsaw")
+    assert breaker.state == OPEN
+    # retry budget spent: a single attempt was made
+    assert service.get_session.await_count == 1
+
+    with pytest.raises(CircuitOpenException):
+        await service.get_current_weather("Warsaw")
+    assert service.get_session.await_count == 1
+    assert service.get_stats()["circuit_breaker"]["rejected"] == 1
@@ -0,0 +1,73 @@
+import pytest
+from unittest.mock import MagicMock
+
+from app.schemas.forecast import ForecastResponse
+from app.schemas.weather import WeatherResponse
+from app.services import codecs
+from app.services.codecs import JsonCodec, MsgpackCodec, get_codec
+from app.services.cache_service import WeatherCacheService
+
+
+@pytest.mark.parametrize("name", ["json", "msgpack"])
+@pytest.mark.parametrize("compress", [False, True])
+def test_codecs_roundtrip(name, compress, weather_response, forecast_response):
+    codec = get_codec(name, compress)
+    for value, model in [(weather_response, WeatherResponse), (forecast_response, ForecastResponse)]:
+        encoded = codec.encode(value)
+        assert encoded[0] == codec.header
+        assert codecs.decode(encoded, model) == value
+
+
+def test_legacy_json_entries_stay_readable(weather_response, forecast_response):
+    assert codecs.decode(weather_response.model_dump_json(), WeatherResponse) == weather_response
+    assert codecs.decode(forecast_response.model_dump_json().encode(), ForecastResponse) == forecast_response
+
+
+def test_any_codec_is_readable_whatever_is_configured(forecast_response):
+    written = MsgpackCodec(compress=True).encode(forecast_response)
+    assert JsonCodec().encode(forecast_response) != written
+    assert codecs.decode(written, ForecastResponse) == forecast_response
+    assert len(written) < len(forecast_response.model_dump_json())
+
+
+def test_unknown_codec():
+    with pytest.raises(ValueError):
+        get_codec("pickle")
+    with pytest.raises(ValueError):
+        codecs.decode(b"\x7fgarbage", WeatherResponse)
+
+
+def test_corrupted_compressed_entry_is_unreadable(weather_response):
+    encoded = JsonCodec(compress=True).encode(weather_response)
+    with pytest.raises(ValueError):
+        codecs.decode(encoded[:1] + b"not zlib" + encoded[9:], WeatherResponse)
+
+
+def test_incomplete_codec_cannot_be_created():
+    class DumpOnlyCodec(codecs.CacheCodec):
+        def _dump(self, value):
+            return b""
+
+    with pytest.raises(TypeError):
+        DumpOnlyCodec()
+
+
+@pytest.mark.asyncio
+async def test_cache_service_stores_binary_entries(fake_redis, fake_binary_redis, weather_response):
+    cache_service = WeatherCacheService(fake_redis, MagicMock(), codec=MsgpackCodec(compress=True), binary_redis=fake_binary_redis)
+    await cache_service._write_cache("weather:city:warsaw", weather_response)
+    cache_service.local_cache.clear()
+
+    stored = await fake_binary_redis.get("weather:city:warsaw")
+    assert stored[0] == MsgpackCodec(compress=True).header
+    assert await cache_service._read_cached("weather:city:warsaw", WeatherResponse) == weather_response
+
+
+@pytest.mark.asyncio
+async def test_cache_service_treats_corrupted_compressed_entry_as_miss(fake_redis, fake_binary_redis, weather_response):
+    cache_service = WeatherCacheService(fake_redis, MagicMock(), codec=MsgpackCodec(compress=True), binary_redis=fake_binary_redis)
+    encoded = MsgpackCodec(compress=True).encode(weather_response)
+    await fake_binary_redis.set("weather:city:warsaw", encoded[:-4])
+
+    assert await cache_service._read_cached("weather:city:warsaw", WeatherResponse) is None
+    assert cache_service.redis_misses == 1
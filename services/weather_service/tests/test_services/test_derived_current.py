@@ -0,0 +1,60 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from fastapi import BackgroundTasks
+
+from app.schemas.forecast import ForecastColumns
+from app.services.cache_service import WeatherCacheService
+
+
+def make_service(fake_redis, weather_response, **kwargs):
+    openweather = MagicMock()
+    openweather.get_current_weather = AsyncMock(return_value=weather_response)
+    return WeatherCacheService(fake_redis, openweather, derive_from_forecast=True, **kwargs), openweather
+
+
+def bracket(columns: ForecastColumns) -> int:
+    """First pair of points with the same weather group"""
+    return next(i for i in range(len(columns.dt) - 1) if columns.weather_main[i] == columns.weather_main[i + 1])
+
+
+@pytest.mark.asyncio
+async def test_interpolates_between_forecast_points(fake_redis, weather_response, forecast_response):
+    cache_service, _ = make_service(fake_redis, weather_response, derived_max_temp_delta=100.0)
+    columns = ForecastColumns.from_response(forecast_response)
+    i = bracket(columns)
+    now = (columns.dt[i] + columns.dt[i + 1]) / 2
+    columns.fetched_at = int(now) - 600
+    await cache_service._write_cache("forecast:city:warsaw:pl", columns)
+
+    derived = await cache_service._derive_from_forecast("Warsaw", "PL", now=now)
+
+    assert derived.derived
+    assert derived.temperature == round((columns.temp[i] + columns.temp[i + 1]) / 2, 2)
+    assert derived.weather_group == columns.weather_main[i]
+    assert derived.location == "Warsaw"
+    assert cache_service.get_stats()["derived"] == {"hits": 1, "rejections": 0}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("age, max_temp_delta", [(7200, 100.0), (600, 0.0)])
+async def test_falls_back_when_stale_or_unreliable(fake_redis, weather_response, forecast_response, age, max_temp_delta):
+    cache_service, _ = make_service(fake_redis, weather_response, derived_max_temp_delta=max_temp_delta)
+    columns = ForecastColumns.from_response(forecast_response)
+    i = next(i for i in range(len(columns.dt) - 1) if columns.temp[i] != columns.temp[i + 1])
+    now = columns.dt[i] + 3600
+    columns.fetched_at = now - age
+    await cache_service._write_cache("forecast:city:warsaw:pl", columns)
+
+    assert await cache_service._derive_from_forecast("Warsaw", "PL", now=now) is None
+    assert cache_service.derived_rejections == 1
+
+
+@pytest.mark.asyncio
+async def test_city_miss_without_forecast_uses_live_endpoint(fake_redis, weather_response):
+    cache_service, openweather = make_service(fake_redis, weather_response)
+
+    weather = await cache_service.get_weather_by_city(BackgroundTasks(), "Warsaw")
+
+    assert not weather.derived
+    assert openweather.get_current_weather.await_count == 1
@@ -0,0 +1,80 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from fastapi import BackgroundTasks
+
+from app.schemas.forecast import ForecastColumns, FORECAST_COLUMNS, WeatherCondition
+from app.services.cache_service import WeatherCacheService
+
+
+def test_columns_roundtrip(forecast_response):
+    columns = ForecastColumns.from_response(forecast_response)
+    assert len(columns.dt) == forecast_response.count
+    assert set(FORECAST_COLUMNS) <= set(ForecastColumns.model_fields)
+    assert columns.to_response() == forecast_response
+
+
+def test_columns_keep_every_weather_condition(forecast_response):
+    point = forecast_response.forecast_points[0]
+    fog = WeatherCondition(id=741, main="Fog", description="fog", icon="50d")
+    forecast = forecast_response.model_copy(
+        update={"forecast_points": [point.model_copy(update={"weather": point.weather + [fog]})] + forecast_response.forecast_points[1:]}
+    )
+
+    columns = ForecastColumns.model_validate_json(ForecastColumns.from_response(forecast).model_dump_json())
+
+    assert columns.weather_main[0] == point.weather[0].main
+    assert columns.to_response() == forecast
+
+
+def test_full_response_is_built_once_per_entry(forecast_response):
+    columns = ForecastColumns.from_response(forecast_response)
+    # entries cached before the secondary conditions were kept
+    legacy = ForecastColumns.model_validate_json(columns.model_dump_json(exclude={"weather_extra"}))
+
+    assert columns.to_response() is columns.to_response()
+    assert legacy.to_response() == forecast_response
+
+
+def test_window_slice_and_projection(forecast_response):
+    columns = ForecastColumns.from_response(forecast_response)
+    # start inside the second 3-hour interval: that point is the first one returned
+    start = columns.dt[1] + 3600
+    sliced = columns.slice(start, 12, ["temp", "pop"])
+    assert list(sliced.columns) == ["dt", "temp", "pop"]
+    assert sliced.count == 5
+    assert sliced.columns["dt"] == columns.dt[1:6]
+    assert sliced.columns["temp"] == columns.temp[1:6]
+
+    assert columns.slice().count == len(columns.dt)
+    assert columns.slice(columns.dt[-1] + 10**6, 3).count == 1
+    assert set(columns.slice(hours=3).columns) == set(FORECAST_COLUMNS)
+
+
+@pytest.mark.asyncio
+async def test_forecast_is_cached_in_columnar_form(fake_redis, forecast_response):
+    openweather = MagicMock()
+    openweather.get_forecast = AsyncMock(return_value=forecast_response)
+    cache_service = WeatherCacheService(fake_redis, openweather)
+
+    fetched = await cache_service.get_forecast_by_city(BackgroundTasks(), "Warsaw", "PL")
+    cache_service.local_cache.clear()
+    cached = await cache_service.get_forecast_by_city(BackgroundTasks(), "Warsaw", "PL")
+
+    assert isinstance(cached, ForecastColumns)
+    assert cached == fetched
+    assert openweather.get_forecast.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_outdated_forecast_entry_is_refetched(fake_redis, forecast_response):
+    openweather = MagicMock()
+    openweather.get_forecast = AsyncMock(return_value=forecast_response)
+    cache_service = WeatherCacheService(fake_redis, openweather)
+    # entry written before forecasts were stored in columnar form
+    await fake_redis.set("forecast:city:warsaw:pl", forecast_response.model_dump_json())
+
+    forecast = await cache_service.get_forecast_by_city(BackgroundTasks(), "Warsaw", "PL")
+
+    assert forecast.to_response() == forecast_response
+    assert openweather.get_forecast.await_count == 1
@@ -0,0 +1,87 @@
+import pytest
+from email.utils import formatdate
+
+from fastapi import Request, Response
+
+from app.core.http_cache import DATA_AGE_HEADER, build_cache_headers, conditional_response, is_not_modified
+
+TIMESTAMP = 1704067200
+
+
+def make_request(**headers) -> Request:
+    raw = [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw, "query_string": b""})
+
+
+def test_headers_describe_data_age():
+    headers = build_cache_headers(TIMESTAMP, 100, 600)
+
+    assert headers["ETag"] == f'"{TIMESTAMP:x}"'
+    assert headers["Last-Modified"] == "Mon, 01 Jan 2024 00:00:00 GMT"
+    assert headers["Cache-Control"] == "public, max-age=500"
+    assert headers[DATA_AGE_HEADER] == "100"
+
+
+@pytest.mark.parametrize("age", [0, 200, 599])
+def test_cache_freshness_matches_remaining_soft_ttl(age):
+    headers = build_cache_headers(TIMESTAMP, age, 600)
+
+    # Freshness lifetime as an HTTP cache computes it: max-age minus the Age header
+    max_age = int(headers["Cache-Control"].rsplit("max-age=", 1)[1])
+    freshness = max_age - int(headers.get("Age", 0))
+    assert freshness == 600 - age
+    assert int(headers[DATA_AGE_HEADER]) + max_age == 600
+
+
+def test_max_age_is_zero_past_soft_ttl():
+    assert build_cache_headers(TIMESTAMP, 900, 600)["Cache-Control"] == "public, max-age=0"
+
+
+def test_derived_values_are_not_cached_by_age():
+    headers = build_cache_headers(TIMESTAMP, 0, 600, derived=True)
+
+    assert headers["Cache-Control"] == "no-cache"
+    assert headers["ETag"] == build_cache_headers(TIMESTAMP, 0, 600)["ETag"]
+
+
+def test_variant_changes_etag():
+    plain = build_cache_headers(TIMESTAMP, 0, 600)["ETag"]
+    first = build_cache_headers(TIMESTAMP, 0, 600, "hours=3")["ETag"]
+    second = build_cache_headers(TIMESTAMP, 0, 600, "hours=6")["ETag"]
+
+    assert len({plain, first, second}) == 3
+
+
+def test_if_none_match():
+    headers = build_cache_headers(TIMESTAMP, 0, 600)
+
+    assert is_not_modified(make_request(if_none_match=headers["ETag"]), headers)
+    assert is_not_modified(make_request(if_none_match=f'"other", W/{headers["ETag"]}'), headers)
+    assert is_not_modified(make_request(if_none_match="*"), headers)
+    assert not is_not_modified(make_request(if_none_match='"other"'), headers)
+
+
+def test_if_none_match_takes_precedence_over_if_modified_since():
+    headers = build_cache_headers(TIMESTAMP, 0, 600)
+    request = make_request(if_none_match='"other"', if_modified_since=formatdate(TIMESTAMP + 60, usegmt=True))
+
+    assert not is_not_modified(request, headers)
+
+
+def test_if_modified_since():
+    headers = build_cache_headers(TIMESTAMP, 0, 600)
+
+    assert is_not_modified(make_request(if_modified_since=formatdate(TIMESTAMP, usegmt=True)), headers)
+    assert not is_not_modified(make_request(if_modified_since=formatdate(TIMESTAMP - 60, usegmt=True)), headers)
+    assert not is_not_modified(make_request(if_modified_since="yesterday"), headers)
+
+
+def test_conditional_response():
+    response = Response()
+    assert conditional_response(make_request(), response, TIMESTAMP, 0, 600) is None
+    assert response.headers["etag"] == f'"{TIMESTAMP:x}"'
+
+    not_modified = conditional_response(make_request(if_none_match=response.headers["etag"]), Response(), TIMESTAMP, 10, 600)
+    assert not_modified.status_code == 304
+    assert not_modified.headers["cache-control"] == "public, max-age=590"
+    assert not_modified.body == b""
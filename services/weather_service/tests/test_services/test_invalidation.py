@@ -0,0 +1,124 @@
+import asyncio
+import json
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.services.cache_service import WeatherCacheService
+from app.services.invalidation import L1Invalidator
+from app.services.local_cache import LocalTTLCache
+
+
+def make_replica(fake_redis, weather_service=None):
+    local_cache = LocalTTLCache(max_size=100, ttl=600.0)
+    invalidator = L1Invalidator(fake_redis, local_cache, reconnect_delay=0.01)
+    cache_service = WeatherCacheService(fake_redis, weather_service or MagicMock(), local_cache=local_cache, invalidator=invalidator)
+    return cache_service, invalidator
+
+
+async def wait_for(condition, timeout: float = 2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "condition not met in time"
+        await asyncio.sleep(0.01)
+
+
+def test_handle_evicts_keys_of_other_replicas():
+    local_cache = LocalTTLCache()
+    invalidator = L1Invalidator(MagicMock(), local_cache)
+    local_cache.set("weather:city:warsaw", "stale")
+    local_cache.set("weather:city:london", "kept")
+
+    assert invalidator.handle(json.dumps({"origin": "other", "keys": ["weather:city:warsaw"]})) == 1
+    assert local_cache.get("weather:city:warsaw") is None
+    assert local_cache.get("weather:city:london") == "kept"
+
+
+def test_handle_ignores_own_and_malformed_events():
+    local_cache = LocalTTLCache()
+    invalidator = L1Invalidator(MagicMock(), local_cache)
+    local_cache.set("weather:city:warsaw", "fresh")
+
+    assert invalidator.handle(json.dumps({"origin": invalidator.origin, "keys": ["weather:city:warsaw"]})) == 0
+    assert invalidator.handle("not json") == 0
+    assert invalidator.handle(json.dumps({"keys": []})) == 0
+    assert local_cache.get("weather:city:warsaw") == "fresh"
+
+
+@pytest.mark.asyncio
+async def test_write_on_one_replica_evicts_the_others(fake_redis, fresh_weather):
+    writer, writer_invalidator = make_replica(fake_redis)
+    reader, reader_invalidator = make_replica(fake_redis)
+    reader_invalidator.start()
+    try:
+        await reader_invalidator.wait_subscribed()
+        old = fresh_weather.model_copy(update={"temperature": 1.0})
+        await reader._write_cache("weather:city:warsaw", old)
+        assert await reader._read_cached("weather:city:warsaw", type(old)) == old
+
+        await writer._write_cache("weather:city:warsaw", fresh_weather)
+        await wait_for(lambda: reader_invalidator.evicted >= 1)
+
+        assert await reader._read_cached("weather:city:warsaw", type(old)) == fresh_weather
+        assert writer_invalidator.published == 1
+    finally:
+        await reader_invalidator.stop()
+
+
+@pytest.mark.asyncio
+async def test_observation_refresh_evicts_derived_keys_on_other_replicas(fake_redis, fresh_weather):
+    observed = fresh_weather.model_copy(update={"city_id": 756135, "latitude": 52.23, "longitude": 21.01})
+    refreshed = observed.model_copy(update={"temperature": 25.0})
+    writer_service = MagicMock()
+    writer_service.get_current_weather_by_id = AsyncMock(return_value=refreshed)
+    writer, _ = make_replica(fake_redis, writer_service)
+    reader, reader_invalidator = make_replica(fake_redis)
+    reader_invalidator.start()
+    try:
+        await reader_invalidator.wait_subscribed()
+        await reader._write_cache("weather:city:warsaw", observed)
+        await reader._write_cache("weather:proximity:52.0:21.0", observed)
+
+        # the refresh only writes (and publishes) the observation key
+        await writer._refresh_key("weather:id:756135")
+        await wait_for(lambda: reader_invalidator.evicted >= 1)
+
+        for cache_key in ("weather:city:warsaw", "weather:proximity:52.0:21.0"):
+            assert (await reader._read_cached(cache_key, type(observed))).temperature == 25.0
+    finally:
+        await reader_invalidator.stop()
+
+
+@pytest.mark.asyncio
+async def test_publish_failure_does_not_fail_the_write(fake_redis, fresh_weather):
+    cache_service, invalidator = make_replica(fake_redis)
+    fake_redis.publish = AsyncMock(side_effect=ConnectionError("down"))
+
+    await cache_service._write_cache("weather:city:warsaw", fresh_weather)
+
+    assert invalidator.get_stats()["errors"] == 1
+    assert await cache_service._read_cached("weather:city:warsaw", type(fresh_weather)) == fresh_weather
+
+
+@pytest.mark.asyncio
+async def test_resubscribe_clears_local_cache(fake_redis):
+    local_cache = LocalTTLCache()
+    invalidator = L1Invalidator(fake_redis, local_cache, reconnect_delay=0.01)
+    pubsub = fake_redis.pubsub
+    calls = []
+
+    def flaky_pubsub():
+        calls.append(1)
+        instance = pubsub()
+        if len(calls) == 1:
+            instance.get_message = AsyncMock(side_effect=ConnectionError("connection lost"))
+        return instance
+
+    fake_redis.pubsub = flaky_pubsub
+    local_cache.set("weather:city:warsaw", "maybe stale")
+    invalidator.start()
+    try:
+        await wait_for(lambda: invalidator.resubscribed == 1)
+        assert len(local_cache) == 0
+        assert invalidator.errors == 1
+    finally:
+        await invalidator.stop()
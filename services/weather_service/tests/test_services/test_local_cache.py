@@ -0,0 +1,89 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.services.local_cache import LocalTTLCache
+from app.services.cache_service import WeatherCacheService
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_lru_eviction():
+    cache = LocalTTLCache(max_size=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" becomes least recently used
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.get_stats()["evictions"] == 1
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = LocalTTLCache(max_size=10, ttl=30, clock=clock)
+    cache.set("a", 1)
+
+    clock.now = 29
+    assert cache.get("a") == 1
+    clock.now = 30
+    assert cache.get("a") is None
+    assert cache.get_stats()["expirations"] == 1
+
+
+@pytest.mark.asyncio
+async def test_hot_key_is_served_from_l1(fake_redis, fresh_weather):
+    await fake_redis.set("weather:city:warsaw", fresh_weather.model_dump_json())
+    cache_service = WeatherCacheService(fake_redis, MagicMock(), local_cache=LocalTTLCache(ttl=60))
+    redis_read = cache_service._dereference_script
+
+    async def counted_read(keys, args):
+        return await redis_read(keys=keys, args=args)
+
+    cache_service._dereference_script = AsyncMock(side_effect=counted_read)
+
+    for _ in range(5):
+        weather = await cache_service.get_weather_by_city(MagicMock(), "Warsaw")
+        assert weather.location == "Warsaw"
+
+    assert cache_service._dereference_script.await_count == 1
+    stats = cache_service.get_stats()
+    assert stats["l1"]["hits"] == 4
+    assert stats["l2"] == {"hits": 1, "misses": 0}
+
+
+def test_pointer_follows_its_target():
+    cache = LocalTTLCache(max_size=10, ttl=60)
+    cache.set("weather:id:1", "old")
+    cache.set_pointer("weather:city:warsaw", "weather:id:1")
+    assert cache.get("weather:city:warsaw") == "old"
+
+    cache.set("weather:id:1", "new")
+    assert cache.get("weather:city:warsaw") == "new"
+    cache.delete("weather:id:1")
+    assert cache.get("weather:city:warsaw") is None
+    assert cache.get_stats()["hits"] == 2 and cache.get_stats()["misses"] == 1
+
+
+@pytest.mark.asyncio
+async def test_observation_refresh_reaches_city_keys_in_l1(fake_redis, fresh_weather):
+    observed = fresh_weather.model_copy(update={"city_id": 756135})
+    refreshed = observed.model_copy(update={"temperature": 25.0})
+    weather_service = MagicMock()
+    weather_service.get_current_weather = AsyncMock(return_value=observed)
+    weather_service.get_current_weather_by_id = AsyncMock(return_value=refreshed)
+    cache_service = WeatherCacheService(fake_redis, weather_service, local_cache=LocalTTLCache(ttl=60))
+
+    assert (await cache_service.get_weather_by_city(MagicMock(), "Warsaw")).temperature == observed.temperature
+    # scheduled refresh of the observation itself
+    await cache_service._refresh_key("weather:id:756135")
+
+    weather = await cache_service.get_weather_by_city(MagicMock(), "Warsaw")
+    assert weather.temperature == 25.0
+    assert cache_service.get_stats()["l2"]["hits"] == 0
@@ -0,0 +1,47 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.services.cache_service import WeatherCacheService
+from app.services.locations import LocationResolver, normalize_location, LOCATION_ALIASES_KEY
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        (("  WARSAW ", None), ("warsaw", None)),
+        (("Warsaw,PL", None), ("warsaw", "pl")),
+        (("Warsaw, pl", "DE"), ("warsaw", "de")),
+        (("Kraków", "PL"), ("krakow", "pl")),
+        (("São  Paulo", None), ("sao paulo", None)),
+        (("Москва", None), ("москва", None)),
+    ],
+)
+def test_normalize_location(query, expected):
+    assert normalize_location(*query) == expected
+
+
+@pytest.mark.asyncio
+async def test_learned_alias_is_shared_across_replicas(fake_redis):
+    resolver = LocationResolver(fake_redis)
+    assert await resolver.resolve("Warszawa") == ("warszawa", None)
+    assert await resolver.learn(("warszawa", None), "Warsaw", "PL") == ("warsaw", "pl")
+    assert await fake_redis.hget(LOCATION_ALIASES_KEY, "warszawa") == "warsaw:pl"
+
+    other_replica = LocationResolver(fake_redis)
+    assert await other_replica.resolve_many([("WARSZAWA ", None), ("Berlin", None)]) == [("warsaw", "pl"), ("berlin", None)]
+
+
+@pytest.mark.asyncio
+async def test_spelling_variants_share_one_cache_entry(fake_redis, fresh_weather):
+    weather_service = MagicMock()
+    weather_service.get_current_weather = AsyncMock(return_value=fresh_weather)
+    cache_service = WeatherCacheService(fake_redis, weather_service)
+
+    await cache_service.get_weather_by_city(MagicMock(), "Warszawa")
+    for city in ("warszawa ", "WARSZAWA", "Warsaw,PL", "Warsaw"):
+        assert await cache_service.get_weather_by_city(MagicMock(), city) == fresh_weather
+    assert await cache_service.get_weather_by_city_country(MagicMock(), "warsaw", "pl") == fresh_weather
+
+    # upstream calls only for the first unknown spellings ("warszawa" and the bare "warsaw"), both learned
+    assert weather_service.get_current_weather.await_count == 2
+    assert await fake_redis.keys("weather:city:*") == ["weather:city:warsaw:pl"]
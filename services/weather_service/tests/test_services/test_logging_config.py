@@ -0,0 +1,44 @@
+import logging
+
+from app.logging_config import RateLimitFilter, get_log_levels, setup_logging
+
+
+def make_record(level: int = logging.INFO, lineno: int = 10, msg: str = "Cache hit") -> logging.LogRecord:
+    return logging.LogRecord("app.services.cache_service", level, __file__, lineno, msg, None, None)
+
+
+def test_rate_limit_per_call_site(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr("app.logging_config.time.monotonic", lambda: now[0])
+    rate_limit = RateLimitFilter(rate=2, interval=1.0)
+
+    assert [rate_limit.filter(make_record()) for _ in range(4)] == [True, True, False, False]
+    # another call site has its own allowance
+    assert rate_limit.filter(make_record(lineno=20))
+
+    now[0] = 1.5
+    record = make_record()
+    assert rate_limit.filter(record)
+    assert record.msg == "Cache hit [2 similar messages suppressed]"
+
+
+def test_warnings_are_never_dropped():
+    rate_limit = RateLimitFilter(rate=1)
+
+    assert all(rate_limit.filter(make_record(level=logging.WARNING)) for _ in range(5))
+
+
+def test_levels_per_environment(monkeypatch):
+    monkeypatch.delenv("LOG_LEVEL", raising=False)
+    monkeypatch.setenv("LOG_LEVELS", "app.services.cache_service=warning, aiohttp=ERROR,broken")
+
+    assert get_log_levels("dev") == ("DEBUG", {"app.services.cache_service": "WARNING", "aiohttp": "ERROR"})
+    assert get_log_levels("production")[0] == "WARNING"
+    monkeypatch.setenv("LOG_LEVEL", "info")
+    assert get_log_levels("dev")[0] == "INFO"
+
+
+def test_setup_logging_applies_logger_levels(monkeypatch):
+    monkeypatch.setenv("LOG_LEVELS", "aiohttp=ERROR")
+
+    assert setup_logging()["loggers"] == {"aiohttp": {"level": "ERROR"}}
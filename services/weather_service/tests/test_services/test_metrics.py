@@ -0,0 +1,108 @@
+import time
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from unittest.mock import AsyncMock, MagicMock
+
+from app.core.metrics import Histogram, MetricsWriter, RequestMetrics, RequestMetricsMiddleware
+from app.services.cache_service import WeatherCacheService, get_key_family
+
+
+def test_histogram_buckets_are_cumulative_when_rendered():
+    histogram = Histogram(buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value)
+    writer = MetricsWriter(prefix="weather_")
+
+    writer.histogram("latency_seconds", "Latency.", [((("route", "/a"),), histogram)])
+    lines = writer.render().splitlines()
+
+    assert lines[:2] == ["# HELP weather_latency_seconds Latency.", "# TYPE weather_latency_seconds histogram"]
+    assert 'weather_latency_seconds_bucket{route="/a",le="0.1"} 2' in lines
+    assert 'weather_latency_seconds_bucket{route="/a",le="1.0"} 3' in lines
+    assert 'weather_latency_seconds_bucket{route="/a",le="+Inf"} 4' in lines
+    assert 'weather_latency_seconds_sum{route="/a"} 3.65' in lines
+    assert 'weather_latency_seconds_count{route="/a"} 4' in lines
+
+
+def test_label_values_are_escaped():
+    writer = MetricsWriter()
+    writer.counter("errors_total", "Errors.", [((("kind", 'say "hi"\n'),), 1)])
+
+    assert 'errors_total{kind="say \\"hi\\"\\n"} 1' in writer.render()
+
+
+def test_middleware_labels_requests_by_route_template():
+    app = FastAPI()
+    request_metrics = RequestMetrics()
+    app.add_middleware(RequestMetricsMiddleware, metrics=request_metrics)
+
+    @app.get("/weather/city/{city}")
+    async def city(city: str):
+        if city == "atlantis":
+            raise HTTPException(status_code=404)
+        return {"city": city}
+
+    client = TestClient(app)
+    client.get("/weather/city/warsaw")
+    client.get("/weather/city/london")
+    client.get("/weather/city/atlantis")
+    client.get("/nowhere")
+    writer = MetricsWriter()
+    request_metrics.write_metrics(writer)
+    rendered = writer.render()
+
+    assert 'http_request_duration_seconds_count{route="/weather/city/{city}",status="200"} 2' in rendered
+    assert 'http_request_duration_seconds_count{route="/weather/city/{city}",status="404"} 1' in rendered
+    assert 'http_request_duration_seconds_count{route="unmatched",status="404"} 1' in rendered
+
+
+def test_key_families():
+    assert get_key_family("weather:city:warsaw") == "city"
+    assert get_key_family("weather:city:warsaw:pl") == "city_country"
+    assert get_key_family("weather:proximity:50.00:20.00") == "proximity"
+    assert get_key_family("forecast:city:warsaw:pl") == "forecast"
+
+
+@pytest.mark.asyncio
+async def test_cache_lookups_are_counted_per_family(fake_redis, fresh_weather):
+    weather_service = MagicMock()
+    weather_service.get_current_weather = AsyncMock(return_value=fresh_weather)
+    cache_service = WeatherCacheService(fake_redis, weather_service)
+
+    await cache_service.get_weather_by_city_country(MagicMock(), "Warsaw", "PL")
+    await cache_service.get_weather_by_city_country(MagicMock(), "Warsaw", "PL")
+    writer = MetricsWriter()
+    cache_service.write_metrics(writer)
+    rendered = writer.render()
+
+    assert cache_service.lookups["city_country"] == {"hit": 1, "miss": 1, "stale": 0}
+    assert 'cache_lookups_total{family="city_country",result="hit"} 1' in rendered
+    assert 'refresh_queue_depth 0' in rendered
+
+
+@pytest.mark.asyncio
+async def test_proximity_distance_and_refresh_lag_histograms(fake_redis, fresh_weather):
+    weather_service = MagicMock()
+    weather_service.get_current_weather_by_coordinates = AsyncMock(return_value=fresh_weather)
+    cache_service = WeatherCacheService(fake_redis, weather_service, proximity_precision=0.01, proximity_radius_km=2.0)
+    await cache_service.get_weather_by_proximity(MagicMock(), 52.2340, 21.0122)
+    # ~300 m away, served from the observation cached above
+    await cache_service.get_weather_by_proximity(MagicMock(), 52.2370, 21.0122)
+
+    scheduler = cache_service.refresh_scheduler
+    scheduler.start()
+    try:
+        scheduler.submit("weather:city:warsaw", AsyncMock(), due_at=time.time() - 42)
+        await scheduler.join()
+    finally:
+        await scheduler.stop()
+    writer = MetricsWriter()
+    cache_service.write_metrics(writer)
+    rendered = writer.render()
+
+    assert 'proximity_match_distance_km_bucket{le="0.25"} 0' in rendered
+    assert 'proximity_match_distance_km_bucket{le="0.5"} 1' in rendered
+    assert 'refresh_lag_seconds_bucket{le="30.0"} 0' in rendered
+    assert 'refresh_lag_seconds_bucket{le="60.0"} 1' in rendered
+    assert 'refresh_lag_seconds_count 1' in rendered
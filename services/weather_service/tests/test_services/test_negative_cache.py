@@ -0,0 +1,36 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from fastapi import HTTPException
+
+from app.core.exceptions import WeatherDataNotFoundException
+from app.services.cache_service import WeatherCacheService, get_negative_key
+
+
+@pytest.mark.asyncio
+async def test_unknown_location_is_answered_from_the_negative_cache(fake_redis):
+    weather_service = MagicMock()
+    weather_service.get_current_weather = AsyncMock(side_effect=WeatherDataNotFoundException("Atlantis"))
+    cache_service = WeatherCacheService(fake_redis, weather_service, negative_ttl=120)
+
+    for _ in range(3):
+        with pytest.raises(HTTPException) as exc_info:
+            await cache_service.get_weather_by_city(MagicMock(), "Atlantis")
+        assert exc_info.value.status_code == 404
+        assert "Atlantis" in exc_info.value.detail
+
+    assert weather_service.get_current_weather.await_count == 1
+    assert 0 < await fake_redis.ttl(get_negative_key("weather:city:atlantis")) <= 120
+    assert cache_service.get_stats()["negative"] == {"hits": 2, "writes": 1}
+
+
+@pytest.mark.asyncio
+async def test_other_errors_are_not_negatively_cached(fake_redis, fresh_weather):
+    weather_service = MagicMock()
+    weather_service.get_current_weather = AsyncMock(side_effect=[HTTPException(status_code=503), fresh_weather])
+    cache_service = WeatherCacheService(fake_redis, weather_service)
+
+    with pytest.raises(HTTPException):
+        await cache_service.get_weather_by_city(MagicMock(), "Warsaw")
+    assert await cache_service.get_weather_by_city(MagicMock(), "Warsaw") == fresh_weather
+    assert cache_service.negative_writes == 0
@@ -0,0 +1,48 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.schemas.weather import WeatherRequest
+from app.services.cache_service import WeatherCacheService, get_observation_key, get_proximity_key, REFRESH_SCHEDULE_KEY
+
+
+@pytest.fixture
+def observed(fresh_weather):
+    return fresh_weather.model_copy(update={"city_id": 756135, "latitude": 52.2298, "longitude": 21.0118})
+
+
+@pytest.mark.asyncio
+async def test_city_and_coordinate_lookups_share_one_observation(fake_redis, observed):
+    weather_service = MagicMock()
+    weather_service.get_current_weather = AsyncMock(return_value=observed)
+    weather_service.get_current_weather_by_coordinates = AsyncMock(return_value=observed)
+    cache_service = WeatherCacheService(fake_redis, weather_service)
+
+    await cache_service.get_weather_by_city_country(MagicMock(), "Warsaw", "PL")
+    # a neighbouring cell is answered from the city's observation (indexed at its coordinates)
+    assert await cache_service.get_weather_by_proximity(MagicMock(), 52.23, 21.01) == observed
+    weather_service.get_current_weather_by_coordinates.assert_not_awaited()
+
+    observation_key = get_observation_key(756135)
+    assert await fake_redis.get("weather:city:warsaw:pl") == observation_key
+    assert await fake_redis.zrange(REFRESH_SCHEDULE_KEY, 0, -1) == [observation_key]
+
+    cache_service.local_cache.clear()
+    assert await cache_service.get_weather_by_city_country(MagicMock(), "Warsaw", "PL") == observed
+    results = await cache_service.get_weather_batch(MagicMock(), [WeatherRequest(city="Warsaw", country_code="PL")])
+    assert results[0].weather == observed
+    assert weather_service.get_current_weather.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_proximity_fetch_points_to_the_observation(fake_redis, observed):
+    weather_service = MagicMock()
+    weather_service.get_current_weather_by_coordinates = AsyncMock(return_value=observed)
+    weather_service.get_current_weather_by_id = AsyncMock(return_value=observed)
+    cache_service = WeatherCacheService(fake_redis, weather_service, proximity_radius_km=0)
+
+    await cache_service.get_weather_by_proximity(MagicMock(), 52.2297, 21.0122)
+    assert await fake_redis.get(get_proximity_key(52.2297, 21.0122, 5.0)) == get_observation_key(756135)
+
+    # the schedule refreshes the observation by its id
+    await cache_service._refresh_key(get_observation_key(756135))
+    weather_service.get_current_weather_by_id.assert_awaited_once_with(756135)
@@ -0,0 +1,20 @@
+import pytest
+
+from app.config import get_settings
+from app.services.openweather import OpenWeatherService
+
+
+@pytest.mark.asyncio
+async def test_session_is_pooled_and_reused():
+    settings = get_settings()
+    service = OpenWeatherService()
+    await service.start()
+    try:
+        session = await service.get_session()
+        assert session is await service.get_session()
+        assert session.connector.limit == settings.OPENWEATHER_CONNECTION_LIMIT
+        assert session.connector.limit_per_host == settings.OPENWEATHER_CONNECTION_LIMIT_PER_HOST
+        assert session.timeout.total == settings.OPENWEATHER_TIMEOUT_TOTAL
+    finally:
+        await service.close()
+    assert session.closed
@@ -0,0 +1,77 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.services.cache_service import WeatherCacheService
+from app.services.popularity import PopularityTracker, HOT_LOCATIONS_EPOCH_KEY
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_700_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.mark.asyncio
+async def test_ranking_decays_older_requests(fake_redis):
+    clock = FakeClock()
+    tracker = PopularityTracker(fake_redis, half_life=3600, clock=clock)
+    for _ in range(4):
+        tracker.record("weather:city:london")
+    await tracker.flush()
+
+    # two half-lives later 3 requests outweigh the 4 old ones (worth 1 now)
+    clock.now += 7200
+    for _ in range(3):
+        tracker.record("weather:city:warsaw")
+    tracker.record("weather:city:london")
+    assert await tracker.flush() == 2
+
+    assert await tracker.top(2) == [("weather:city:warsaw", 3.0), ("weather:city:london", 2.0)]
+    assert tracker.get_stats() == {"recorded": 8, "pending": 0, "flushes": 2}
+
+
+@pytest.mark.asyncio
+async def test_scores_are_rescaled_without_changing_the_ranking(fake_redis):
+    clock = FakeClock()
+    tracker = PopularityTracker(fake_redis, half_life=1, max_tracked=2, clock=clock)
+    tracker.record("weather:city:oslo")
+    tracker.record("weather:city:oslo")
+    tracker.record("weather:city:paris")
+    await tracker.flush()
+
+    clock.now += 100
+    tracker.record("weather:city:rome")
+    await tracker.flush()
+
+    assert float(await fake_redis.get(HOT_LOCATIONS_EPOCH_KEY)) == clock.now
+    # trimmed to max_tracked, oslo decayed to ~0 but still ranks above paris
+    assert [key for key, _ in await tracker.top(5)] == ["weather:city:rome", "weather:city:oslo"]
+
+
+@pytest.mark.asyncio
+async def test_warm_up_prefetches_missing_hot_locations(fake_redis, fresh_weather):
+    weather_service = MagicMock()
+    weather_service.get_current_weather = AsyncMock(return_value=fresh_weather.model_copy(update={"location": "London", "country": "GB"}))
+    tracker = PopularityTracker(fake_redis)
+    cache_service = WeatherCacheService(fake_redis, weather_service, popularity=tracker, warm_top_n=10)
+    await cache_service._write_cache("weather:city:warsaw", fresh_weather)
+    tracker.record("weather:city:warsaw")
+    tracker.record("weather:city:london")
+    await tracker.flush()
+
+    cache_service.refresh_scheduler.start()
+    try:
+        progress = await cache_service.warm_up()
+        await cache_service.refresh_scheduler.join()
+    finally:
+        await cache_service.refresh_scheduler.stop()
+
+    assert progress == {**progress, "hot": 2, "cached": 1, "submitted": 1, "completed": 1, "failed": 0}
+    weather_service.get_current_weather.assert_awaited_once_with("london")
+    # stored under the canonical location learned from the answer
+    assert await fake_redis.exists("weather:city:london:gb")
+    hot = await cache_service.get_hot_locations()
+    assert {entry["key"] for entry in hot["hot"]} == {"weather:city:london", "weather:city:warsaw"}
+    assert hot["warm_up"]["completed"] == 1
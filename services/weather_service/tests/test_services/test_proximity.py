@@ -0,0 +1,36 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.services.cache_service import WeatherCacheService, get_proximity_key, PROXIMITY_GEO_KEY
+
+
+@pytest.mark.asyncio
+async def test_proximity_miss_is_served_from_nearest_observation(fake_redis, fresh_weather):
+    weather_service = MagicMock()
+    weather_service.get_current_weather_by_coordinates = AsyncMock(return_value=fresh_weather)
+    cache_service = WeatherCacheService(fake_redis, weather_service, proximity_precision=0.01, proximity_radius_km=2.0)
+
+    await cache_service.get_weather_by_proximity(MagicMock(), 52.2340, 21.0122)
+    # ~300 m away, but in a different grid cell
+    assert get_proximity_key(52.2340, 21.0122, 0.01) != get_proximity_key(52.2370, 21.0122, 0.01)
+    weather = await cache_service.get_weather_by_proximity(MagicMock(), 52.2370, 21.0122)
+
+    assert weather.location == "Warsaw"
+    weather_service.get_current_weather_by_coordinates.assert_awaited_once()
+    stats = cache_service.get_stats()["proximity"]
+    assert stats["nearest_hits"] == 1
+    assert 0.2 < stats["max_distance_km"] < 0.5
+
+
+@pytest.mark.asyncio
+async def test_expired_observations_are_dropped_from_geo_index(fake_redis, fresh_weather):
+    weather_service = MagicMock()
+    weather_service.get_current_weather_by_coordinates = AsyncMock(return_value=fresh_weather)
+    cache_service = WeatherCacheService(fake_redis, weather_service, proximity_precision=0.01, proximity_radius_km=2.0)
+    await fake_redis.execute_command("GEOADD", PROXIMITY_GEO_KEY, 21.0122, 52.2297, "weather:proximity:expired")
+
+    await cache_service.get_weather_by_proximity(MagicMock(), 52.2327, 21.0122)
+
+    weather_service.get_current_weather_by_coordinates.assert_awaited_once()
+    assert await fake_redis.zscore(PROXIMITY_GEO_KEY, "weather:proximity:expired") is None
+    assert cache_service.get_stats()["proximity"]["nearest_misses"] == 1
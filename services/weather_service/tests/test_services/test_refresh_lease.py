@@ -0,0 +1,110 @@
+import time
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from fastapi import BackgroundTasks
+
+from app.services.cache_service import WeatherCacheService, REFRESH_SCHEDULE_KEY
+from app.services.refresh_lease import RefreshLease
+
+
+def make_service(fake_redis, upstream):
+    weather_service = MagicMock()
+    weather_service.get_current_weather = AsyncMock(side_effect=upstream)
+    cache_service = WeatherCacheService(
+        fake_redis, weather_service, refresh_threshold=600, refresh_lease=RefreshLease(fake_redis, lease_ttl_ms=5000)
+    )
+    return cache_service, weather_service
+
+
+@pytest.mark.asyncio
+async def test_lease_holder_refreshes_and_releases(fake_redis, fresh_weather):
+    cache_service, weather_service = make_service(fake_redis, [fresh_weather])
+
+    await cache_service._refresh_scheduled("weather:city:warsaw:pl")
+
+    weather_service.get_current_weather.assert_awaited_once_with("warsaw", "pl")
+    assert cache_service.refresh_lease.get_stats()["acquired"] == 1
+    assert not await fake_redis.exists("lease:refresh:weather:city:warsaw:pl")
+    assert await cache_service._read_cached("weather:city:warsaw:pl", type(fresh_weather)) == fresh_weather
+
+
+@pytest.mark.asyncio
+async def test_refresh_is_skipped_while_another_replica_holds_the_lease(fake_redis, fresh_weather):
+    cache_service, weather_service = make_service(fake_redis, [fresh_weather])
+    await fake_redis.set("lease:refresh:weather:city:warsaw:pl", "1", px=5000)
+
+    await cache_service._refresh_scheduled("weather:city:warsaw:pl")
+
+    weather_service.get_current_weather.assert_not_awaited()
+    assert cache_service.refresh_lease.get_stats()["skipped"] == 1
+    # kept in the schedule in case the holder fails
+    assert await fake_redis.zscore(REFRESH_SCHEDULE_KEY, "weather:city:warsaw:pl") > time.time()
+
+
+@pytest.mark.asyncio
+async def test_fencing_tokens_increase(fake_redis):
+    lease = RefreshLease(fake_redis)
+    tokens = []
+
+    async def record_token():
+        tokens.append(int(await fake_redis.get("lease:refresh:weather:city:warsaw")))
+
+    for _ in range(2):
+        await lease.run("weather:city:warsaw", record_token)
+
+    assert tokens[0] < tokens[1]
+
+
+@pytest.mark.asyncio
+async def test_write_after_lease_expiry_is_fenced(fake_redis, weather_response, fresh_weather):
+    cache_service, _ = make_service(fake_redis, [])
+    await cache_service._write_cache("weather:city:warsaw", weather_response)
+
+    async def slow_refresh():
+        # the lease expired during the upstream call and another replica took it over
+        await fake_redis.set("lease:refresh:weather:city:warsaw", "999", px=5000)
+        await cache_service._write_cache("weather:city:warsaw", fresh_weather)
+
+    await cache_service.refresh_lease.run("weather:city:warsaw", slow_refresh)
+
+    assert cache_service.refresh_lease.get_stats()["fenced"] == 1
+    cache_service.local_cache.clear()
+    assert await cache_service._read_cached("weather:city:warsaw", type(weather_response)) == weather_response
+    # the other replica's lease is left alone
+    assert await fake_redis.get("lease:refresh:weather:city:warsaw") == "999"
+
+
+@pytest.mark.asyncio
+async def test_refresh_runs_without_lease_when_redis_fails(fake_redis, fresh_weather):
+    cache_service, weather_service = make_service(fake_redis, [fresh_weather])
+    cache_service.refresh_lease.redis = MagicMock(incr=AsyncMock(side_effect=ConnectionError("down")))
+
+    await cache_service._refresh_scheduled("weather:city:warsaw:pl")
+
+    weather_service.get_current_weather.assert_awaited_once()
+    assert cache_service.refresh_lease.get_stats()["errors"] == 1
+
+
+@pytest.mark.asyncio
+async def test_request_refreshes_share_the_observation_slot_and_lease(fake_redis, fresh_weather):
+    cache_service, weather_service = make_service(fake_redis, [fresh_weather])
+    # past the soft TTL, stored once under weather:id:756135 with both city keys pointing to it
+    observed = fresh_weather.model_copy(update={"city_id": 756135, "timestamp": int(time.time()) - 900})
+    await cache_service._write_cache("weather:city:warsaw", observed)
+    await cache_service._write_cache("weather:city:warsaw:pl", observed)
+    await fake_redis.set("lease:refresh:weather:id:756135", "1", px=5000)
+
+    background_tasks = BackgroundTasks()
+    await cache_service.get_weather_by_city(background_tasks, "Warsaw")
+    await cache_service.get_weather_by_city_country(background_tasks, "Warsaw", "PL")
+    await background_tasks()
+    cache_service.refresh_scheduler.start()
+    await cache_service.refresh_scheduler.join()
+    await cache_service.refresh_scheduler.stop()
+
+    assert cache_service.refresh_scheduler.submitted == 1
+    assert cache_service.refresh_scheduler.deduplicated == 1
+    # the other replica holds the observation's lease: neither city key is refreshed here
+    assert cache_service.refresh_lease.get_stats()["skipped"] == 1
+    weather_service.get_current_weather.assert_not_awaited()
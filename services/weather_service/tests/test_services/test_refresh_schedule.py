@@ -0,0 +1,71 @@
+import time
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.services.cache_service import WeatherCacheService, REFRESH_SCHEDULE_KEY
+
+
+@pytest.mark.asyncio
+async def test_writes_schedule_next_refresh(fake_redis, weather_response):
+    weather_service = MagicMock()
+    weather_service.get_current_weather = AsyncMock(return_value=weather_response)
+    cache_service = WeatherCacheService(fake_redis, weather_service, refresh_threshold=600)
+
+    await cache_service.get_weather_by_city(MagicMock(), "Warsaw")
+
+    # stored under the canonical location returned by OpenWeather
+    score = await fake_redis.zscore(REFRESH_SCHEDULE_KEY, "weather:city:warsaw:pl")
+    assert time.time() + 590 < score <= time.time() + 600
+
+
+@pytest.mark.asyncio
+async def test_only_due_entries_are_refreshed(fake_redis, weather_response):
+    weather_service = MagicMock()
+    weather_service.get_current_weather = AsyncMock(return_value=weather_response)
+    cache_service = WeatherCacheService(fake_redis, weather_service, refresh_threshold=600)
+    now = time.time()
+    await fake_redis.zadd(REFRESH_SCHEDULE_KEY, {"weather:city:warsaw:pl": now - 1, "weather:city:krakow": now + 600})
+
+    cache_service.refresh_scheduler.start()
+    try:
+        assert await cache_service._refresh_due_entries() == 1
+        await cache_service.refresh_scheduler.join()
+    finally:
+        await cache_service.refresh_scheduler.stop()
+
+    weather_service.get_current_weather.assert_awaited_once_with("warsaw", "pl")
+    # re-scheduled by the write, the not-yet-due entry is untouched
+    assert await fake_redis.zscore(REFRESH_SCHEDULE_KEY, "weather:city:warsaw:pl") > now + 590
+    assert await fake_redis.zscore(REFRESH_SCHEDULE_KEY, "weather:city:krakow") == pytest.approx(now + 600)
+
+
+@pytest.mark.asyncio
+async def test_failed_refresh_is_retried_later(fake_redis):
+    weather_service = MagicMock()
+    weather_service.get_current_weather = AsyncMock(side_effect=RuntimeError("upstream down"))
+    cache_service = WeatherCacheService(fake_redis, weather_service, refresh_retry_delay=120)
+    await fake_redis.zadd(REFRESH_SCHEDULE_KEY, {"weather:city:warsaw": time.time() - 1})
+
+    cache_service.refresh_scheduler.start()
+    try:
+        await cache_service._refresh_due_entries()
+        await cache_service.refresh_scheduler.join()
+    finally:
+        await cache_service.refresh_scheduler.stop()
+
+    assert cache_service.refresh_scheduler.failed == 1
+    assert await fake_redis.zscore(REFRESH_SCHEDULE_KEY, "weather:city:warsaw") > time.time() + 110
+
+
+@pytest.mark.asyncio
+async def test_due_entry_already_pending_stays_scheduled(fake_redis):
+    weather_service = MagicMock()
+    cache_service = WeatherCacheService(fake_redis, weather_service, refresh_retry_delay=120)
+    await fake_redis.zadd(REFRESH_SCHEDULE_KEY, {"weather:city:warsaw": time.time() - 1})
+    # a request-triggered refresh of the same key is already queued
+    assert cache_service.refresh_scheduler.submit("weather:city:warsaw", AsyncMock())
+
+    assert await cache_service._refresh_due_entries() == 0
+
+    assert cache_service.refresh_scheduler.deduplicated == 1
+    assert await fake_redis.zscore(REFRESH_SCHEDULE_KEY, "weather:city:warsaw") > time.time() + 110
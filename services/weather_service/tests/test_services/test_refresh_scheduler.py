@@ -0,0 +1,76 @@
+import asyncio
+import time
+import pytest
+
+from app.services.refresh_scheduler import RefreshScheduler, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_token_bucket_refills_at_configured_rate():
+    clock = FakeClock()
+    bucket = TokenBucket(calls_per_minute=60, burst=5, clock=clock)
+    assert bucket.available == 5
+    bucket._tokens = 0
+    clock.now = 2.5
+    assert bucket.available == pytest.approx(2.5)
+    clock.now = 100
+    assert bucket.available == 5
+
+
+@pytest.mark.asyncio
+async def test_scheduler_bounds_concurrency_and_deduplicates():
+    scheduler = RefreshScheduler(TokenBucket(calls_per_minute=0, burst=1), concurrency=2)
+    running = 0
+    peak = 0
+
+    async def refresh():
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    for i in range(6):
+        assert scheduler.submit(f"weather:city:{i}", refresh, due_at=time.time() - 30)
+    assert not scheduler.submit("weather:city:0", refresh)
+    assert scheduler.queue_depth == 6
+
+    scheduler.start()
+    try:
+        await scheduler.join()
+    finally:
+        await scheduler.stop()
+
+    stats = scheduler.get_stats()
+    assert peak == 2
+    assert stats["completed"] == 6 and stats["deduplicated"] == 1 and stats["queue_depth"] == 0
+    assert stats["max_lag_seconds"] >= 30
+    assert scheduler.get_refresh_lag("weather:city:3") >= 30
+
+
+@pytest.mark.asyncio
+async def test_scheduler_respects_rate_limit():
+    # 600/min = one call per 0.1s after the burst of 1
+    scheduler = RefreshScheduler(TokenBucket(calls_per_minute=600, burst=1), concurrency=4)
+    started = []
+
+    async def refresh():
+        started.append(time.monotonic())
+
+    for i in range(3):
+        scheduler.submit(f"weather:city:{i}", refresh)
+    scheduler.start()
+    try:
+        await scheduler.join()
+    finally:
+        await scheduler.stop()
+
+    assert started[-1] - started[0] >= 0.18
+    assert scheduler.rate_limiter.throttled >= 2
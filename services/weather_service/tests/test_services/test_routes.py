@@ -0,0 +1,84 @@
+import httpx
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.core.exceptions import CircuitOpenException, WeatherDataNotFoundException
+from app.dependencies import get_weather_service
+from app.main import app
+from app.services.cache_service import WeatherCacheService
+
+
+@pytest.fixture
+async def client_for():
+    """httpx client on the real app (exception handlers included), serving the given cache service"""
+    clients = []
+
+    def make(cache_service: WeatherCacheService) -> httpx.AsyncClient:
+        app.dependency_overrides[get_weather_service] = lambda: cache_service
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test/api/v1")
+        clients.append(client)
+        return client
+
+    try:
+        yield make
+    finally:
+        app.dependency_overrides.clear()
+        for client in clients:
+            await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_negatively_cached_city_is_a_404(fake_redis, client_for):
+    weather_service = MagicMock()
+    weather_service.get_current_weather = AsyncMock(side_effect=WeatherDataNotFoundException("atlantis"))
+    client = client_for(WeatherCacheService(fake_redis, weather_service))
+
+    first = await client.get("/weather/city/atlantis")
+    # answered from the negative cache
+    second = await client.get("/weather/city/atlantis")
+
+    assert first.status_code == second.status_code == 404
+    assert "atlantis" in second.json()["detail"]
+    weather_service.get_current_weather.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_upstream_unavailable_without_stale_entry_is_a_503(fake_redis, client_for):
+    weather_service = MagicMock()
+    weather_service.get_current_weather = AsyncMock(side_effect=CircuitOpenException())
+    weather_service.get_current_weather_by_coordinates = AsyncMock(side_effect=CircuitOpenException())
+    client = client_for(WeatherCacheService(fake_redis, weather_service))
+
+    city = await client.get("/weather/city/warsaw")
+    proximity = await client.post("/weather/proximity", params={"lat": 52.23, "lon": 21.01})
+
+    assert city.status_code == proximity.status_code == 503
+
+
+@pytest.mark.asyncio
+async def test_proximity_responses_are_conditional(fake_redis, client_for, fresh_weather):
+    weather_service = MagicMock()
+    weather_service.get_current_weather_by_coordinates = AsyncMock(return_value=fresh_weather)
+    client = client_for(WeatherCacheService(fake_redis, weather_service))
+    params = {"lat": 52.23, "lon": 21.01}
+
+    first = await client.post("/weather/proximity", params=params)
+    revalidated = await client.post("/weather/proximity", params=params, headers={"If-None-Match": first.headers["etag"]})
+
+    assert first.status_code == 200
+    assert first.headers["cache-control"].startswith("public, max-age=")
+    assert "x-data-age" in first.headers
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+
+
+@pytest.mark.asyncio
+async def test_derived_current_weather_is_sent_with_no_cache(fake_redis, client_for, fresh_weather):
+    cache_service = WeatherCacheService(fake_redis, MagicMock())
+    cache_service.get_weather_by_city = AsyncMock(return_value=fresh_weather.model_copy(update={"derived": True}))
+    client = client_for(cache_service)
+
+    response = await client.get("/weather/city/warsaw")
+
+    assert response.json()["derived"] is True
+    assert response.headers["cache-control"] == "no-cache"
@@ -0,0 +1,108 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.services.single_flight import SingleFlight, RedisSingleFlight
+from app.services.cache_service import WeatherCacheService
+
+
+@pytest.mark.asyncio
+async def test_single_flight_shares_one_execution():
+    single_flight = SingleFlight()
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return calls
+
+    results = await asyncio.gather(*(single_flight.do("weather:city:warsaw", fetch) for _ in range(10)))
+
+    assert results == [1] * 10
+    assert calls == 1
+    assert single_flight.get_stats() == {"executions": 1, "coalesced": 9, "in_flight": 0}
+
+
+@pytest.mark.asyncio
+async def test_single_flight_propagates_errors_to_all_waiters():
+    single_flight = SingleFlight()
+
+    async def fetch():
+        await asyncio.sleep(0.01)
+        raise ValueError("upstream down")
+
+    results = await asyncio.gather(*(single_flight.do("k", fetch) for _ in range(3)), return_exceptions=True)
+
+    assert all(isinstance(r, ValueError) for r in results)
+    # a failed flight is forgotten, the next call executes again
+    assert single_flight.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_redis_single_flight_waits_for_lock_holder(fake_redis):
+    flight = RedisSingleFlight(poll_interval=0.01)
+    await fake_redis.set("lock:weather:city:warsaw", "other-replica", px=10000)
+
+    async def write_from_other_replica():
+        await asyncio.sleep(0.03)
+        await fake_redis.set("weather:city:warsaw", "cached")
+
+    fetch = AsyncMock(return_value="fetched")
+    read_cached = lambda: fake_redis.get("weather:city:warsaw")
+
+    result, _ = await asyncio.gather(flight.do(fake_redis, "weather:city:warsaw", fetch, read_cached), write_from_other_replica())
+
+    assert result == "cached"
+    fetch.assert_not_called()
+    assert flight.coalesced == 1
+
+
+@pytest.mark.asyncio
+async def test_redis_single_flight_releases_own_lock(fake_redis):
+    flight = RedisSingleFlight()
+    fetch = AsyncMock(return_value="fetched")
+
+    result = await flight.do(fake_redis, "weather:city:warsaw", fetch, AsyncMock(return_value=None))
+
+    assert result == "fetched"
+    assert flight.locks_acquired == 1
+    assert not await fake_redis.exists("lock:weather:city:warsaw")
+
+
+@pytest.mark.asyncio
+async def test_concurrent_city_misses_call_upstream_once(fake_redis, weather_response):
+    weather_service = MagicMock()
+
+    async def get_current_weather(city, country_code=None):
+        await asyncio.sleep(0.01)
+        return weather_response
+
+    weather_service.get_current_weather = AsyncMock(side_effect=get_current_weather)
+    cache_service = WeatherCacheService(fake_redis, weather_service)
+
+    results = await asyncio.gather(*(cache_service.get_weather_by_city(MagicMock(), "Warsaw") for _ in range(5)))
+
+    assert all(r.location == "Warsaw" for r in results)
+    weather_service.get_current_weather.assert_awaited_once()
+    assert cache_service.get_stats()["single_flight"]["coalesced"] == 4
+
+
+@pytest.mark.asyncio
+async def test_waiting_on_other_replica_does_not_count_polls_as_misses(fake_redis, fresh_weather):
+    weather_service = MagicMock()
+    weather_service.get_current_weather = AsyncMock(return_value=fresh_weather)
+    cache_service = WeatherCacheService(fake_redis, weather_service, redis_single_flight=RedisSingleFlight(poll_interval=0.01))
+    await fake_redis.set("lock:weather:city:warsaw", "other-replica", px=10000)
+
+    async def write_from_other_replica():
+        await asyncio.sleep(0.05)
+        await fake_redis.set("weather:city:warsaw", fresh_weather.model_dump_json())
+
+    result, _ = await asyncio.gather(cache_service.get_weather_by_city(MagicMock(), "Warsaw"), write_from_other_replica())
+
+    assert result == fresh_weather
+    weather_service.get_current_weather.assert_not_called()
+    # only the initial lookup is a miss, not every poll while the other replica fetched
+    assert cache_service.redis_misses == 1
+    assert cache_service.redis_single_flight.coalesced == 1
@@ -0,0 +1,73 @@
+import time
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from fastapi import Request, Response
+
+from app.api.v1.routes import cached_or_not_modified
+from app.core.exceptions import OpenWeatherAPIException, WeatherDataNotFoundException
+from app.services.cache_service import WeatherCacheService
+
+
+def make_service(fake_redis, upstream):
+    weather_service = MagicMock()
+    weather_service.get_current_weather = AsyncMock(side_effect=upstream)
+    cache_service = WeatherCacheService(fake_redis, weather_service, cache_duration=3600, refresh_threshold=600, stale_if_error=1800)
+    return cache_service, weather_service
+
+
+async def cache_aged(cache_service, weather_response, age: int):
+    value = weather_response.model_copy(update={"timestamp": int(time.time()) - age})
+    await cache_service._write_cache("weather:city:warsaw", value)
+    return value
+
+
+@pytest.mark.asyncio
+async def test_past_soft_ttl_is_served_and_refreshed_in_background(fake_redis, weather_response):
+    cache_service, weather_service = make_service(fake_redis, [weather_response])
+    cached = await cache_aged(cache_service, weather_response, 1200)
+    background_tasks = MagicMock()
+
+    assert await cache_service.get_weather_by_city(background_tasks, "Warsaw") == cached
+    background_tasks.add_task.assert_called_once()
+    weather_service.get_current_weather.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_past_hard_ttl_is_refetched(fake_redis, fresh_weather):
+    cache_service, weather_service = make_service(fake_redis, [fresh_weather])
+    await cache_aged(cache_service, fresh_weather, 4000)
+
+    assert await cache_service.get_weather_by_city(MagicMock(), "Warsaw") == fresh_weather
+    assert weather_service.get_current_weather.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_stale_is_served_while_upstream_fails(fake_redis, weather_response):
+    cache_service, _ = make_service(fake_redis, OpenWeatherAPIException("OpenWeather is down"))
+    cached = await cache_aged(cache_service, weather_response, 4000)
+    assert 3600 < await fake_redis.ttl("weather:city:warsaw") <= 3600 + 1800
+
+    assert await cache_service.get_weather_by_city(MagicMock(), "Warsaw") == cached
+    assert cache_service.get_stats()["stale_served"] == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("age, error", [(6000, OpenWeatherAPIException("down")), (4000, WeatherDataNotFoundException("Warsaw"))])
+async def test_stale_is_not_served_past_window_or_on_client_errors(fake_redis, weather_response, age, error):
+    cache_service, _ = make_service(fake_redis, error)
+    await cache_aged(cache_service, weather_response, age)
+
+    with pytest.raises(type(error)):
+        await cache_service.get_weather_by_city(MagicMock(), "Warsaw")
+    assert cache_service.stale_served == 0
+
+
+def test_data_age_header_is_not_the_http_age_header(weather_response):
+    request = Request({"type": "http", "method": "GET", "path": "/", "headers": [], "query_string": b""})
+    response = Response()
+    stale = weather_response.model_copy(update={"timestamp": int(time.time()) - 900})
+    assert cached_or_not_modified(request, response, stale, MagicMock(refresh_threshold=600)) is None
+
+    # served stale past the soft TTL: must not read as "already expired" to HTTP caches
+    assert 899 <= int(response.headers["X-Data-Age"]) <= 901
+    assert "Age" not in response.headers